@@ -5,10 +5,22 @@ This package provides reusable RESTful API client components for the Pet Happy L
 """
 
 from .client import APIClient
-from .exceptions import APIError, ClientError, ValidationError
+from .coalescing import HTTPResponseCache, SingleFlight
+from .exceptions import APIError, CircuitOpenError, ClientError, ValidationError
+from .ratelimit import TokenBucket
+from .registry import ClientRegistry, create_client_registry
+from .resilience import CircuitBreaker, RetryPolicy
 
 __all__ = [
     "APIClient",
+    "ClientRegistry",
+    "create_client_registry",
+    "RetryPolicy",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "TokenBucket",
+    "SingleFlight",
+    "HTTPResponseCache",
     "APIError", 
     "ClientError",
     "ValidationError"
@@ -4,15 +4,25 @@ Common RESTful API Client
 This module provides a reusable HTTP client for making API requests.
 """
 
+import asyncio
 import httpx
+import importlib.util
 import logging
-from typing import Optional, Dict, Any, Union
+import time
+from typing import Optional, Dict, Any, AsyncIterator, Callable, List, Sequence, Union
 from urllib.parse import urljoin, urlencode
 
 from .exceptions import APIError, ClientError, ConnectionError, TimeoutError
+from .coalescing import HTTPResponseCache, SingleFlight
+from .ratelimit import TokenBucket
+from .resilience import CircuitBreaker, RetryPolicy, parse_retry_after
+from .streaming import JSONArrayStream
 
 logger = logging.getLogger(__name__)
 
+# (method, url, status_code or None, elapsed seconds)
+RequestHook = Callable[[str, str, Optional[int], float], None]
+
 
 class APIClient:
     """
@@ -23,7 +33,16 @@ class APIClient:
     """
     
     def __init__(self, base_url: str, timeout: int = 30, 
-                 headers: Optional[Dict[str, str]] = None):
+                 headers: Optional[Dict[str, str]] = None,
+                 limits: Optional[httpx.Limits] = None,
+                 http2: bool = False,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 coalesce: bool = False,
+                 cache_ttl: Optional[float] = None,
+                 cache_max_entries: int = 256,
+                 hooks: Optional[List[RequestHook]] = None):
         """
         Initialize the API client.
         
@@ -31,10 +50,35 @@ class APIClient:
             base_url: The base URL for the API
             timeout: Request timeout in seconds
             headers: Default headers to include in all requests
+            limits: Connection pool limits (max connections, keep-alive expiry)
+            http2: Enable HTTP/2 (requires the optional ``h2`` package)
+            retry_policy: Retry settings; None sends each request once
+            circuit_breaker: Breaker shared by clients of the same host; None disables it
+            rate_limiter: Token bucket shared by clients of the same quota; None disables it
+            coalesce: Share one in-flight request between concurrent identical GETs
+            cache_ttl: Cache ``get()`` responses for this many seconds, revalidating with
+                ETag / Last-Modified afterwards; None disables the cache. Bodies read
+                through ``stream_json()`` are never cached
+            cache_max_entries: Maximum number of cached GET responses
+            hooks: Callables invoked after every attempt with
+                (method, url, status_code or None, elapsed seconds)
         """
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
         self.headers = headers or {}
+        self.limits = limits
+        self.http2 = http2
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed; falling back to HTTP/1.1")
+            self.http2 = False
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.rate_limiter = rate_limiter
+        self.single_flight: Optional[SingleFlight] = SingleFlight() if coalesce else None
+        self.response_cache: Optional[HTTPResponseCache] = (
+            HTTPResponseCache(cache_ttl, max_entries=cache_max_entries) if cache_ttl else None
+        )
+        self.hooks: List[RequestHook] = list(hooks or [])
         self._client: Optional[httpx.AsyncClient] = None
     
     async def __aenter__(self):
@@ -49,10 +93,12 @@ class APIClient:
     async def _ensure_client(self):
         """Ensure the HTTP client is initialized."""
         if self._client is None:
-            self._client = httpx.AsyncClient(
-                timeout=self.timeout,
-                headers=self.headers
-            )
+            client_kwargs: Dict[str, Any] = {"timeout": self.timeout, "headers": self.headers}
+            if self.limits is not None:
+                client_kwargs["limits"] = self.limits
+            if self.http2:
+                client_kwargs["http2"] = True
+            self._client = httpx.AsyncClient(**client_kwargs)
     
     async def close(self):
         """Close the HTTP client."""
@@ -93,60 +139,196 @@ class APIClient:
         Returns:
             Response data as dictionary
             
+        Connection errors, timeouts and ``retry_policy.retry_statuses`` are
+        retried with exponential backoff (honoring Retry-After) for idempotent
+        methods. Every attempt is gated by the circuit breaker and then waits
+        for a rate limiter token.
+        
         Raises:
             APIError: For API-related errors
             ConnectionError: For connection errors
             TimeoutError: For timeout errors
+            CircuitOpenError: When the host's circuit breaker is open
         """
         await self._ensure_client()
         
         url = self._build_url(endpoint, params)
         request_headers = {**self.headers, **(headers or {})}
         
-        logger.info(f"Making {method} request to {url}")
-        
+        response = await self._send(method, url, params, data, request_headers)
         try:
-            response = await self._client.request(
-                method=method,
-                url=url,
-                params=params,
-                json=data,
-                headers=request_headers
-            )
-            
-            logger.info(f"Response status: {response.status_code}")
-            
-            # Handle different status codes
-            if response.status_code >= 200 and response.status_code < 300:
-                return response.json()
-            elif response.status_code >= 400 and response.status_code < 500:
-                raise ClientError(
-                    f"Client error: {response.status_code}",
-                    status_code=response.status_code,
-                    response_data=response.json() if response.content else {}
-                )
-            else:
-                raise APIError(
-                    f"Server error: {response.status_code}",
-                    status_code=response.status_code,
-                    response_data=response.json() if response.content else {}
-                )
+            return response.json()
+        except ValueError as e:
+            raise APIError(f"Invalid JSON response from {url}: {e}", status_code=response.status_code)
+    
+    async def _send(self, method: str, url: str, params: Optional[Dict[str, Any]],
+                    data: Optional[Dict[str, Any]], headers: Dict[str, str],
+                    stream: bool = False) -> httpx.Response:
+        """
+        Send a request with retries, circuit breaker and rate limiting.
+        
+        Args:
+            method: HTTP method
+            url: Full request URL (query string included)
+            params: Query parameters
+            data: Request body data
+            headers: Request headers
+            stream: Return before the body is read; the caller must close the response
+            
+        Returns:
+            The successful (2xx) response
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            probe = self.circuit_breaker is not None and self.circuit_breaker.before_request()
+            try:
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.acquire()
+            
+                logger.info(f"Making {method} request to {url} (attempt {attempt})")
+            
+                retryable = True
+                retry_after = None
+                started = time.perf_counter()
+                try:
+                    if stream:
+                        request = self._client.build_request(method, url, json=data, headers=headers)
+                        response = await self._client.send(request, stream=True)
+                    else:
+                        response = await self._client.request(
+                            method=method,
+                            url=url,
+                            params=params,
+                            json=data,
+                            headers=headers
+                        )
+                except httpx.ConnectError as e:
+                    logger.error(f"Connection error: {e}")
+                    error = ConnectionError(f"Failed to connect to {url}: {e}")
+                except httpx.TimeoutException as e:
+                    logger.error(f"Timeout error: {e}")
+                    error = TimeoutError(f"Request timeout for {url}: {e}")
+                except httpx.RequestError as e:
+                    logger.error(f"Request error: {e}")
+                    error = APIError(f"Request failed for {url}: {e}")
+                except Exception as e:
+                    logger.error(f"Unexpected error: {e}")
+                    self._record_outcome(success=False)
+                    self._run_hooks(method, url, None, time.perf_counter() - started)
+                    raise APIError(f"Unexpected error for {url}: {e}")
+                else:
+                    logger.info(f"Response status: {response.status_code}")
                 
-        except httpx.ConnectError as e:
-            logger.error(f"Connection error: {e}")
-            raise ConnectionError(f"Failed to connect to {url}: {e}")
-        except httpx.TimeoutException as e:
-            logger.error(f"Timeout error: {e}")
-            raise TimeoutError(f"Request timeout for {url}: {e}")
-        except httpx.RequestError as e:
-            logger.error(f"Request error: {e}")
-            raise APIError(f"Request failed for {url}: {e}")
-        except (ClientError, APIError):
-            # Re-raise our custom exceptions
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error: {e}")
-            raise APIError(f"Unexpected error for {url}: {e}")
+                    # Handle different status codes
+                    # 304 only answers the conditional GETs sent by _cached_get
+                    if (response.status_code >= 200 and response.status_code < 300) or response.status_code == 304:
+                        self._record_outcome(success=True)
+                        if not stream:
+                            # Streamed responses report once their body has been consumed
+                            self._run_hooks(method, url, response.status_code, time.perf_counter() - started)
+                        return response
+                    if stream:
+                        # Error bodies are small; read them so they can be reported
+                        await response.aread()
+                        await response.aclose()
+                    if response.status_code >= 400 and response.status_code < 500:
+                        error = ClientError(
+                            f"Client error: {response.status_code}",
+                            status_code=response.status_code,
+                            response_data=self._error_body(response)
+                        )
+                    else:
+                        error = APIError(
+                            f"Server error: {response.status_code}",
+                            status_code=response.status_code,
+                            response_data=self._error_body(response)
+                        )
+                    retryable = (self.retry_policy is not None
+                                 and response.status_code in self.retry_policy.retry_statuses)
+                    if retryable:
+                        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    if response.status_code == 429 and self.rate_limiter is not None:
+                        # quota exceeded: stop every coroutine sharing the bucket from bursting
+                        self.rate_limiter.drain()
+            except BaseException:
+                # Cancelled (client disconnect, task.cancel) before an outcome was recorded:
+                # free the half-open probe slot so the breaker does not stay stuck
+                if probe:
+                    self.circuit_breaker.release_probe()
+                raise
+            
+            # 4xx means the host is up; only transport errors and 5xx count against the breaker
+            self._record_outcome(success=error.status_code is not None and error.status_code < 500)
+            self._run_hooks(method, url, error.status_code, time.perf_counter() - started)
+            
+            if not (retryable and self.retry_policy is not None
+                    and self.retry_policy.can_retry(method, attempt)):
+                raise error
+            
+            delay = self.retry_policy.backoff(attempt, retry_after)
+            logger.warning(f"{error.message}; retrying {method} {url} in {delay:.2f}s "
+                           f"(attempt {attempt + 1}/{self.retry_policy.max_attempts})")
+            await asyncio.sleep(delay)
+    
+    def stream_json(self, endpoint: str, item_path: Sequence[str],
+                    params: Optional[Dict[str, Any]] = None,
+                    headers: Optional[Dict[str, str]] = None,
+                    chunk_size: int = 65536) -> JSONArrayStream:
+        """
+        Stream the items of one JSON array in a GET response.
+        
+        The body is decoded incrementally, so only the current chunk and the
+        item being yielded are in memory. Everything outside the array is
+        available as ``stream.envelope`` once iteration finishes.
+        
+        Streamed requests bypass the ``cache_ttl`` response cache: caching would
+        keep the whole body in memory, which is what streaming avoids.
+        
+        Args:
+            endpoint: API endpoint
+            item_path: Object keys leading to the array, e.g. ("LOCALDATA_020301", "row")
+            params: Query parameters
+            headers: Additional headers
+            chunk_size: Bytes read from the socket per chunk
+            
+        Returns:
+            An async iterator of decoded array items; the request is sent on first iteration
+            
+        Example:
+            stream = client.stream_json("/data", ("result", "items"))
+            async for item in stream:
+                ...
+            meta = stream.envelope
+        """
+        return _ResponseJSONStream(self, endpoint, item_path, params, headers, chunk_size)
+    
+    def _run_hooks(self, method: str, url: str, status_code: Optional[int], elapsed: float):
+        """Report one finished attempt to the registered hooks; hook errors are logged, not raised."""
+        for hook in self.hooks:
+            try:
+                hook(method, url, status_code, elapsed)
+            except Exception as e:
+                logger.warning(f"Request hook {hook!r} failed: {e}")
+    
+    def _record_outcome(self, success: bool):
+        """Report the result of an attempt to the circuit breaker, if any."""
+        if self.circuit_breaker is None:
+            return
+        if success:
+            self.circuit_breaker.record_success()
+        else:
+            self.circuit_breaker.record_failure()
+    
+    @staticmethod
+    def _error_body(response: httpx.Response) -> Dict[str, Any]:
+        """Decode an error response body, tolerating non-JSON payloads."""
+        if not response.content:
+            return {}
+        try:
+            return response.json()
+        except ValueError:
+            return {"detail": response.text}
     
     async def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
                   headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
@@ -159,9 +341,47 @@ class APIClient:
             headers: Additional headers
             
         Returns:
-            Response data
+            Response data. With ``coalesce`` or ``cache_ttl`` enabled the same
+            object may be returned to several callers and must not be mutated.
         """
-        return await self._make_request("GET", endpoint, params=params, headers=headers)
+        if self.single_flight is None and self.response_cache is None:
+            return await self._make_request("GET", endpoint, params=params, headers=headers)
+        
+        await self._ensure_client()
+        url = self._build_url(endpoint, params)
+        request_headers = {**self.headers, **(headers or {})}
+        key = ("GET", url, tuple(sorted(request_headers.items())))
+        
+        async def fetch():
+            return await self._cached_get(key, url, params, request_headers)
+        
+        if self.single_flight is not None:
+            return await self.single_flight.do(key, fetch)
+        return await fetch()
+    
+    async def _cached_get(self, key, url: str, params: Optional[Dict[str, Any]],
+                          headers: Dict[str, str]) -> Dict[str, Any]:
+        """GET through the response cache, revalidating expired entries conditionally."""
+        entry = None
+        if self.response_cache is not None:
+            data, entry = self.response_cache.lookup(key)
+            if data is not None:
+                return data
+            if entry is not None:
+                headers = {**headers, **entry.conditional_headers()}
+        
+        response = await self._send("GET", url, params, None, headers)
+        if response.status_code == 304 and entry is not None:
+            logger.info(f"Not modified, reusing cached response for {url}")
+            return self.response_cache.refresh(entry)
+        try:
+            data = response.json()
+        except ValueError as e:
+            raise APIError(f"Invalid JSON response from {url}: {e}", status_code=response.status_code)
+        if self.response_cache is not None:
+            self.response_cache.store(key, data, etag=response.headers.get("ETag"),
+                                      last_modified=response.headers.get("Last-Modified"))
+        return data
     
     async def post(self, endpoint: str, data: Optional[Dict[str, Any]] = None,
                    params: Optional[Dict[str, Any]] = None,
@@ -227,4 +447,34 @@ class APIClient:
         Returns:
             Response data
         """
-        return await self._make_request("PATCH", endpoint, params=params, data=data, headers=headers) 
\ No newline at end of file
+        return await self._make_request("PATCH", endpoint, params=params, data=data, headers=headers)
+
+
+class _ResponseJSONStream(JSONArrayStream):
+    """JSONArrayStream that opens the HTTP response on first iteration and always closes it."""
+    
+    def __init__(self, client: APIClient, endpoint: str, item_path: Sequence[str],
+                 params: Optional[Dict[str, Any]], headers: Optional[Dict[str, str]],
+                 chunk_size: int):
+        super().__init__(self._body(), item_path)
+        self._api_client = client
+        self._endpoint = endpoint
+        self._params = params
+        self._headers = headers
+        self._chunk_size = chunk_size
+    
+    async def _body(self) -> AsyncIterator[bytes]:
+        client = self._api_client
+        await client._ensure_client()
+        url = client._build_url(self._endpoint, self._params)
+        headers = {**client.headers, **(self._headers or {})}
+        started = time.perf_counter()
+        response = await client._send("GET", url, self._params, None, headers, stream=True)
+        try:
+            async for chunk in response.aiter_bytes(self._chunk_size):
+                yield chunk
+        except httpx.RequestError as e:
+            raise APIError(f"Response stream interrupted for {url}: {e}")
+        finally:
+            await response.aclose()
+            client._run_hooks("GET", url, response.status_code, time.perf_counter() - started)
@@ -0,0 +1,139 @@
+"""
+Request coalescing and short-lived HTTP response caching
+
+SingleFlight lets concurrent callers with the same key share one in-flight
+call. HTTPResponseCache keeps decoded GET responses for a short TTL and
+remembers their ETag / Last-Modified validators, so expired entries can be
+revalidated with a conditional request (304 Not Modified) instead of being
+downloaded again.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls by key.
+
+    The first caller for a key starts the call; callers arriving while it is
+    in flight await the same task and receive the same result (or exception).
+    Results are shared objects, so callers must not mutate them.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``func`` once for all concurrent callers with the same key.
+
+        Args:
+            key: Identity of the call (e.g. method + URL)
+            func: Coroutine function performing the call
+
+        Returns:
+            The shared result
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+            self.started += 1
+        else:
+            self.coalesced += 1
+        # shield: one cancelled caller must not cancel the call for the others
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved even if every caller was cancelled
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+
+@dataclass
+class CachedResponse:
+    """A decoded response body with its freshness and validators."""
+    data: Any
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers for revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HTTPResponseCache:
+    """Bounded LRU of decoded GET responses with a fixed TTL."""
+
+    def __init__(self, ttl: float, max_entries: int = 256,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds a response is served without contacting the upstream
+            max_entries: Maximum number of cached responses
+            clock: Monotonic clock (injectable for tests)
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+
+    def lookup(self, key: Hashable) -> Tuple[Optional[Any], Optional[CachedResponse]]:
+        """
+        Look up a response.
+
+        Returns:
+            (fresh data or None, the entry itself for revalidation or None)
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None, None
+        self._entries.move_to_end(key)
+        if entry.expires_at > self._clock():
+            self.hits += 1
+            return entry.data, entry
+        self.misses += 1
+        return None, entry
+
+    def store(self, key: Hashable, data: Any, etag: Optional[str] = None,
+              last_modified: Optional[str] = None) -> None:
+        """Cache a freshly downloaded response."""
+        self._entries[key] = CachedResponse(data, self._clock() + self.ttl, etag, last_modified)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def refresh(self, entry: CachedResponse) -> Any:
+        """Extend an entry after a 304 Not Modified and return its data."""
+        entry.expires_at = self._clock() + self.ttl
+        self.revalidated += 1
+        return entry.data
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -33,4 +33,13 @@ class ConnectionError(APIError):
 
 class TimeoutError(APIError):
     """Exception raised for timeout errors."""
-    pass 
\ No newline at end of file
+    pass 
+
+class CircuitOpenError(APIError):
+    """Exception raised when the circuit breaker for a host is open."""
+    
+    def __init__(self, message: str, status_code: Optional[int] = None,
+                 response_data: Optional[Dict[str, Any]] = None,
+                 retry_after: Optional[float] = None):
+        super().__init__(message, status_code=status_code, response_data=response_data)
+        self.retry_after = retry_after
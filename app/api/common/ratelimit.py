@@ -0,0 +1,111 @@
+"""
+Client-side rate limiting for outbound API requests
+
+TokenBucket is an async token bucket shared by every coroutine that calls the
+same upstream (per base URL or per API key). Waiters are served in FIFO order,
+so a burst of concurrent requests drains at the configured rate instead of
+tripping the upstream quota.
+"""
+
+import asyncio
+import time
+from typing import Callable, Optional
+
+# Tolerance so float rounding cannot leave a waiter sleeping for ~0s in a loop
+_EPSILON = 1e-9
+
+
+class TokenBucket:
+    """
+    Async token bucket.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    ``acquire`` waits until enough tokens are available; ``capacity`` controls
+    how large a burst may be sent back-to-back after an idle period.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 name: str = "", clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate: Tokens (requests) added per second
+            capacity: Maximum burst size; defaults to ``max(1, rate)``
+            name: Identifier used in diagnostics
+            clock: Monotonic clock (injectable for tests)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self.name = name
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+        self.acquired = 0
+        self.waited = 0.0
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        """Tokens currently available."""
+        self._refill()
+        return self._tokens
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """Take tokens without waiting; return False if not enough are available."""
+        if self._lock.locked():
+            return False
+        self._refill()
+        if self._tokens + _EPSILON < tokens:
+            return False
+        self._tokens -= tokens
+        self.acquired += 1
+        return True
+
+    async def acquire(self, tokens: float = 1) -> float:
+        """
+        Wait until ``tokens`` are available and take them.
+
+        Args:
+            tokens: Number of tokens to take (one per request)
+
+        Returns:
+            Seconds spent waiting
+        """
+        if tokens > self.capacity:
+            raise ValueError("cannot acquire more tokens than the bucket capacity")
+        waited = 0.0
+        async with self._lock:
+            self._refill()
+            while self._tokens + _EPSILON < tokens:
+                delay = (tokens - self._tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+                self._refill()
+            self._tokens -= tokens
+        self.acquired += 1
+        self.waited += waited
+        return waited
+
+    def drain(self):
+        """Empty the bucket, e.g. after the upstream answered 429."""
+        self._refill()
+        self._tokens = 0.0
+
+    def stats(self) -> dict:
+        """Snapshot for diagnostics."""
+        return {
+            "name": self.name,
+            "rate": self.rate,
+            "capacity": self.capacity,
+            "tokens": round(self.tokens, 3),
+            "acquired": self.acquired,
+            "waited": round(self.waited, 3),
+        }
@@ -0,0 +1,180 @@
+"""
+Process-wide registry of shared API clients
+
+Clients are keyed by base URL so every caller in a worker reuses the same
+connection pool (warm TCP/TLS connections, no per-request DNS + handshake).
+"""
+
+import logging
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from .client import APIClient, RequestHook
+from .ratelimit import TokenBucket
+from .resilience import CircuitBreaker, RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+
+class ClientRegistry:
+    """
+    Holds one shared APIClient per base URL.
+    
+    Clients are created on first use (or at app startup) and closed together
+    at shutdown. Callers must not close clients obtained from the registry.
+    """
+    
+    def __init__(self, timeout: int = 30, limits: Optional[httpx.Limits] = None,
+                 http2: bool = False, retry_policy: Optional[RetryPolicy] = None,
+                 failure_threshold: Optional[int] = None, recovery_timeout: float = 30.0,
+                 rate_limit: Optional[float] = None, rate_burst: Optional[float] = None,
+                 coalesce: bool = False, cache_ttl: Optional[float] = None,
+                 hooks: Optional[List[RequestHook]] = None):
+        """
+        Initialize the registry.
+        
+        Args:
+            timeout: Default request timeout in seconds
+            limits: Default connection pool limits for new clients
+            http2: Enable HTTP/2 for new clients
+            retry_policy: Retry settings shared by new clients
+            failure_threshold: Consecutive failures that open a host's circuit; None disables breakers
+            recovery_timeout: Seconds an open circuit waits before a probe request
+            rate_limit: Requests per second allowed per host (or per quota key); None disables limiting
+            rate_burst: Token bucket capacity; defaults to ``max(1, rate_limit)``
+            coalesce: Share in-flight requests between concurrent identical GETs
+            cache_ttl: Seconds ``get()`` responses are cached per client (streamed GETs are not
+                cached); None disables the cache
+            hooks: Request hooks attached to every client (e.g. timing instrumentation)
+        """
+        self.timeout = timeout
+        self.limits = limits
+        self.http2 = http2
+        self.retry_policy = retry_policy
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._clients: Dict[str, APIClient] = {}
+        self.rate_limit = rate_limit
+        self.rate_burst = rate_burst
+        self.coalesce = coalesce
+        self.cache_ttl = cache_ttl
+        self.hooks: List[RequestHook] = list(hooks or [])
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._limiters: Dict[str, TokenBucket] = {}
+    
+    def get(self, base_url: str, headers: Optional[Dict[str, str]] = None,
+            rate_limit_key: Optional[str] = None) -> APIClient:
+        """
+        Return the shared client for a base URL, creating it if needed.
+        
+        Args:
+            base_url: The base URL for the API
+            headers: Default headers, only applied when the client is created
+            rate_limit_key: Quota the client draws from (e.g. an API key); defaults to the host.
+                Only applied when the client is created
+            
+        Returns:
+            The shared APIClient
+        """
+        key = base_url.rstrip('/')
+        client = self._clients.get(key)
+        if client is None:
+            client = APIClient(key, timeout=self.timeout, headers=headers,
+                               limits=self.limits, http2=self.http2,
+                               retry_policy=self.retry_policy,
+                               circuit_breaker=self.breaker_for(key),
+                               rate_limiter=self.limiter_for(rate_limit_key or key),
+                               coalesce=self.coalesce, cache_ttl=self.cache_ttl,
+                               hooks=self.hooks)
+            self._clients[key] = client
+            logger.info(f"Registered shared API client for {key}")
+        return client
+    
+    def breaker_for(self, base_url: str) -> Optional[CircuitBreaker]:
+        """
+        Return the circuit breaker shared by every client of a host.
+        
+        Args:
+            base_url: Any URL on the host
+            
+        Returns:
+            The host's CircuitBreaker, or None when breakers are disabled
+        """
+        if not self.failure_threshold:
+            return None
+        host = urlsplit(base_url).netloc or base_url
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(host, failure_threshold=self.failure_threshold,
+                                     recovery_timeout=self.recovery_timeout)
+            self._breakers[host] = breaker
+        return breaker
+    
+    def limiter_for(self, key: str) -> Optional[TokenBucket]:
+        """
+        Return the token bucket for a quota key, shared across clients.
+        
+        Args:
+            key: Quota key; URLs are reduced to their host
+            
+        Returns:
+            The shared TokenBucket, or None when rate limiting is disabled
+        """
+        if not self.rate_limit:
+            return None
+        name = urlsplit(key).netloc or key
+        limiter = self._limiters.get(name)
+        if limiter is None:
+            limiter = TokenBucket(self.rate_limit, capacity=self.rate_burst, name=name)
+            self._limiters[name] = limiter
+        return limiter
+    
+    def limiter_stats(self) -> Dict[str, dict]:
+        """Token bucket state per quota key, for diagnostics."""
+        return {name: limiter.stats() for name, limiter in self._limiters.items()}
+    
+    def breaker_stats(self) -> Dict[str, dict]:
+        """Circuit breaker state per host, for diagnostics."""
+        return {host: breaker.stats() for host, breaker in self._breakers.items()}
+    
+    async def close_all(self):
+        """Close every registered client and forget them."""
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            await client.close()
+    
+    def __contains__(self, base_url: str) -> bool:
+        return base_url.rstrip('/') in self._clients
+    
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+def create_client_registry(settings, hooks: Optional[List[RequestHook]] = None) -> ClientRegistry:
+    """Build a registry from application Settings (HTTP_* values)."""
+    return ClientRegistry(
+        timeout=settings.HTTP_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        ),
+        http2=settings.HTTP_HTTP2,
+        retry_policy=RetryPolicy(
+            max_attempts=settings.HTTP_RETRY_MAX_ATTEMPTS,
+            backoff_base=settings.HTTP_RETRY_BACKOFF_BASE,
+            backoff_max=settings.HTTP_RETRY_BACKOFF_MAX,
+            jitter=settings.HTTP_RETRY_JITTER,
+            retry_statuses=frozenset(int(code) for code in str(settings.HTTP_RETRY_STATUSES).split(",") if code.strip()),
+            max_retry_after=settings.HTTP_RETRY_AFTER_MAX,
+        ),
+        failure_threshold=settings.HTTP_CIRCUIT_FAILURE_THRESHOLD,
+        recovery_timeout=settings.HTTP_CIRCUIT_RECOVERY_TIMEOUT,
+        rate_limit=settings.HTTP_RATE_LIMIT,
+        rate_burst=settings.HTTP_RATE_BURST,
+        coalesce=settings.HTTP_COALESCE_GETS,
+        cache_ttl=settings.HTTP_CACHE_TTL,
+        hooks=hooks,
+    )
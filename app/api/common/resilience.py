@@ -0,0 +1,171 @@
+"""
+Retry policy and circuit breaker for outbound API requests
+
+RetryPolicy decides whether a failed attempt is retried and how long to wait
+before the next one. CircuitBreaker tracks consecutive failures per upstream
+host and rejects requests while the host is considered down.
+"""
+
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Callable, FrozenSet, Optional
+
+from .exceptions import CircuitOpenError
+
+DEFAULT_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Retry settings for APIClient.
+
+    Attributes:
+        max_attempts: Total attempts per request, including the first one
+        backoff_base: Delay in seconds before the first retry
+        backoff_max: Upper bound for a single backoff delay
+        jitter: Use full jitter (uniform 0..delay) to spread out retries
+        retry_statuses: HTTP status codes that are retried
+        retry_methods: HTTP methods that are safe to retry
+        max_retry_after: Upper bound for a server-provided Retry-After delay
+    """
+    max_attempts: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 10.0
+    jitter: bool = True
+    retry_statuses: FrozenSet[int] = DEFAULT_RETRY_STATUSES
+    retry_methods: FrozenSet[str] = IDEMPOTENT_METHODS
+    max_retry_after: float = 60.0
+
+    def can_retry(self, method: str, attempt: int) -> bool:
+        """Return True if another attempt is allowed after ``attempt`` (1-based)."""
+        return attempt < self.max_attempts and method.upper() in self.retry_methods
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Return the delay before the next attempt.
+
+        Args:
+            attempt: The attempt that just failed (1-based)
+            retry_after: Delay requested by the server, if any
+
+        Returns:
+            Delay in seconds
+        """
+        if retry_after is not None:
+            return min(max(retry_after, 0.0), self.max_retry_after)
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return random.uniform(0, delay) if self.jitter else delay
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header (delta-seconds or HTTP-date).
+
+    Returns:
+        Delay in seconds, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one upstream host.
+
+    closed:    requests pass; ``failure_threshold`` consecutive failures open the circuit
+    open:      requests fail fast with CircuitOpenError until ``recovery_timeout`` elapses
+    half_open: a single probe request is let through; success closes, failure re-opens
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the breaker.
+
+        Args:
+            name: Host name used in errors and logs
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds to stay open before allowing a probe
+            clock: Monotonic clock (injectable for tests)
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Current state; an open circuit reports half_open once the timeout has elapsed."""
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.recovery_timeout:
+            return self.HALF_OPEN
+        return self._state
+
+    def before_request(self) -> bool:
+        """
+        Check whether a request may be sent.
+
+        Returns:
+            True if this request is the half-open probe; the caller must report its
+            outcome or call release_probe() if it is abandoned
+
+        Raises:
+            CircuitOpenError: While the circuit is open or a probe is already in flight
+        """
+        state = self.state
+        if state == self.CLOSED:
+            return False
+        if state == self.HALF_OPEN and not self._probe_in_flight:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = True
+            return True
+        retry_after = max(self.recovery_timeout - (self._clock() - self._opened_at), 0.0)
+        raise CircuitOpenError(
+            f"Circuit open for {self.name}; retry in {retry_after:.1f}s",
+            status_code=503,
+            retry_after=retry_after,
+        )
+
+    def record_success(self) -> None:
+        """Close the circuit and reset the failure count."""
+        self._state = self.CLOSED
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """Free the probe slot of an abandoned (e.g. cancelled) probe without recording an outcome."""
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failure; open the circuit at the threshold or when a probe fails."""
+        self._failures += 1
+        self._probe_in_flight = False
+        if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            self._state = self.OPEN
+            self._opened_at = self._clock()
+
+    def stats(self) -> dict:
+        """Snapshot for diagnostics."""
+        return {"name": self.name, "state": self.state, "failures": self._failures}
@@ -0,0 +1,138 @@
+"""
+Incremental JSON decoding for large API responses
+
+JSONArrayStream yields the elements of one array inside a JSON document as
+the bytes arrive, so a response with thousands of records never has to be
+held in memory as a single string plus a fully decoded tree. Everything
+outside the array is kept and decoded once the stream ends (``envelope``).
+"""
+
+import codecs
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from .exceptions import APIError
+
+_WHITESPACE = " \t\n\r"
+# A number or literal item is complete only once one of these follows it
+_SCALAR_END = _WHITESPACE + ",]"
+_decoder = json.JSONDecoder()
+
+
+class JSONArrayStream:
+    """
+    Async iterator over the items of the array at ``item_path``.
+
+    ``item_path`` is the sequence of object keys leading to the array, e.g.
+    ``("LOCALDATA_020301", "row")``. If the document has no array at that path
+    the iterator yields nothing. After iteration, ``envelope`` holds the rest
+    of the document with the array replaced by ``[]``.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes], item_path: Sequence[str]):
+        """
+        Initialize the stream.
+
+        Args:
+            chunks: Raw response body chunks
+            item_path: Object keys leading to the array to stream
+        """
+        self._chunks = chunks
+        self.item_path = list(item_path)
+        self.envelope: Optional[Dict[str, Any]] = None
+        self.items_yielded = 0
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[Any]:
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        envelope: List[str] = []  # document text outside the streamed array
+        buffer = ""
+        pos = 0
+        # Scanner state outside the array
+        path: List[Optional[str]] = []  # key of each open container (None for the root and array members)
+        pending_key: Optional[str] = None
+        last_string: Optional[str] = None
+        string_start = 0
+        in_string = escaped = False
+        # Item state inside the array
+        in_array = streamed = False
+        expect_item = True
+
+        async for chunk in self._chunks:
+            buffer += decoder.decode(chunk)
+            while pos < len(buffer):
+                char = buffer[pos]
+                if in_array:
+                    if char in _WHITESPACE:
+                        pos += 1
+                    elif char == ",":
+                        expect_item = True
+                        pos += 1
+                    elif char == "]":
+                        # Leave the array; the envelope gets "[]" in its place
+                        in_array = False
+                        envelope.append("]")
+                        buffer, pos = buffer[pos + 1:], 0
+                    else:
+                        try:
+                            item, end = _decoder.raw_decode(buffer, pos)
+                        except json.JSONDecodeError:
+                            break  # incomplete item, wait for more bytes
+                        if (not isinstance(item, (dict, list, str))
+                                and (end == len(buffer) or buffer[end] not in _SCALAR_END)):
+                            # A number or literal may continue in the next chunk ("1." + "5e3");
+                            # raw_decode would accept the prefix, so wait for a delimiter
+                            break
+                        if not expect_item:
+                            raise APIError("Malformed JSON array in streamed response")
+                        pos, expect_item = end, False
+                        self.items_yielded += 1
+                        yield item
+                    continue
+
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif char == "\\":
+                        escaped = True
+                    elif char == '"':
+                        in_string = False
+                        last_string = json.loads(buffer[string_start:pos + 1])
+                elif char == '"':
+                    in_string, string_start = True, pos
+                elif char == ":":
+                    pending_key = last_string
+                elif char == "[" and not streamed and path and path[1:] + [pending_key] == self.item_path:
+                    # Enter the target array: keep the text so far for the envelope
+                    envelope.append(buffer[:pos + 1])
+                    buffer, pos = buffer[pos + 1:], 0
+                    in_array = streamed = True
+                    expect_item = True
+                    pending_key = None
+                    continue
+                elif char in "{[":
+                    path.append(pending_key)
+                    pending_key = None
+                elif char in "}]":
+                    path.pop()
+                    pending_key = None
+                elif char == ",":
+                    pending_key = None
+                pos += 1
+
+            if in_array:
+                # Items before pos have been yielded; drop them to keep memory bounded
+                buffer, pos = buffer[pos:], 0
+
+        buffer += decoder.decode(b"", final=True)
+        if in_array:
+            raise APIError("Truncated JSON array in streamed response")
+        envelope.append(buffer)
+        text = "".join(envelope).strip()
+        if text:
+            try:
+                self.envelope = json.loads(text)
+            except json.JSONDecodeError as e:
+                raise APIError(f"Invalid JSON in streamed response: {e}")
@@ -1,5 +1,11 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 from app.api.v1.endpoints import user, pet_clinic
+from app.core import metrics
+from app.core.config import get_settings
+from app.core.http_clients import client_registry
+from app.core.responses import FastJSONResponse
+from app.core.ssh_tunnel import ssh_tunnel
+from app.db.session import check_database, engine, pool_stats, read_engine
 
 router = APIRouter()
 
@@ -10,4 +16,45 @@ router.include_router(pet_clinic.router, prefix="/pet-clinic", tags=["Pet-clinic
 
 @router.get("/health", tags=["Health"])
 def health_check():
+    # liveness: 프로세스가 요청을 처리할 수 있는지만 확인 (DB 연결과 무관)
     return {"status": "ok"}
+
+
+@router.get("/ready", tags=["Health"], responses={503: {"description": "SSH 터널 또는 DB 에 아직 연결되지 않음"}})
+async def readiness_check(request: Request):
+    """readiness: SSH 터널(dev) 과 primary DB 가 연결되어 트래픽을 받을 수 있는지 확인"""
+    if ssh_tunnel.ready:
+        database = await check_database(engine, get_settings().READY_DB_TIMEOUT)
+    else:
+        # 터널 없이 접속을 시도하면 timeout 까지 기다리기만 하므로 건너뜀
+        database = {"ok": False, "error": "waiting for SSH tunnel"}
+    ready = ssh_tunnel.ready and database["ok"]
+    return FastJSONResponse({
+        "status": "ready" if ready else "not_ready",
+        "checks": {"ssh_tunnel": ssh_tunnel.status(), "database": database},
+        "cold_start": getattr(request.app.state, "cold_start", None),
+    }, status_code=200 if ready else 503)
+
+
+@router.get("/metrics", tags=["Health"], response_class=Response)
+async def prometheus_metrics():
+    # 스냅샷이 이벤트 루프에서 갱신되는 dict 를 읽으므로 threadpool 이 아닌 async 로 처리
+    return Response(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@router.get("/diagnostics/db-pool", tags=["Health"])
+def db_pool_diagnostics():
+    stats = {"primary": pool_stats(engine)}
+    if read_engine is not None:
+        stats["replica"] = pool_stats(read_engine)
+    return stats
+
+
+@router.get("/diagnostics/circuit-breakers", tags=["Health"])
+def circuit_breaker_diagnostics():
+    return client_registry.breaker_stats()
+
+
+@router.get("/diagnostics/rate-limiters", tags=["Health"])
+def rate_limiter_diagnostics():
+    return client_registry.limiter_stats()
@@ -1,81 +1,256 @@
 # =============================
 # 공공 API 연동 및 데이터 적재
 # =============================
-import httpx
+import time
+from functools import partial
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import Response, StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.dialects.postgresql import insert as pg_insert
-from typing import List
-from app.db.session import get_db
-from app.models.pet_clinic import PetClinic
-from app.schemas.pet_clinic import ClinicRow
+from typing import Annotated, Iterator, List, Literal, Optional, Union
+from app.api.common.exceptions import APIError, CircuitOpenError
+from app.db.crud import find_nearby_pet_clinics, get_clinic_geom_index_srid, list_pet_clinics, upsert_pet_clinics
+from app.db.session import get_db, get_read_db, is_replica_session
+from app.models.pet_clinic import SEOUL_DISTRICT_CODES
+from app.schemas.pet_clinic import ClinicPage, ClinicRow, LoadSummary, NearbyClinic, SyncJobRead
+from app.services.coordinates import PROJECTIONS, wgs84_to_tm
+from app.services.jobs import job_runner
+from app.services.pet_clinic_loader import (
+    SEOUL_OPEN_API_BASE_URL, after_ingestion, clinic_rows_adapter, fetch_page, map_clinic_rows,
+    run_pet_clinic_sync, sync_job_params, validate_clinic_rows
+)
+from app.services.spatial_index import clinic_index
+from app.core.cache import clinic_cache
 from app.core.config import get_settings
+from app.core.http_clients import client_registry
+from app.core.logging_config import logger
+from app.core.metrics import observe_ingestion
+from app.core.responses import FastJSONResponse
 
 router = APIRouter()
 settings = get_settings()
 
-@router.get("/load-pet-clinics", response_model=List[ClinicRow], responses={
-    200: {"description": "INFO-000: 정상 처리되었습니다."},
+# 서울 열린데이터 광장 결과 코드 → HTTP 상태
+SEOUL_RESULT_STATUS = {"INFO-100": 401, "INFO-200": 404}
+
+
+def seoul_error_to_http(e: APIError) -> HTTPException:
+    if isinstance(e, CircuitOpenError):
+        # 업스트림 장애로 서킷이 열린 상태: 요청을 보내지 않고 바로 503
+        return HTTPException(status_code=503, detail=e.message,
+                             headers={"Retry-After": str(int(e.retry_after or 0) + 1)})
+    code = e.response_data.get("RESULT", {}).get("CODE", "")
+    if code in SEOUL_RESULT_STATUS:
+        status_code = SEOUL_RESULT_STATUS[code]
+    elif code.startswith("ERROR-3"):
+        status_code = 400
+    else:
+        status_code = 502
+    return HTTPException(status_code=status_code, detail=e.message)
+
+# response=ndjson 에서 한 번에 내보내는 row 수
+NDJSON_CHUNK_ROWS = 100
+
+
+def ndjson_rows(clinics: List[ClinicRow]) -> Iterator[str]:
+    """ClinicRow 를 한 줄에 하나씩 JSON 으로 직렬화 (NDJSON_CHUNK_ROWS 단위로 전송)"""
+    for start in range(0, len(clinics), NDJSON_CHUNK_ROWS):
+        yield "".join(clinic.model_dump_json() + "\n"
+                      for clinic in clinics[start:start + NDJSON_CHUNK_ROWS])
+
+
+@router.get("/load-pet-clinics", response_model=Union[List[ClinicRow], LoadSummary], responses={
+    200: {
+        "description": "INFO-000: 정상 처리되었습니다. "
+                       "response=full 은 적재한 row 목록, summary 는 건수 요약, ndjson 은 row 를 한 줄씩 스트리밍",
+        "content": {"application/x-ndjson": {}},
+    },
     400: {"description": "ERROR-300~336: 요청 인자 오류 또는 샘플 범위 초과"},
     401: {"description": "INFO-100: 인증키가 유효하지 않습니다."},
     404: {"description": "INFO-200: 해당하는 데이터가 없습니다."},
-    500: {"description": "ERROR-500~601: 서버 또는 SQL 오류"}
+    500: {"description": "ERROR-500~601: 서버 또는 SQL 오류"},
+    503: {"description": "서울 열린데이터 광장 장애로 서킷 브레이커가 열린 상태"}
 })
-async def load_pet_clinics(start: int = 1, end: int = 5, db: AsyncSession = Depends(get_db)):
-    API_KEY = settings.SEOUL_OPEN_API_KEY
-    url = f"http://openapi.seoul.go.kr:8088/{API_KEY}/json/LOCALDATA_020301/{start}/{end}/"
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url)
-        data = response.json()
-
-    rows = data.get("LOCALDATA_020301", {}).get("row", [])
+async def load_pet_clinics(start: int = 1, end: int = 5,
+                           batch_size: Annotated[Optional[int], Query(ge=1, description="upsert 배치 크기 (기본값: PET_CLINIC_UPSERT_BATCH_SIZE)")] = None,
+                           response: Annotated[Literal["full", "summary", "ndjson"], Query(description="응답 형식: full(row 목록) | summary(건수 요약) | ndjson(row 스트리밍)")] = "full",
+                           db: AsyncSession = Depends(get_db)):
+    request_started = time.perf_counter()
+    try:
+        rows, _ = await fetch_page(client_registry.get(SEOUL_OPEN_API_BASE_URL),
+                                   settings.SEOUL_OPEN_API_KEY, start, end)
+    except APIError as e:
+        raise seoul_error_to_http(e)
     if not rows:
         raise HTTPException(status_code=404, detail="No data returned from API")
 
-    clinics = [PetClinic(
-        opnsfteamcode=r.get("OPNSFTEAMCODE"),
-        mgt_no=r.get("MGTNO"),
-        apv_perm_ymd=r.get("APVPERMYMD"),
-        apv_cancel_ymd=r.get("APVCANCELYMD"),
-        trd_state_gbn=r.get("TRDSTATEGBN"),
-        trd_state_nm=r.get("TRDSTATENM"),
-        dtl_state_gbn=r.get("DTLSTATEGBN"),
-        dtl_state_nm=r.get("DTLSTATENM"),
-        dcby_md=r.get("DCBYMD"),
-        clg_st_dt=r.get("CLGSTDT"),
-        clg_end_dt=r.get("CLGENDDT"),
-        ropn_ymd=r.get("ROPNYMD"),
-        site_tel=r.get("SITETEL"),
-        site_area=r.get("SITEAREA"),
-        site_post_no=r.get("SITEPOSTNO"),
-        site_whl_addr=r.get("SITEWHLADDR"),
-        rdn_whl_addr=r.get("RDNWHLADDR"),
-        rdn_post_no=r.get("RDNPOSTNO"),
-        bplc_nm=r.get("BPLCNM"),
-        last_mod_ts=r.get("LASTMODTS"),
-        update_gbn=r.get("UPDATEGBN"),
-        update_dt=r.get("UPDATEDT"),
-        uptae_nm=r.get("UPTAENM"),
-        x=float(r["X"]) if r.get("X") else None,
-        y=float(r["Y"]) if r.get("Y") else None,
-        lind_job_gbn_nm=r.get("LINDJOBGBNNM"),
-        lind_prcb_gbn_nm=r.get("LINDPRCBGBNNM"),
-        lind_seq_no=r.get("LINDSEQNO"),
-        rgtmbds_no=r.get("RGTMBDSNO"),
-        totep_num=r.get("TOTEPNUM")
-    ) for r in rows]
-
-    for clinic in clinics:
-        clinic_data = ClinicRow.from_orm(clinic).dict(exclude_unset=True)
-
-        stmt = pg_insert(PetClinic).values(**clinic_data)
-        stmt = stmt.on_conflict_do_update(
-            index_elements=['mgt_no'],
-            set_=clinic_data
-        )
-        await db.execute(stmt)
+    # row → 컬럼 dict 한 번 변환, 같은 dict 를 upsert 에 쓰고 검증된 ClinicRow 는 그대로 응답
+    clinic_rows = map_clinic_rows(rows)
+    try:
+        clinics = validate_clinic_rows(clinic_rows)
+    except ValidationError as e:
+        raise HTTPException(status_code=502, detail=f"Invalid data from upstream API: {e.error_count()} errors")
+
+    started = time.perf_counter()
+    # 값이 같은 행은 갱신하지 않음 (WAL/updated_at 변경 없음, summary 의 rows_unchanged 로 집계)
+    upserted = await upsert_pet_clinics(
+        db, clinic_rows, batch_size=batch_size or settings.PET_CLINIC_UPSERT_BATCH_SIZE, only_changed=True
+    )
     await db.commit()
+    elapsed = time.perf_counter() - started
+    await after_ingestion(db)
+    observe_ingestion("page", upserted.sent, elapsed)
+
+    total = upserted.sent
+    logger.info(
+        f"🐾 동물병원 {total}건 upsert 완료 "
+        f"(배치 {len(upserted.batch_counts)}개: {upserted.batch_counts}, {elapsed:.3f}s, {total / elapsed if elapsed else 0:.1f} rows/s)"
+    )
+
+    if response == "summary":
+        duration = time.perf_counter() - request_started
+        return LoadSummary(
+            start=start, end=end,
+            rows_fetched=len(rows),
+            rows_upserted=total,
+            rows_inserted=upserted.inserted,
+            rows_updated=upserted.updated,
+            rows_unchanged=upserted.unchanged,
+            duration=round(duration, 6),
+            rows_per_sec=round(total / duration if duration else 0.0, 1),
+        )
+    if response == "ndjson":
+        return StreamingResponse(ndjson_rows(clinics), media_type="application/x-ndjson")
+    # 이미 검증된 ClinicRow 목록이므로 response_model 재검증/jsonable_encoder 없이 한 번에 직렬화
+    return Response(clinic_rows_adapter.dump_json(clinics), media_type="application/json")
+
+
+# =============================
+# 병원 목록 조회
+# =============================
+@router.get("/clinics", response_model=ClinicPage, responses={
+    400: {"description": "알 수 없는 자치구"}
+})
+async def list_clinics(
+        status: Annotated[Optional[Literal["open", "closed"]], Query(description="open: 영업/정상, closed: 휴업·폐업 등")] = None,
+        district: Annotated[Optional[str], Query(description="자치구명(예: 강남구) 또는 개방자치단체코드(예: 3220000)")] = None,
+        name: Annotated[Optional[str], Query(min_length=1, description="사업장명 접두어")] = None,
+        after: Annotated[Optional[str], Query(description="이전 응답의 next_cursor")] = None,
+        limit: Annotated[int, Query(ge=1, le=500)] = 50,
+        db: AsyncSession = Depends(get_read_db)):
+    """mgt_no 기준 keyset 페이지네이션으로 동물병원 목록 조회"""
+    district_code = None
+    if district:
+        district_code = SEOUL_DISTRICT_CODES.get(district, district)
+        if not district_code.isdigit():
+            raise HTTPException(status_code=400, detail=f"Unknown district: {district}")
+
+    async def load():
+        # 한 건 더 읽어 다음 페이지 존재 여부 확인
+        clinics = await list_pet_clinics(db, status=status, district_code=district_code,
+                                         name_prefix=name, after=after, limit=limit + 1)
+        next_cursor = clinics[limit - 1].mgt_no if len(clinics) > limit else None
+        page = ClinicPage(items=[ClinicRow.model_validate(c) for c in clinics[:limit]], next_cursor=next_cursor)
+        return page.model_dump(mode="json")
+
+    params = {"route": "clinics", "status": status, "district": district_code,
+              "name": name, "after": after, "limit": limit}
+    # 캐시 값은 이미 검증 후 JSON 으로 변환된 ClinicPage 이므로 모델 재검증 없이 바로 직렬화
+    # replica 조회는 적재 직후(복제 지연 구간) 캐시하지 않음
+    return FastJSONResponse(await clinic_cache.get_or_set(params, load, replica=is_replica_session(db)))
+
+
+# =============================
+# 근접 병원 조회
+# =============================
+# PostGIS 식 인덱스 SRID 확인은 worker 당 한 번
+_geom_index_checked = False
+
+
+async def check_geom_index(db, srid: int) -> None:
+    """
+    ix_seoul_pet_clinics_geom 의 SRID 가 PET_CLINIC_TM_CRS 와 같은지 확인
+    - 다르면 질의 식이 인덱스와 맞지 않아 KNN 이 순차 탐색으로 바뀌므로 경고 (app/sql/seoul_pet_clinics_postgis.sql 참고)
+    """
+    global _geom_index_checked
+    if _geom_index_checked:
+        return
+    _geom_index_checked = True
+    try:
+        index_srid = await get_clinic_geom_index_srid(db)
+    except Exception as e:
+        logger.warning(f"⚠️ PostGIS 인덱스 SRID 확인 실패: {type(e).__name__}: {e}")
+        return
+    if index_srid != srid:
+        logger.warning(
+            f"⚠️ ix_seoul_pet_clinics_geom SRID({index_srid}) 가 PET_CLINIC_TM_CRS({srid}) 와 달라 근접 조회가 인덱스를 쓰지 않습니다. "
+            f"psql -v srid={srid} -f app/sql/seoul_pet_clinics_postgis.sql 로 인덱스를 다시 만드세요."
+        )
+
+
+@router.get("/nearby", response_model=List[NearbyClinic])
+async def find_nearby_clinics(
+        lat: Annotated[float, Query(ge=33.0, le=39.0, description="위도 (WGS84)")],
+        lng: Annotated[float, Query(ge=124.0, le=132.0, description="경도 (WGS84)")],
+        k: Annotated[int, Query(ge=1, le=100, description="최대 결과 수")] = 10,
+        radius: Annotated[Optional[float], Query(gt=0, le=50000, description="검색 반경 (m)")] = None,
+        include_closed: Annotated[bool, Query(description="폐업/휴업 병원 포함 여부")] = False,
+        db: AsyncSession = Depends(get_read_db)):
+    """가까운 순으로 동물병원 k 곳 조회 (기본: 인메모리 격자 인덱스, PET_CLINIC_NEARBY_BACKEND=postgis 로 전환 가능)"""
+    projection = PROJECTIONS[settings.PET_CLINIC_TM_CRS]
+
+    if settings.PET_CLINIC_NEARBY_BACKEND != "postgis":
+        # 인메모리 인덱스 조회가 캐시 조회보다 빠르므로 캐시하지 않음
+        if clinic_index.is_stale(settings.PET_CLINIC_INDEX_MAX_AGE):
+            await clinic_index.refresh(db, max_age=settings.PET_CLINIC_INDEX_MAX_AGE)
+        x, y = wgs84_to_tm(lat, lng, projection)
+        found = clinic_index.nearest(float(x), float(y), k=k, radius=radius, include_closed=include_closed)
+        return [NearbyClinic(distance_m=round(distance, 1), clinic=ClinicRow.model_validate(clinic))
+                for distance, clinic in found]
+
+    # 약 1m 단위로 반올림해 같은 위치의 반복 조회가 같은 캐시 키를 쓰도록 함
+    lat, lng = round(lat, 5), round(lng, 5)
+
+    await check_geom_index(db, projection.srid)
+
+    async def load():
+        found = await find_nearby_pet_clinics(db, lat, lng, k=k, radius=radius,
+                                              include_closed=include_closed, srid=projection.srid)
+        return [NearbyClinic(distance_m=round(distance, 1), clinic=ClinicRow.model_validate(clinic)).model_dump(mode="json")
+                for distance, clinic in found]
+
+    params = {"route": "nearby", "lat": lat, "lng": lng, "k": k, "radius": radius, "include_closed": include_closed}
+    return FastJSONResponse(await clinic_cache.get_or_set(params, load, replica=is_replica_session(db)))
+
+# =============================
+# 백그라운드 동기화 작업
+# =============================
+@router.post("/sync-jobs", response_model=SyncJobRead, status_code=202, responses={
+    202: {"description": "작업 등록 (동일한 작업이 진행 중이면 기존 작업 반환)"}
+})
+async def create_sync_job(
+        incremental: Annotated[bool, Query(description="마지막 동기화 이후 LASTMODTS 가 바뀐 행만 적재")] = False,
+        concurrency: Annotated[Optional[int], Query(ge=1, le=16, description="동시 페이지 요청 수 (기본값: PET_CLINIC_SYNC_CONCURRENCY)")] = None,
+        batch_size: Annotated[Optional[int], Query(ge=1, description="upsert 배치 크기 (기본값: PET_CLINIC_UPSERT_BATCH_SIZE)")] = None):
+    """
+    전체/증분 동기화를 큐에 등록하고 작업 id 반환 (진행 상황은 GET /sync-jobs/{job_id})
+    - 전체 페이지 동기화는 요청 timeout 을 넘길 수 있으므로 요청 안에서 실행하지 않음
+    - 작업 기록은 sync_jobs 테이블에 있으므로 어느 worker 로 polling 해도 조회됨
+    """
+    params = sync_job_params(incremental=incremental, concurrency=concurrency, batch_size=batch_size)
+    job, _ = await job_runner.submit(params, partial(run_pet_clinic_sync, **params))
+    return SyncJobRead.model_validate(job)
+
+
+@router.get("/sync-jobs", response_model=List[SyncJobRead])
+async def list_sync_jobs():
+    return [SyncJobRead.model_validate(job) for job in await job_runner.list()]
+
 
-    return [ClinicRow.from_orm(clinic) for clinic in clinics]
+@router.get("/sync-jobs/{job_id}", response_model=SyncJobRead)
+async def read_sync_job(job_id: str):
+    job = await job_runner.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Sync job not found")
+    return SyncJobRead.model_validate(job)
@@ -0,0 +1,204 @@
+# core/cache.py
+"""
+조회 API 응답 캐시
+
+- MemoryLRUCache: 프로세스 내 LRU + TTL (기본값, 테스트용 대체 구현으로도 사용)
+  버전 카운터도 프로세스별이라 적재 후 다른 worker 는 TTL(CACHE_MEMORY_TTL) 동안 이전 응답을 반환할 수 있음
+- RedisCache: 여러 uvicorn worker 가 공유하는 캐시 (redis 패키지 설치 시)
+- ResponseCache: namespace 버전을 키에 포함시켜, 적재 후 버전만 올리면 이전 응답 전체가 무효화됨
+"""
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.config import get_settings
+from app.core.logging_config import logger
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # redis 는 선택 의존성
+    aioredis = None
+
+
+class MemoryLRUCache:
+    """프로세스 내 LRU 캐시 (항목별 만료 시각 보관, incr 카운터는 LRU 축출 대상에서 제외)"""
+
+    def __init__(self, max_entries: int = 1024, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[Any]:
+        if key in self._counters:
+            return self._counters[key]
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= self._clock():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._data[key] = (value, self._clock() + ttl if ttl else None)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+
+class RedisCache:
+    """Redis 캐시 (값은 JSON 문자열로 저장)"""
+
+    def __init__(self, url: str, timeout: Optional[float] = None):
+        if aioredis is None:
+            raise ImportError("redis package is required for CACHE_BACKEND=redis")
+        if "://" not in url:
+            url = f"redis://{url}"
+        # 장애 시 요청이 Redis 응답을 기다리며 멈추지 않도록 연결/명령 timeout 적용
+        self._redis = aioredis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout)
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self._redis.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        await self._redis.set(key, json.dumps(value, ensure_ascii=False), ex=int(ttl) if ttl else None)
+
+    async def incr(self, key: str) -> int:
+        return await self._redis.incr(key)
+
+
+class ResponseCache:
+    """
+    namespace 단위 응답 캐시
+    - 키: {namespace}:v{버전}:{정규화된 파라미터 해시}
+    - invalidate() 는 버전만 올리므로 O(1), 이전 버전 항목은 TTL/LRU 로 자연 소멸
+    - 무효화 후 replica_lag 초 동안은 replica 조회 결과를 저장하지 않음
+      (복제가 늦은 replica 의 이전 데이터가 새 버전 키로 TTL 내내 남지 않도록)
+    - 조회/저장 중 backend 오류(Redis 장애 등)는 로그만 남기고 캐시 없이 loader() 로 응답
+    """
+
+    def __init__(self, namespace: str, backend, ttl: float = 600, replica_lag: int = 0):
+        self.namespace = namespace
+        self.backend = backend
+        self.ttl = ttl
+        self.replica_lag = replica_lag
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @property
+    def _version_key(self) -> str:
+        return f"{self.namespace}:version"
+
+    @property
+    def _lagging_key(self) -> str:
+        # 무효화 후 replica_lag 초 동안만 존재 (여러 worker 가 같은 backend 로 공유)
+        return f"{self.namespace}:replica-lagging"
+
+    @staticmethod
+    def normalize(params: Dict[str, Any]) -> str:
+        """None 인 파라미터는 제외하고 키 순서와 무관하게 같은 문자열이 되도록 정규화"""
+        return json.dumps({k: v for k, v in params.items() if v is not None},
+                          sort_keys=True, ensure_ascii=False, default=str)
+
+    async def _key(self, params: Dict[str, Any]) -> str:
+        version = await self.backend.get(self._version_key) or 0
+        digest = hashlib.sha1(self.normalize(params).encode()).hexdigest()
+        return f"{self.namespace}:v{version}:{digest}"
+
+    async def get_or_set(self, params: Dict[str, Any], loader: Callable[[], Awaitable[Any]],
+                         replica: bool = False) -> Any:
+        """
+        캐시에 있으면 반환, 없으면 loader() 결과(JSON 직렬화 가능한 값)를 저장 후 반환
+
+        Args:
+            replica: loader 가 replica 세션으로 조회하는지 여부 (무효화 직후에는 결과를 저장하지 않음)
+        """
+        try:
+            key = await self._key(params)
+            cached = await self.backend.get(key)
+        except Exception as e:
+            self._backend_error("조회", e)
+            return await loader()
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        value = await loader()
+        try:
+            if replica and self.replica_lag and await self.backend.get(self._lagging_key) is not None:
+                return value
+            await self.backend.set(key, value, self.ttl)
+        except Exception as e:
+            self._backend_error("저장", e)
+        return value
+
+    def _backend_error(self, action: str, e: Exception, fallback: str = "캐시 없이 처리") -> None:
+        self.errors += 1
+        logger.warning(f"⚠️ {self.namespace} 응답 캐시 {action} 실패, {fallback}: {type(e).__name__}: {e}")
+
+    async def invalidate(self) -> Optional[int]:
+        """
+        버전을 올려 이전 응답 무효화 (적재 commit 이후 호출)
+
+        Returns:
+            새 버전, backend 오류 시 None (이미 commit 된 적재를 실패시키지 않고, 이전 응답은 TTL 까지 남음)
+        """
+        try:
+            version = await self.backend.incr(self._version_key)
+            if self.replica_lag:
+                await self.backend.set(self._lagging_key, version, self.replica_lag)
+        except Exception as e:
+            self._backend_error("무효화", e, fallback=f"이전 응답이 최대 {self.ttl}s 동안 남을 수 있음")
+            return None
+        logger.info(f"🧹 {self.namespace} 응답 캐시 무효화 (version={version})")
+        return version
+
+
+class NullCache:
+    """CACHE_BACKEND=none: 캐시 비활성화"""
+
+    async def get(self, key: str) -> Optional[Any]:
+        return None
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        pass
+
+    async def incr(self, key: str) -> int:
+        return 0
+
+
+def create_cache_backend(settings=None):
+    settings = settings or get_settings()
+    if settings.CACHE_BACKEND == "redis":
+        try:
+            return RedisCache(settings.REDIS_URL, timeout=settings.CACHE_TIMEOUT)
+        except ImportError as e:
+            logger.warning(f"⚠️ {e}, 인메모리 캐시로 대체합니다.")
+    elif settings.CACHE_BACKEND == "none":
+        return NullCache()
+    return MemoryLRUCache(max_entries=settings.CACHE_MAX_ENTRIES)
+
+
+def cache_ttl(backend, settings=None) -> float:
+    """프로세스 내 캐시는 다른 worker 에서 무효화되지 않으므로 TTL 을 CACHE_MEMORY_TTL 이하로 제한"""
+    settings = settings or get_settings()
+    if isinstance(backend, MemoryLRUCache):
+        return min(settings.CACHE_TTL, settings.CACHE_MEMORY_TTL)
+    return settings.CACHE_TTL
+
+
+_settings = get_settings()
+_backend = create_cache_backend(_settings)
+clinic_cache = ResponseCache("pet_clinic", _backend, ttl=cache_ttl(_backend, _settings),
+                             replica_lag=_settings.CACHE_REPLICA_LAG)
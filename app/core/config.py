@@ -15,6 +15,10 @@ class Settings(BaseSettings):
     SSH_PORT: int = os.getenv("SSH_PORT",22)
     SSH_USER: str = os.getenv("SSH_USER","ubuntu")
     PRIVATE_KEY_PATH: str = os.getenv("PRIVATE_KEY_PATH","./petple_db_server_key_pair.pem")
+    # 터널 상태 확인 주기와 재연결 backoff (초, dev 환경)
+    SSH_TUNNEL_CHECK_INTERVAL: float = os.getenv("SSH_TUNNEL_CHECK_INTERVAL", 5.0)
+    SSH_TUNNEL_BACKOFF_BASE: float = os.getenv("SSH_TUNNEL_BACKOFF_BASE", 1.0)
+    SSH_TUNNEL_BACKOFF_MAX: float = os.getenv("SSH_TUNNEL_BACKOFF_MAX", 30.0)
 
     # PostgreSQL 정보
     POSTGRES_URL: str = os.getenv("POSTGRES_URL", "localhost")
@@ -25,9 +29,90 @@ class Settings(BaseSettings):
     POSTGRES_USER: str = os.getenv("POSTGRES_USER","postgres")
     POSTGRES_PASS: str = os.getenv("POSTGRES_PASS","your_password")
 
+    # 읽기 전용 replica (미설정 시 조회도 primary 사용, 계정/DB 명은 primary 와 동일)
+    POSTGRES_READ_HOST: str = os.getenv("POSTGRES_READ_HOST", "")
+    POSTGRES_READ_PORT: int = os.getenv("POSTGRES_READ_PORT", 5432)
+
+    # DB 커넥션 풀 설정 (uvicorn worker 당 적용)
+    DB_POOL_SIZE: int = os.getenv("DB_POOL_SIZE", 5)
+    DB_MAX_OVERFLOW: int = os.getenv("DB_MAX_OVERFLOW", 10)
+    DB_POOL_TIMEOUT: float = os.getenv("DB_POOL_TIMEOUT", 30)
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", True)
+    DB_POOL_RECYCLE: int = os.getenv("DB_POOL_RECYCLE", 1800)
+    DB_ECHO: bool = os.getenv("DB_ECHO", False)
+    DB_STATEMENT_CACHE_SIZE: int = os.getenv("DB_STATEMENT_CACHE_SIZE", 100)
+    # /ready 의 DB 연결 확인(SELECT 1) 제한 시간 (초)
+    READY_DB_TIMEOUT: float = os.getenv("READY_DB_TIMEOUT", 2.0)
+
     # Redis 정보
     REDIS_URL: str = os.getenv("REDIS_URL", "localhost")
 
+    # 응답 캐시 설정
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory")  # memory | redis | none
+    CACHE_TTL: int = os.getenv("CACHE_TTL", 600)
+    # memory 캐시는 적재를 처리한 worker 에서만 무효화되므로, 다른 worker 가 이전 응답을 내보내는 최대 시간(초)
+    # (여러 worker 에서 CACHE_TTL 전체를 쓰려면 CACHE_BACKEND=redis)
+    CACHE_MEMORY_TTL: int = os.getenv("CACHE_MEMORY_TTL", 30)
+    CACHE_MAX_ENTRIES: int = os.getenv("CACHE_MAX_ENTRIES", 1024)
+    # 무효화(적재) 직후 replica 에서 읽은 응답을 캐시하지 않는 시간 (초, replica 복제 지연 상한)
+    CACHE_REPLICA_LAG: int = os.getenv("CACHE_REPLICA_LAG", 5)
+    # Redis 연결/명령 제한 시간 (초, 초과 시 캐시 없이 응답)
+    CACHE_TIMEOUT: float = os.getenv("CACHE_TIMEOUT", 0.5)
+
+    # 요청별 Server-Timing 응답 헤더 노출 여부 (구조화 타이밍 로그는 항상 기록)
+    SERVER_TIMING_HEADER: bool = os.getenv("SERVER_TIMING_HEADER", True)
+
+    # Prometheus 메트릭 (/api/v1/metrics). uvicorn --workers 2 이상이면 METRICS_MULTIPROC_DIR 에
+    # worker 별 스냅샷을 METRICS_FLUSH_INTERVAL 초마다 기록해 합산 (배포 시 비워진 디렉터리 사용)
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", True)
+    METRICS_MULTIPROC_DIR: str = os.getenv("METRICS_MULTIPROC_DIR", "")
+    METRICS_FLUSH_INTERVAL: float = os.getenv("METRICS_FLUSH_INTERVAL", 5.0)
+
+    # 외부 API HTTP 클라이언트 설정 (base URL 별 공유 커넥션 풀)
+    HTTP_TIMEOUT: int = os.getenv("HTTP_TIMEOUT", 30)
+    HTTP_MAX_CONNECTIONS: int = os.getenv("HTTP_MAX_CONNECTIONS", 20)
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", 10)
+    HTTP_KEEPALIVE_EXPIRY: float = os.getenv("HTTP_KEEPALIVE_EXPIRY", 30.0)
+    HTTP_HTTP2: bool = os.getenv("HTTP_HTTP2", False)
+
+    # 외부 API 재시도 / 서킷 브레이커 설정 (HTTP_CIRCUIT_FAILURE_THRESHOLD=0 이면 브레이커 비활성화)
+    HTTP_RETRY_MAX_ATTEMPTS: int = os.getenv("HTTP_RETRY_MAX_ATTEMPTS", 3)
+    HTTP_RETRY_BACKOFF_BASE: float = os.getenv("HTTP_RETRY_BACKOFF_BASE", 0.5)
+    HTTP_RETRY_BACKOFF_MAX: float = os.getenv("HTTP_RETRY_BACKOFF_MAX", 10.0)
+    HTTP_RETRY_JITTER: bool = os.getenv("HTTP_RETRY_JITTER", True)
+    HTTP_RETRY_STATUSES: str = os.getenv("HTTP_RETRY_STATUSES", "429,500,502,503,504")
+    HTTP_RETRY_AFTER_MAX: float = os.getenv("HTTP_RETRY_AFTER_MAX", 60.0)
+    HTTP_CIRCUIT_FAILURE_THRESHOLD: int = os.getenv("HTTP_CIRCUIT_FAILURE_THRESHOLD", 5)
+    HTTP_CIRCUIT_RECOVERY_TIMEOUT: float = os.getenv("HTTP_CIRCUIT_RECOVERY_TIMEOUT", 30.0)
+
+    # 외부 API 호출 속도 제한 (호스트/API 키별 token bucket, 초당 요청 수. 0 이면 비활성화)
+    HTTP_RATE_LIMIT: float = os.getenv("HTTP_RATE_LIMIT", 0)
+    HTTP_RATE_BURST: float = os.getenv("HTTP_RATE_BURST", 0)
+
+    # 동일 GET 동시 요청 병합(single-flight) 및 짧은 TTL 응답 캐시 (ETag/Last-Modified 재검증, 0 이면 캐시 비활성화)
+    # - 응답 캐시는 APIClient.get() 에만 적용: 동물병원 적재(stream_json 으로 받는 페이지)는 캐시하지 않음
+    #   (적재는 항상 최신 데이터를 받아야 하고, 본문 전체를 캐시에 두면 스트리밍 이점이 사라짐)
+    # - 같은 페이지 동시 요청은 HTTP_COALESCE_GETS 로 한 번의 업스트림 호출을 공유
+    HTTP_COALESCE_GETS: bool = os.getenv("HTTP_COALESCE_GETS", False)
+    HTTP_CACHE_TTL: float = os.getenv("HTTP_CACHE_TTL", 0)
+
+    # 공공데이터 적재 설정
+    PET_CLINIC_UPSERT_BATCH_SIZE: int = os.getenv("PET_CLINIC_UPSERT_BATCH_SIZE", 500)
+    PET_CLINIC_PAGE_SIZE: int = os.getenv("PET_CLINIC_PAGE_SIZE", 1000)
+    PET_CLINIC_SYNC_CONCURRENCY: int = os.getenv("PET_CLINIC_SYNC_CONCURRENCY", 4)
+    PET_CLINIC_JOB_CONCURRENCY: int = os.getenv("PET_CLINIC_JOB_CONCURRENCY", 1)
+    # 작업 기록 저장소: database(sync_jobs 테이블, worker 간 공유) | memory(프로세스 내, 단일 worker 전용)
+    PET_CLINIC_JOB_STORE: str = os.getenv("PET_CLINIC_JOB_STORE", "database")
+    PET_CLINIC_JOB_HEARTBEAT: float = os.getenv("PET_CLINIC_JOB_HEARTBEAT", 5.0)  # 진행 상황 기록 주기 (초)
+    # heartbeat 가 이 시간(초) 이상 끊긴 대기/실행 중 작업은 worker 가 죽은 것으로 보고 실패 처리
+    PET_CLINIC_JOB_STALE_AFTER: float = os.getenv("PET_CLINIC_JOB_STALE_AFTER", 60.0)
+
+    # 근접 병원 조회 설정
+    PET_CLINIC_NEARBY_BACKEND: str = os.getenv("PET_CLINIC_NEARBY_BACKEND", "memory")  # memory | postgis
+    PET_CLINIC_TM_CRS: str = os.getenv("PET_CLINIC_TM_CRS", "EPSG:2097")  # EPSG:2097 | EPSG:5174
+    PET_CLINIC_INDEX_CELL_SIZE: float = os.getenv("PET_CLINIC_INDEX_CELL_SIZE", 500.0)
+    PET_CLINIC_INDEX_MAX_AGE: int = os.getenv("PET_CLINIC_INDEX_MAX_AGE", 3600)
+
     class Config:
         env_file = ".env"  # 환경 변수 파일 경로 # 기본값은 .env, 동적으로 override됨
 
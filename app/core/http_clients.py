@@ -0,0 +1,10 @@
+# core/http_clients.py
+
+from app.api.common.registry import create_client_registry
+from app.core.config import get_settings
+from app.core.metrics import observe_upstream_call
+from app.core.timing import record_upstream_call
+
+# worker 프로세스 전체에서 공유하는 외부 API 클라이언트 (main.py 의 startup/shutdown 에서 생성/정리)
+# 모든 호출 시간은 현재 요청의 Server-Timing upstream 구간에 합산하고, 호스트별 지연/오류는 /metrics 로 집계
+client_registry = create_client_registry(get_settings(), hooks=[record_upstream_call, observe_upstream_call])
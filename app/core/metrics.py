@@ -0,0 +1,330 @@
+# core/metrics.py
+"""
+Prometheus 텍스트 포맷 메트릭 (/metrics)
+
+- HTTP 요청 수 / 지연 히스토그램 (method, route, status), 외부 API 호출 지연 / 오류 (host),
+  DB 커넥션 풀 사용량, 공공데이터 적재 rows (rows/s = rate(ingest_rows_total) / rate(ingest_duration_seconds_total))
+- 값은 프로세스 로컬 dict 에 누적: 이벤트 루프(단일 스레드)에서만 갱신하므로 락이 필요 없음
+- METRICS_MULTIPROC_DIR 를 지정하면 각 uvicorn worker 가 자기 스냅샷을 <dir>/<pid>.json 에
+  원자적 교체(os.replace)로 기록하고(갱신 후 최대 METRICS_FLUSH_INTERVAL 초 이내),
+  /metrics 를 받은 worker 가 모든 파일을 합산해 응답 (파일마다 쓰는 프로세스가 하나라 프로세스 간 락도 없음)
+  - counter / histogram: 종료된 worker 의 값까지 합산 (재시작해도 감소하지 않음)
+  - gauge: 살아있는 worker 의 값만 합산
+"""
+import asyncio
+import json
+import os
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from app.core.config import get_settings
+from app.core.logging_config import logger
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[str, ...]
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values: Dict[Labels, object] = {}
+
+    def samples(self, values: Dict[Labels, object]) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        for labels, value in values.items():
+            yield self.name, dict(zip(self.labelnames, labels)), value
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    @staticmethod
+    def merge(total, value):
+        return (total or 0.0) + value
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value: float, *labels: str) -> None:
+        self.values[labels] = float(value)
+
+    @staticmethod
+    def merge(total, value):
+        return (total or 0.0) + value
+
+
+class Histogram(Metric):
+    """
+    버킷별 관측 수(누적 아님) + sum + count 를 한 list 로 보관
+    ([b0, ..., bN, +Inf, sum, count], 출력할 때 누적으로 변환)
+    """
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        counts = self.values.get(labels)
+        if counts is None:
+            counts = self.values[labels] = [0.0] * (len(self.buckets) + 3)
+        # le 는 상한 포함이므로 bisect_left
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-2] += value
+        counts[-1] += 1
+
+    @staticmethod
+    def merge(total, value):
+        if total is None:
+            return list(value)
+        return [a + b for a, b in zip(total, value)]
+
+    def samples(self, values: Dict[Labels, object]) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+        for labels, counts in values.items():
+            base = dict(zip(self.labelnames, labels))
+            cumulative = 0.0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                yield f"{self.name}_bucket", {**base, "le": bound}, cumulative
+            yield f"{self.name}_sum", base, counts[-2]
+            yield f"{self.name}_count", base, counts[-1]
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MetricsRegistry:
+    """메트릭 정의 + 스냅샷 기록 / 합산 / 텍스트 출력"""
+
+    def __init__(self, multiproc_dir: str = "", flush_interval: float = 5.0):
+        self.multiproc_dir = multiproc_dir
+        self.flush_interval = flush_interval
+        self.metrics: Dict[str, Metric] = {}
+        self.collectors: List[Callable[[], None]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        if multiproc_dir:
+            os.makedirs(multiproc_dir, exist_ok=True)
+
+    def _register(self, metric: Metric) -> Metric:
+        if metric.name in self.metrics:
+            raise ValueError(f"Duplicate metric: {metric.name}")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """스냅샷 직전에 호출되어 gauge 등을 채우는 함수 등록 (예: DB 풀 사용량)"""
+        self.collectors.append(collector)
+
+    def snapshot(self) -> Dict[str, List[list]]:
+        for collector in self.collectors:
+            try:
+                collector()
+            except Exception:
+                logger.exception("Metrics collector failed")
+        return {
+            name: [[list(labels), value] for labels, value in metric.values.items()]
+            for name, metric in self.metrics.items()
+        }
+
+    def touch(self) -> None:
+        """값이 갱신됐음을 알림: 멀티프로세스 모드면 flush_interval 뒤 한 번 스냅샷 파일 기록 예약"""
+        if not self.multiproc_dir or self._flush_handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        self._flush_handle = loop.call_later(self.flush_interval, self.flush)
+
+    def _path(self, pid: int) -> str:
+        return os.path.join(self.multiproc_dir, f"{pid}.json")
+
+    def flush(self) -> None:
+        """현재 프로세스 스냅샷을 <dir>/<pid>.json 으로 원자적 교체"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self.multiproc_dir:
+            return
+        path = self._path(os.getpid())
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"written_at": time.time(), "metrics": self.snapshot()}, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    def _snapshots(self) -> Iterator[Tuple[bool, Dict[str, List[list]]]]:
+        """(살아있는 프로세스 여부, 스냅샷)"""
+        if not self.multiproc_dir:
+            yield True, self.snapshot()
+            return
+        self.flush()
+        for filename in os.listdir(self.multiproc_dir):
+            pid, ext = os.path.splitext(filename)
+            if ext != ".json" or not pid.isdigit():
+                continue
+            try:
+                with open(os.path.join(self.multiproc_dir, filename)) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                # 기록 중 교체된 파일 등은 다음 수집에서 반영
+                continue
+            yield _pid_alive(int(pid)), data["metrics"]
+
+    def collect(self) -> Dict[str, Dict[Labels, object]]:
+        """모든 프로세스 값을 메트릭 / 라벨 별로 합산"""
+        merged: Dict[str, Dict[Labels, object]] = {name: {} for name in self.metrics}
+        for alive, snapshot in self._snapshots():
+            for name, entries in snapshot.items():
+                metric = self.metrics.get(name)
+                if metric is None or (metric.kind == "gauge" and not alive):
+                    continue
+                values = merged[name]
+                for labels, value in entries:
+                    key = tuple(labels)
+                    values[key] = metric.merge(values.get(key), value)
+        return merged
+
+    def render(self) -> str:
+        """Prometheus text exposition format 0.0.4"""
+        lines = []
+        for name, values in self.collect().items():
+            metric = self.metrics[name]
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for sample_name, labels, value in metric.samples(dict(sorted(values.items()))):
+                if labels:
+                    label_str = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+                    lines.append(f"{sample_name}{{{label_str}}} {_format_value(value)}")
+                else:
+                    lines.append(f"{sample_name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+settings = get_settings()
+registry = MetricsRegistry(settings.METRICS_MULTIPROC_DIR, settings.METRICS_FLUSH_INTERVAL)
+
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests by route template and status", ("method", "route", "status"))
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency until the response body is sent", ("method", "route"))
+upstream_requests = registry.counter(
+    "upstream_requests_total", "Upstream API call attempts by host and status", ("host", "method", "status"))
+upstream_errors = registry.counter(
+    "upstream_request_errors_total", "Upstream API call attempts that failed (transport error or 4xx/5xx)", ("host",))
+upstream_duration = registry.histogram(
+    "upstream_request_duration_seconds", "Upstream API call latency per attempt", ("host",))
+db_pool_connections = registry.gauge(
+    "db_pool_connections", "DB pool connections by state", ("engine", "state"))
+db_pool_size = registry.gauge(
+    "db_pool_size", "Configured DB pool size", ("engine",))
+db_pool_timeouts = registry.gauge(
+    "db_pool_checkout_timeouts", "DB pool checkouts that timed out since start", ("engine",))
+ingest_rows = registry.counter(
+    "ingest_rows_total", "Rows upserted from the Seoul open data API", ("mode",))
+ingest_duration = registry.counter(
+    "ingest_duration_seconds_total", "Time spent on ingestion runs", ("mode",))
+
+
+def observe_request(method: str, route: str, status_code: int, duration: float) -> None:
+    http_requests.inc(method, route, str(status_code))
+    http_request_duration.observe(duration, method, route)
+    registry.touch()
+
+
+def observe_upstream_call(method: str, url: str, status_code: Optional[int], duration: float) -> None:
+    """APIClient hook: 외부 API 호출 1회 지연 / 오류 집계"""
+    host = urlsplit(url).netloc
+    upstream_requests.inc(host, method, str(status_code) if status_code is not None else "error")
+    upstream_duration.observe(duration, host)
+    if status_code is None or status_code >= 400:
+        upstream_errors.inc(host)
+    registry.touch()
+
+
+def observe_ingestion(mode: str, rows: int, duration: float) -> None:
+    """적재 1회 (mode: page | full | incremental) 의 upsert 건수와 소요 시간"""
+    ingest_rows.inc(mode, amount=rows)
+    ingest_duration.inc(mode, amount=duration)
+    registry.touch()
+
+
+def instrument_pool(name: str, stats: Callable[[], dict]) -> None:
+    """스냅샷마다 stats() (db.session.pool_stats) 결과를 DB 풀 gauge 로 기록"""
+    def collect() -> None:
+        current = stats()
+        for state in ("checked_out", "checked_in", "overflow"):
+            db_pool_connections.set(current[state], name, state)
+        db_pool_size.set(current["pool_size"], name)
+        db_pool_timeouts.set(current.get("timeouts", 0), name)
+
+    registry.add_collector(collect)
+
+
+class MetricsMiddleware:
+    """요청 수 / 지연을 라우트 템플릿(/pet-clinic/{id} 형태) 기준으로 집계하는 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # 라우터가 매칭한 route 를 scope 에 채움 (매칭 실패는 라벨 폭증을 막기 위해 하나로 묶음)
+            route = scope.get("route")
+            observe_request(scope["method"], getattr(route, "path", "unmatched"),
+                            status_code, time.perf_counter() - started)
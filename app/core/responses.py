@@ -0,0 +1,42 @@
+# core/responses.py
+"""
+앱 전체 기본 JSON 응답 클래스
+
+- orjson 이 설치되어 있으면 orjson 으로 직렬화, 없으면 표준 json 으로 대체 (compact, ensure_ascii=False)
+- Pydantic 모델/datetime 등도 바로 직렬화하므로, 이미 검증된 모델이나 캐시된 JSON 값을 반환하는
+  엔드포인트는 FastJSONResponse(...) 를 직접 반환해 FastAPI 의 response_model 재검증 + 변환 단계를 건너뛸 수 있음
+"""
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
+
+try:
+    import orjson
+except ImportError:  # requirements.txt 에 포함, 미설치 환경(로컬 등)에서만 표준 json 사용
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    # datetime, Decimal, UUID, Enum, set 등 (지원하지 않는 타입이면 PydanticSerializationError)
+    return to_jsonable_python(obj)
+
+
+def dumps(content: Any) -> bytes:
+    """응답 본문 직렬화 (UTF-8 bytes)"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default,
+                            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, default=_default, ensure_ascii=False, allow_nan=False,
+                      separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson(없으면 표준 json) 기반 JSONResponse"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,162 @@
+# core/ssh_tunnel.py
+"""
+개발 환경(ENV=dev) 원격 PostgreSQL 접속용 SSH 터널
+
+- sshtunnel(paramiko) 은 import 만으로 수백 ms 가 걸리므로 터널을 여는 시점에 import
+- SSH 핸드셰이크는 블로킹이므로 스레드에서 연결하고, 연결 전까지 /ready 는 503 (/health 는 200)
+- supervise() 가 주기적으로 is_active 를 확인해 끊기면 backoff 하며 재연결하고,
+  재연결 후 on_reconnect 콜백(끊긴 터널로 맺어진 DB 풀 커넥션 폐기)을 실행
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.api.common.resilience import RetryPolicy
+from app.core.config import get_settings
+from app.core.logging_config import logger
+
+
+class SSHTunnel:
+    """
+    SSHTunnelForwarder 를 이벤트 루프 밖(스레드)에서 시작/종료하는 래퍼
+
+    state: disabled(dev 가 아님) | stopped | starting | ready | failed
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.state = "stopped" if self.enabled else "disabled"
+        self.error: Optional[str] = None
+        self.connect_seconds: Optional[float] = None
+        self._forwarder = None
+        self.reconnects = 0
+        self._reconnect_callbacks: List[Callable[[], Awaitable[None]]] = []
+        self._supervisor: Optional[asyncio.Task] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self.backoff = RetryPolicy(backoff_base=float(settings.SSH_TUNNEL_BACKOFF_BASE),
+                                   backoff_max=float(settings.SSH_TUNNEL_BACKOFF_MAX)).backoff
+
+    @property
+    def enabled(self) -> bool:
+        return self.settings.ENV == "dev"
+
+    @property
+    def ready(self) -> bool:
+        """터널이 필요 없거나, 연결되어 포워딩 중인지"""
+        if not self.enabled:
+            return True
+        return self.state == "ready" and self._forwarder is not None and self._forwarder.is_active
+
+    def _open(self):
+        from sshtunnel import SSHTunnelForwarder
+
+        forwarder = SSHTunnelForwarder(
+            (self.settings.SSH_HOST, self.settings.SSH_PORT),
+            ssh_username=self.settings.SSH_USER,
+            ssh_private_key=self.settings.PRIVATE_KEY_PATH,
+            remote_bind_address=(self.settings.POSTGRES_HOST, self.settings.POSTGRES_PORT),
+            local_bind_address=("127.0.0.1", self.settings.POSTGRES_LOCAL_PORT)
+        )
+        forwarder.start()
+        return forwarder
+
+    async def start(self) -> None:
+        """스레드에서 터널 연결 (실패해도 예외를 올리지 않고 state=failed 로 남김)"""
+        if not self.enabled or self.state in ("starting", "ready"):
+            return
+        self.state = "starting"
+        started = time.perf_counter()
+        try:
+            self._forwarder = await asyncio.to_thread(self._open)
+        except Exception as e:
+            self.state = "failed"
+            self.error = f"{type(e).__name__}: {e}"
+            logger.error(f"❌ SSH Tunnel 연결 실패: {self.error}")
+            return
+        self.connect_seconds = time.perf_counter() - started
+        self.state = "ready"
+        self.error = None
+        logger.info(f"✅ SSH Tunnel 연결 완료 ({self.connect_seconds:.2f}s)")
+
+    def on_reconnect(self, callback: Callable[[], Awaitable[None]]) -> None:
+        """재연결 성공 시 실행할 콜백 등록 (같은 콜백은 한 번만)"""
+        if callback not in self._reconnect_callbacks:
+            self._reconnect_callbacks.append(callback)
+
+    async def _close_forwarder(self) -> None:
+        forwarder, self._forwarder = self._forwarder, None
+        if forwarder is None:
+            return
+        try:
+            await asyncio.to_thread(forwarder.stop)
+        except Exception as e:
+            logger.warning(f"⚠️ SSH Tunnel 종료 실패: {type(e).__name__}: {e}")
+
+    async def reconnect(self) -> bool:
+        """끊긴 터널을 닫고 다시 연결 (성공 시 on_reconnect 콜백 실행)"""
+        await self._close_forwarder()
+        self.state = "stopped"
+        await self.start()
+        if not self.ready:
+            return False
+        self.reconnects += 1
+        for callback in self._reconnect_callbacks:
+            try:
+                await callback()
+            except Exception as e:
+                logger.error(f"❌ SSH Tunnel 재연결 콜백 실패: {type(e).__name__}: {e}")
+        return True
+
+    async def supervise(self) -> None:
+        """
+        SSH_TUNNEL_CHECK_INTERVAL 초마다 터널을 확인하고, 끊겼거나 최초 연결에 실패했으면 재연결
+        - 재연결 실패가 이어지면 backoff(지수 + jitter, 최대 SSH_TUNNEL_BACKOFF_MAX 초) 간격으로 재시도
+        - stop() 이 호출되면 종료
+        """
+        attempt = 0
+        while True:
+            delay = self.backoff(attempt) if attempt else float(self.settings.SSH_TUNNEL_CHECK_INTERVAL)
+            try:
+                await asyncio.wait_for(self._stopping.wait(), delay)
+                return
+            except asyncio.TimeoutError:
+                pass
+            if self.ready or self.state == "starting":
+                attempt = 0
+                continue
+            if self.state == "ready":
+                logger.warning("⚠️ SSH Tunnel 끊김 감지, 재연결 시도")
+            attempt += 1
+            if await self.reconnect():
+                logger.info(f"✅ SSH Tunnel 재연결 완료 (시도 {attempt}회)")
+                attempt = 0
+
+    def start_supervisor(self) -> None:
+        """supervise() 를 백그라운드 task 로 실행 (dev 환경에서만)"""
+        if not self.enabled or self._supervisor is not None:
+            return
+        self._stopping = asyncio.Event()
+        self._supervisor = asyncio.create_task(self.supervise())
+
+    async def stop(self) -> None:
+        supervisor, self._supervisor = self._supervisor, None
+        if supervisor is not None:
+            # 진행 중인 재연결(스레드)은 취소할 수 없으므로 끝날 때까지 기다린 뒤 닫음
+            self._stopping.set()
+            await supervisor
+        await self._close_forwarder()
+        if self.enabled:
+            self.state = "stopped"
+
+    def status(self) -> Dict[str, Any]:
+        status: Dict[str, Any] = {"ok": self.ready, "state": self.state}
+        if self.error:
+            status["error"] = self.error
+        if self.connect_seconds is not None:
+            status["connect_ms"] = round(self.connect_seconds * 1000, 1)
+        if self.reconnects:
+            status["reconnects"] = self.reconnects
+        return status
+
+
+ssh_tunnel = SSHTunnel(get_settings())
@@ -0,0 +1,154 @@
+# core/timing.py
+"""
+요청 단위 구간 시간 측정 (Server-Timing)
+
+- ServerTimingMiddleware 가 요청마다 RequestTimings 를 contextvar 에 설정
+- DB: 엔진의 before/after_cursor_execute 이벤트로 쿼리 시간 합산 (instrument_engine)
+- 외부 API: APIClient hook(record_upstream_call)으로 호출 시간 합산
+- 응답 헤더 Server-Timing 과 구조화(JSON) 로그 한 줄로 내보냄
+"""
+import json
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+
+logger = logging.getLogger("app.timing")
+
+
+@dataclass
+class RequestTimings:
+    """한 요청 동안 누적된 구간별 시간 (초)"""
+    started_at: float = field(default_factory=time.perf_counter)
+    db: float = 0.0
+    db_queries: int = 0
+    upstream: float = 0.0
+    upstream_calls: int = 0
+
+    @property
+    def total(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    def metrics(self) -> Dict[str, float]:
+        """구간별 시간 (ms). app = 전체 - DB - 외부 API (동시 호출이 겹치면 0 으로 보정)"""
+        total = self.total
+        return {
+            "total": total * 1000,
+            "db": self.db * 1000,
+            "upstream": self.upstream * 1000,
+            "app": max(total - self.db - self.upstream, 0.0) * 1000,
+        }
+
+    def server_timing(self) -> str:
+        """Server-Timing 헤더 값"""
+        metrics = self.metrics()
+        return ", ".join([
+            f'db;dur={metrics["db"]:.1f};desc="{self.db_queries} queries"',
+            f'upstream;dur={metrics["upstream"]:.1f};desc="{self.upstream_calls} calls"',
+            f'app;dur={metrics["app"]:.1f}',
+            f'total;dur={metrics["total"]:.1f}',
+        ])
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """현재 요청의 RequestTimings (요청 밖, 예: 백그라운드 작업이면 None)"""
+    return _current.get()
+
+
+def record_db(duration: float) -> None:
+    timings = _current.get()
+    if timings is not None:
+        timings.db += duration
+        timings.db_queries += 1
+
+
+def record_upstream_call(method: str, url: str, status_code: Optional[int], duration: float) -> None:
+    """APIClient hook: 외부 API 호출 1회 시간 누적"""
+    timings = _current.get()
+    if timings is not None:
+        timings.upstream += duration
+        timings.upstream_calls += 1
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started_at"].pop()
+    record_db(time.perf_counter() - started)
+
+
+def _handle_error(exception_context):
+    # 실패한 쿼리는 after_cursor_execute 가 호출되지 않으므로 시작 시각만 정리
+    stack = exception_context.connection.info.get("query_started_at") if exception_context.connection else None
+    if stack:
+        record_db(time.perf_counter() - stack.pop())
+
+
+def instrument_engine(engine) -> None:
+    """AsyncEngine/Engine 의 쿼리 실행 시간을 현재 요청 RequestTimings 에 누적"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+class ServerTimingMiddleware:
+    """
+    요청별 total / db / upstream / app 시간을 Server-Timing 헤더와 구조화 로그로 기록하는 ASGI 미들웨어
+    (StreamingResponse 도 본문을 버퍼링하지 않도록 BaseHTTPMiddleware 대신 순수 ASGI 로 구현)
+    """
+
+    def __init__(self, app, header: bool = True):
+        self.app = app
+        self.header = header
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        status_code = 500
+        header_metrics: Dict[str, float] = {}
+
+        async def send_with_timing(message):
+            nonlocal status_code, header_metrics
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # 헤더를 보내는 시점까지의 시간 (스트리밍 본문 전송 시간은 로그에만 포함)
+                header_metrics = timings.metrics()
+                if self.header:
+                    headers: List[Any] = list(message.get("headers", []))
+                    headers.append((b"server-timing", timings.server_timing().encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            metrics = timings.metrics()
+            logger.info(json.dumps({
+                "event": "request_timing",
+                "method": scope.get("method"),
+                "path": scope.get("path"),
+                "status": status_code,
+                "total_ms": round(metrics["total"], 2),
+                "ttfb_ms": round(header_metrics.get("total", metrics["total"]), 2),
+                "db_ms": round(metrics["db"], 2),
+                "db_queries": timings.db_queries,
+                "upstream_ms": round(metrics["upstream"], 2),
+                "upstream_calls": timings.upstream_calls,
+                "app_ms": round(metrics["app"], 2),
+            }, ensure_ascii=False))
@@ -1,6 +1,218 @@
-from app.models.users import User
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, literal_column, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.future import select
 
+from app.models.pet_clinic import OPEN_STATE_CODE, PetClinic
+from app.models.sync_job import IN_FLIGHT_WHERE, SyncJobRecord
+from app.models.sync_watermark import SyncWatermark
+from app.models.users import User
+
+# PostgreSQL 한 statement 당 바인드 파라미터 상한
+PG_MAX_BIND_PARAMS = 32767
+
+
+@dataclass
+class UpsertStats:
+    """upsert 결과 집계 (batch_counts: 배치별 전송 행 수)"""
+    batch_counts: List[int] = field(default_factory=list)
+    inserted: int = 0
+    updated: int = 0
+
+    @property
+    def sent(self) -> int:
+        return sum(self.batch_counts)
+
+    @property
+    def unchanged(self) -> int:
+        return self.sent - self.inserted - self.updated
+
+
 async def get_pet_by_id(db, user_id: int):
     result = await db.execute(select(User).where(User.id == user_id))
     return result.scalar_one_or_none()
+
+
+def _chunked(rows: Sequence[Dict[str, Any]], size: int) -> Iterator[Sequence[Dict[str, Any]]]:
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+def build_pet_clinic_upsert(batch: Sequence[Dict[str, Any]], only_changed: bool = False):
+    """
+    여러 행을 한 번에 적재하는 INSERT ... VALUES (...),(...) ON CONFLICT (mgt_no) DO UPDATE 문 생성
+    - 충돌 시 각 컬럼은 EXCLUDED 값으로 갱신
+    - on_conflict_do_update 는 Column.onupdate 를 적용하지 않으므로 updated_at 을 직접 지정
+    - only_changed=True 이면 값이 하나라도 달라진 행만 갱신 (IS DISTINCT FROM), 동일한 행은 WAL/updated_at 변경 없음
+    - RETURNING (xmax = 0) 으로 실제 insert/update 된 행을 구분
+    """
+    stmt = pg_insert(PetClinic).values(list(batch))
+    columns = [col for col in batch[0] if col != "mgt_no"]
+    set_ = {col: stmt.excluded[col] for col in columns}
+    set_["updated_at"] = func.now()
+
+    where = None
+    if only_changed:
+        where = tuple_(*[PetClinic.__table__.c[col] for col in columns]).is_distinct_from(
+            tuple_(*[stmt.excluded[col] for col in columns])
+        )
+
+    stmt = stmt.on_conflict_do_update(index_elements=["mgt_no"], set_=set_, where=where)
+    return stmt.returning(literal_column("(xmax = 0)").label("inserted"))
+
+
+async def upsert_pet_clinics(db, rows: Sequence[Dict[str, Any]], batch_size: int = 500,
+                             only_changed: bool = False) -> UpsertStats:
+    """
+    동물병원 행을 batch_size 단위의 multi-row upsert 로 적재 (commit 은 호출자 책임)
+
+    Returns:
+        배치별 전송 행 수와 실제 insert/update 된 행 수
+    """
+    stats = UpsertStats()
+    if not rows:
+        return stats
+
+    # 같은 statement 안에서 동일 mgt_no 가 두 번 나오면 ON CONFLICT 가 실패하므로 마지막 값만 유지
+    rows = list({row["mgt_no"]: row for row in rows}.values())
+
+    # 컬럼 수 × 행 수가 바인드 파라미터 상한을 넘지 않도록 배치 크기 보정
+    max_batch = PG_MAX_BIND_PARAMS // len(rows[0])
+    batch_size = max(1, min(batch_size, max_batch))
+
+    for batch in _chunked(rows, batch_size):
+        result = await db.execute(build_pet_clinic_upsert(batch, only_changed=only_changed))
+        written = list(result.scalars())
+        inserted = sum(1 for is_insert in written if is_insert)
+        stats.batch_counts.append(len(batch))
+        stats.inserted += inserted
+        stats.updated += len(written) - inserted
+    return stats
+
+
+async def get_sync_watermark(db, source: str) -> Optional[str]:
+    result = await db.execute(select(SyncWatermark.last_mod_ts).where(SyncWatermark.source == source))
+    return result.scalar_one_or_none()
+
+
+async def set_sync_watermark(db, source: str, last_mod_ts: str) -> None:
+    """source 의 high-water mark 저장 (더 작은 값으로 되돌리지 않음, commit 은 호출자 책임)"""
+    stmt = pg_insert(SyncWatermark).values(source=source, last_mod_ts=last_mod_ts)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["source"],
+        set_={"last_mod_ts": func.greatest(SyncWatermark.last_mod_ts, stmt.excluded.last_mod_ts),
+              "synced_at": func.now()},
+    )
+    await db.execute(stmt)
+
+
+async def add_sync_job(db, record: SyncJobRecord) -> None:
+    """
+    작업 기록 추가 (commit 은 호출자 책임)
+
+    Raises:
+        IntegrityError: 같은 job_key 의 대기/실행 중 작업이 이미 있는 경우 (uq_sync_jobs_in_flight_key)
+    """
+    db.add(record)
+    await db.flush()
+
+
+async def get_sync_job(db, job_id: str) -> Optional[SyncJobRecord]:
+    return await db.get(SyncJobRecord, job_id)
+
+
+async def get_in_flight_sync_job(db, job_key: str) -> Optional[SyncJobRecord]:
+    result = await db.execute(select(SyncJobRecord).where(SyncJobRecord.job_key == job_key, IN_FLIGHT_WHERE))
+    return result.scalar_one_or_none()
+
+
+async def list_sync_jobs(db, limit: int = 100) -> List[SyncJobRecord]:
+    result = await db.execute(select(SyncJobRecord).order_by(SyncJobRecord.created_at.desc()).limit(limit))
+    return list(result.scalars())
+
+
+async def update_sync_job(db, job_id: str, **values: Any) -> None:
+    """
+    대기/실행 중인 작업의 상태/진행 상황 갱신 (commit 은 호출자 책임)
+    - 이미 끝난(실패 처리된) 작업은 갱신하지 않으므로 늦게 도착한 heartbeat 가 최종 상태를 덮어쓰지 않음
+    """
+    await db.execute(update(SyncJobRecord).where(SyncJobRecord.id == job_id, IN_FLIGHT_WHERE).values(**values))
+
+
+async def fail_stale_sync_jobs(db, heartbeat_before: datetime, now: datetime) -> int:
+    """heartbeat 가 끊긴(실행하던 worker 가 종료된) 대기/실행 중 작업을 실패 처리 (commit 은 호출자 책임)"""
+    result = await db.execute(
+        update(SyncJobRecord)
+        .where(IN_FLIGHT_WHERE, SyncJobRecord.heartbeat_at < heartbeat_before)
+        .values(status="failed", error="worker lost", finished_at=now)
+    )
+    return result.rowcount
+
+
+async def find_nearby_pet_clinics(db, lat: float, lng: float, k: int = 10, radius: Optional[float] = None,
+                                  include_closed: bool = False, srid: int = 2097) -> List[Tuple[float, PetClinic]]:
+    """
+    PostGIS 로 (lat, lng) 근처 동물병원 조회 (거리[m], PetClinic) 목록 반환
+    - x/y 는 srid 의 TM 좌표이므로 질의 지점을 같은 좌표계로 변환해 평면 거리 계산
+    - app/sql/seoul_pet_clinics_postgis.sql 의 GiST 식 인덱스가 있으면 <-> 정렬이 인덱스를 탐
+      (인덱스 SRID 가 srid 와 같아야 하며, 확인은 get_clinic_geom_index_srid)
+    """
+    # 바인드 파라미터($n)로 보내면 generic plan 에서 식이 인덱스의 상수 SRID 와 일치하지 않으므로 리터럴로 렌더링
+    srid = literal_column(str(int(srid)))
+    point = func.ST_Transform(func.ST_SetSRID(func.ST_MakePoint(lng, lat), 4326), srid)
+    geom = func.ST_SetSRID(func.ST_MakePoint(PetClinic.x, PetClinic.y), srid)
+
+    stmt = select(PetClinic, func.ST_Distance(geom, point).label("distance_m")).where(
+        PetClinic.x.is_not(None), PetClinic.y.is_not(None)
+    )
+    if not include_closed:
+        stmt = stmt.where(PetClinic.trd_state_gbn == OPEN_STATE_CODE)
+    if radius is not None:
+        stmt = stmt.where(func.ST_DWithin(geom, point, radius))
+    stmt = stmt.order_by(geom.op("<->")(point)).limit(k)
+
+    result = await db.execute(stmt)
+    return [(distance, clinic) for clinic, distance in result.all()]
+
+
+CLINIC_GEOM_INDEX = "ix_seoul_pet_clinics_geom"
+_INDEX_SRID_PATTERN = re.compile(r"st_setsrid\(st_makepoint\([^)]*\),\s*(\d+)\)", re.IGNORECASE)
+
+
+async def get_clinic_geom_index_srid(db) -> Optional[int]:
+    """seoul_pet_clinics_postgis.sql 로 만든 GiST 식 인덱스의 SRID (인덱스가 없으면 None)"""
+    result = await db.execute(text("SELECT indexdef FROM pg_indexes WHERE indexname = :name"),
+                              {"name": CLINIC_GEOM_INDEX})
+    match = _INDEX_SRID_PATTERN.search(result.scalar_one_or_none() or "")
+    return int(match.group(1)) if match else None
+
+
+async def list_pet_clinics(db, status: Optional[str] = None, district_code: Optional[str] = None,
+                           name_prefix: Optional[str] = None, after: Optional[str] = None,
+                           limit: int = 50) -> List[PetClinic]:
+    """
+    동물병원 목록 조회 (mgt_no 오름차순 keyset 페이지네이션)
+    - after: 이전 페이지 마지막 mgt_no, OFFSET 없이 인덱스 범위 탐색으로 깊은 페이지도 일정 비용
+    - status: open(영업/정상) | closed(그 외)
+    """
+    stmt = select(PetClinic)
+    if status == "open":
+        stmt = stmt.where(PetClinic.trd_state_gbn == OPEN_STATE_CODE)
+    elif status == "closed":
+        stmt = stmt.where(PetClinic.trd_state_gbn != OPEN_STATE_CODE)
+    if district_code:
+        stmt = stmt.where(PetClinic.opnsfteamcode == district_code)
+    if name_prefix:
+        # 패턴을 완성된 값으로 바인딩해야 플래너가 text_pattern_ops 인덱스 범위 탐색으로 바꿀 수 있음
+        escaped = name_prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        stmt = stmt.where(PetClinic.bplc_nm.like(f"{escaped}%", escape="\\"))
+    if after:
+        stmt = stmt.where(PetClinic.mgt_no > after)
+    stmt = stmt.order_by(PetClinic.mgt_no).limit(limit)
+
+    result = await db.execute(stmt)
+    return list(result.scalars().all())
@@ -1,14 +1,135 @@
+import asyncio
+import time
+from typing import Any, Dict
+
+from sqlalchemy import exc, text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import get_settings
+from app.core.metrics import instrument_pool
+from app.core.timing import instrument_engine
 
 settings = get_settings()
 
 DATABASE_URL = f"postgresql+asyncpg://{settings.POSTGRES_USER}:{settings.POSTGRES_PASS}@{settings.POSTGRES_HOST}:{settings.POSTGRES_LOCAL_PORT}/{settings.POSTGRES_DATABASE_NAME}"
+READ_DATABASE_URL = (
+    f"postgresql+asyncpg://{settings.POSTGRES_USER}:{settings.POSTGRES_PASS}@{settings.POSTGRES_READ_HOST}:{settings.POSTGRES_READ_PORT}/{settings.POSTGRES_DATABASE_NAME}"
+    if settings.POSTGRES_READ_HOST else None
+)
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """커넥션 checkout 대기 시간(풀 고갈 대기 + 신규 연결 + pre-ping)과 timeout 횟수를 집계하는 풀"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+
+def build_engine_kwargs(url: str, settings=settings) -> Dict[str, Any]:
+    """Settings 의 풀/로깅 설정을 create_async_engine 인자로 변환"""
+    kwargs: Dict[str, Any] = {
+        "echo": settings.DB_ECHO,
+        "poolclass": TimedAsyncQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    if url.startswith("postgresql+asyncpg"):
+        # asyncpg 커넥션별 prepared statement LRU 크기 (0 이면 비활성화, pgbouncer transaction 모드에서 필요)
+        kwargs["connect_args"] = {"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    return kwargs
+
+
+async def check_database(engine, timeout: float) -> Dict[str, Any]:
+    """SELECT 1 로 DB 연결 확인 (readiness probe 용, timeout 초 안에 응답이 없으면 실패)"""
+    async def ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(ping(), timeout)
+    except Exception as e:
+        return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+    return {"ok": True, "latency_ms": round((time.perf_counter() - started) * 1000, 1)}
+
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+def pool_stats(engine) -> Dict[str, Any]:
+    """풀 사용 현황 (worker 당 풀 크기 산정용)"""
+    pool = engine.pool
+    stats = {
+        "pool_size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_overflow": pool._max_overflow,
+    }
+    if isinstance(pool, TimedAsyncQueuePool):
+        stats.update({
+            "checkouts": pool.checkouts,
+            "timeouts": pool.timeouts,
+            "wait_avg_ms": round(pool.wait_total / pool.checkouts * 1000, 3) if pool.checkouts else 0.0,
+            "wait_max_ms": round(pool.wait_max * 1000, 3),
+        })
+    return stats
+
+
+engine = create_async_engine(DATABASE_URL, **build_engine_kwargs(DATABASE_URL))
 async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+# replica 가 없으면 조회 세션도 primary 로 연결
+read_engine = create_async_engine(READ_DATABASE_URL, **build_engine_kwargs(READ_DATABASE_URL)) if READ_DATABASE_URL else None
+async_read_session = sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False) if read_engine else async_session
+
+# 쿼리 실행 시간을 요청별 Server-Timing db 구간에 합산하고, 풀 사용량은 /metrics 로 노출
+for _name, _engine in (("primary", engine), ("replica", read_engine)):
+    if _engine is not None:
+        instrument_engine(_engine)
+        instrument_pool(_name, lambda _engine=_engine: pool_stats(_engine))
+
+async def dispose_stale_connections() -> None:
+    """
+    SSH 터널 재연결 후 primary 풀 비우기
+    - 끊긴 터널로 맺어진 커넥션은 닫기(close)도 응답이 없을 수 있으므로 닫지 않고 버림 (close=False)
+    - 사용 중인 커넥션은 반납 시 폐기되고, 이후 요청은 새 터널로 새 커넥션을 맺음
+    """
+    await engine.dispose(close=False)
+
+
 async def get_db():
+    """쓰기(및 쓰기 직후 읽기) 용 primary 세션"""
     async with async_session() as session:
         yield session
+
+def is_replica_session(db) -> bool:
+    """replica 엔진에 연결된 세션인지 (복제 지연을 고려해야 하는 조회인지)"""
+    return read_engine is not None and getattr(db, "bind", None) is read_engine
+
+
+async def get_read_db():
+    """
+    조회 전용 replica 세션 (replica 미설정 시 primary)
+    - 복제 지연이 있으므로 방금 쓴 데이터를 바로 읽어야 하는 경로에는 get_db 사용
+    """
+    async with async_read_session() as session:
+        yield session
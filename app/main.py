@@ -1,34 +1,73 @@
-from sshtunnel import SSHTunnelForwarder
-import psycopg2
-from fastapi import FastAPI
-from app.api import endpoints_router
-from app.core.config import get_settings
-from app.core.logging_config import logger
+import time
 
+# worker cold start 측정: 이 모듈(및 앱 전체) import 에 걸린 시간
+_import_started = time.perf_counter()
+
+import asyncio  # noqa: E402
+from contextlib import asynccontextmanager  # noqa: E402
+
+from fastapi import FastAPI  # noqa: E402
+from app.api import endpoints_router  # noqa: E402
+from app.core.config import get_settings  # noqa: E402
+from app.core.http_clients import client_registry  # noqa: E402
+from app.core.logging_config import logger  # noqa: E402
+from app.core.metrics import MetricsMiddleware, registry as metrics_registry  # noqa: E402
+from app.core.responses import FastJSONResponse  # noqa: E402
+from app.core.ssh_tunnel import ssh_tunnel  # noqa: E402
+from app.core.timing import ServerTimingMiddleware  # noqa: E402
+from app.db.session import dispose_stale_connections  # noqa: E402
+from app.services.jobs import job_runner  # noqa: E402
+from app.services.pet_clinic_loader import SEOUL_OPEN_API_BASE_URL  # noqa: E402
 
-app = FastAPI(title="Pet Happy Recommendation API", version="0.1.0")
-app.include_router(endpoints_router.router, prefix="/api/v1")
 settings = get_settings()
-tunnel = None
 
-@app.on_event("startup")
-def start_ssh_tunnel():
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    startup_started = time.perf_counter()
     logger.info(f"🚀 FastAPI 서버 시작 중...(settings.ENV = {settings.ENV})")
-    global tunnel
-    if settings.ENV == "dev":
-        tunnel = SSHTunnelForwarder(
-            (settings.SSH_HOST, settings.SSH_PORT),
-            ssh_username=settings.SSH_USER,
-            ssh_private_key=settings.PRIVATE_KEY_PATH,
-            remote_bind_address=(settings.POSTGRES_HOST, settings.POSTGRES_PORT),
-            local_bind_address=("127.0.0.1", settings.POSTGRES_LOCAL_PORT)
-        )
-        tunnel.start()
-    else:
+
+    # SSH 핸드셰이크는 스레드에서 진행하고 기다리지 않음 (연결 전까지 /ready 는 503, /health 는 200)
+    tunnel_task = asyncio.create_task(ssh_tunnel.start())
+    # 끊기면 backoff 하며 재연결하고, 재연결 시 끊긴 터널로 맺어진 DB 커넥션을 폐기
+    ssh_tunnel.on_reconnect(dispose_stale_connections)
+    ssh_tunnel.start_supervisor()
+    if not ssh_tunnel.enabled:
         logger.info("✅ 운영 환경으로 SSH Tunnel은 비활성화됩니다.")
 
-@app.on_event("shutdown")
-def stop_ssh_tunnel():
+    # 외부 API 클라이언트를 미리 등록해 모든 요청이 같은 커넥션 풀을 재사용
+    client_registry.get(SEOUL_OPEN_API_BASE_URL)
+
+    app.state.cold_start = {
+        "import_ms": round(IMPORT_SECONDS * 1000, 1),
+        "startup_ms": round((time.perf_counter() - startup_started) * 1000, 1),
+    }
+    logger.info(f"⏱️ worker cold start: import {app.state.cold_start['import_ms']}ms, "
+                f"startup {app.state.cold_start['startup_ms']}ms")
+
+    yield
+
     logger.info("🚀 FastAPI 서버 종료 중...")
-    if tunnel:
-        tunnel.stop()
+    try:
+        await job_runner.shutdown()
+        await client_registry.close_all()
+        if not tunnel_task.done():
+            # to_thread 로 진행 중인 연결은 취소할 수 없으므로 끝날 때까지 기다린 뒤 닫음
+            await asyncio.wait([tunnel_task])
+        await ssh_tunnel.stop()
+    finally:
+        # 멀티프로세스 모드: 다음 flush 예약 전에 종료되는 worker 의 마지막 집계분을 스냅샷 파일에 기록
+        metrics_registry.flush()
+
+
+# 모든 JSON 응답은 orjson 기반 FastJSONResponse 로 직렬화 (orjson 미설치 시 표준 json)
+app = FastAPI(title="Pet Happy Recommendation API", version="0.1.0",
+              default_response_class=FastJSONResponse, lifespan=lifespan)
+app.include_router(endpoints_router.router, prefix="/api/v1")
+# 요청별 total/db/upstream 시간을 Server-Timing 헤더와 구조화 로그로 기록
+app.add_middleware(ServerTimingMiddleware, header=settings.SERVER_TIMING_HEADER)
+# 라우트/상태 코드별 요청 수와 지연 히스토그램 (/api/v1/metrics)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+IMPORT_SECONDS = time.perf_counter() - _import_started
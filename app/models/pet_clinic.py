@@ -2,15 +2,36 @@
 # 테이블 정의 (서울시 동물병원 정보)
 # =============================
 
-from sqlalchemy import Column, String, Date, Float, Text, DateTime, func
+from sqlalchemy import Column, String, Date, Float, Text, DateTime, Index, func
 from sqlalchemy.ext.declarative import declarative_base
 
 # SQLAlchemy 기본 베이스 클래스 생성
 Base = declarative_base()
 
+# 영업상태코드 01: 영업/정상 (02 휴업, 03 폐업, ...)
+OPEN_STATE_CODE = "01"
+
+# 서울시 자치구 개방자치단체코드
+SEOUL_DISTRICT_CODES = {
+    "종로구": "3000000", "중구": "3010000", "용산구": "3020000", "성동구": "3030000",
+    "광진구": "3040000", "동대문구": "3050000", "중랑구": "3060000", "성북구": "3070000",
+    "강북구": "3080000", "도봉구": "3090000", "노원구": "3100000", "은평구": "3110000",
+    "서대문구": "3120000", "마포구": "3130000", "양천구": "3140000", "강서구": "3150000",
+    "구로구": "3160000", "금천구": "3170000", "영등포구": "3180000", "동작구": "3190000",
+    "관악구": "3200000", "서초구": "3210000", "강남구": "3220000", "송파구": "3230000",
+    "강동구": "3240000",
+}
+
 
 class PetClinic(Base):
     __tablename__ = "seoul_pet_clinics"
+    __table_args__ = (
+        # 목록 조회: 필터 컬럼 + mgt_no keyset 정렬을 한 인덱스로 처리
+        Index("ix_seoul_pet_clinics_trd_state_gbn_mgt_no", "trd_state_gbn", "mgt_no"),
+        Index("ix_seoul_pet_clinics_opnsfteamcode_mgt_no", "opnsfteamcode", "mgt_no"),
+        # 사업장명 접두어 검색 (LIKE 'prefix%')
+        Index("ix_seoul_pet_clinics_bplc_nm_prefix", "bplc_nm", postgresql_ops={"bplc_nm": "text_pattern_ops"}),
+    )
 
     mgt_no = Column(String, primary_key=True, comment="관리번호")
     opnsfteamcode = Column(String, comment="개방자치단체코드")
@@ -37,6 +58,8 @@ class PetClinic(Base):
     uptae_nm = Column(String, comment="업태구분명")
     x = Column(Float, comment="X좌표")
     y = Column(Float, comment="Y좌표")
+    lat = Column(Float, comment="위도 (WGS84, 적재 시 X/Y 에서 변환)")
+    lng = Column(Float, comment="경도 (WGS84, 적재 시 X/Y 에서 변환)")
     lind_job_gbn_nm = Column(String, comment="축산업무구분명")
     lind_prcb_gbn_nm = Column(String, comment="축산물가공업구분명")
     lind_seq_no = Column(String, comment="축산일련번호")
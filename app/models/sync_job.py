@@ -0,0 +1,34 @@
+# =============================
+# 테이블 정의 (백그라운드 동기화 작업 기록)
+# =============================
+
+from sqlalchemy import Column, String, DateTime, Index, JSON, Text, text
+from sqlalchemy.ext.declarative import declarative_base
+
+# SQLAlchemy 기본 베이스 클래스 생성
+Base = declarative_base()
+
+# 대기/실행 중인 작업 상태 (같은 job_key 는 이 상태로 한 건만 존재)
+IN_FLIGHT_WHERE = text("status IN ('queued', 'running')")
+
+
+class SyncJobRecord(Base):
+    __tablename__ = "sync_jobs"
+
+    id = Column(String, primary_key=True, comment="작업 id")
+    job_key = Column(String, nullable=False, comment="정규화된 params (중복 등록 판별용)")
+    params = Column(JSON, nullable=False, comment="작업 파라미터")
+    status = Column(String, nullable=False, comment="queued | running | succeeded | failed")
+    progress = Column(JSON, comment="진행 상황 (SyncSummary)")
+    error = Column(Text, comment="실패 사유")
+    created_at = Column(DateTime(timezone=True), nullable=False, comment="등록 시각")
+    started_at = Column(DateTime(timezone=True), comment="실행 시작 시각")
+    finished_at = Column(DateTime(timezone=True), comment="종료 시각")
+    heartbeat_at = Column(DateTime(timezone=True), nullable=False, comment="실행 중인 worker 가 마지막으로 기록한 시각")
+
+    __table_args__ = (
+        # 여러 uvicorn worker 가 동시에 같은 작업을 등록해도 한 건만 들어가도록 DB 에서 보장
+        Index("uq_sync_jobs_in_flight_key", "job_key", unique=True,
+              postgresql_where=IN_FLIGHT_WHERE, sqlite_where=IN_FLIGHT_WHERE),
+        Index("ix_sync_jobs_created_at", "created_at"),
+    )
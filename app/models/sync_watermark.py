@@ -0,0 +1,17 @@
+# =============================
+# 테이블 정의 (공공데이터 증분 동기화 기준점)
+# =============================
+
+from sqlalchemy import Column, String, DateTime, func
+from sqlalchemy.ext.declarative import declarative_base
+
+# SQLAlchemy 기본 베이스 클래스 생성
+Base = declarative_base()
+
+
+class SyncWatermark(Base):
+    __tablename__ = "sync_watermarks"
+
+    source = Column(String, primary_key=True, comment="데이터 출처 (공공 API 서비스명)")
+    last_mod_ts = Column(String, comment="마지막으로 적재한 최종수정일자 (high-water mark)")
+    synced_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), comment="마지막 동기화 시각")
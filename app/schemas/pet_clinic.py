@@ -2,8 +2,9 @@
 # Pydantic 모델 정의 (API 응답 구조)
 # =============================
 from __future__ import annotations
+from datetime import datetime
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 
 class ClinicRow(BaseModel):
@@ -32,6 +33,8 @@ class ClinicRow(BaseModel):
     uptae_nm: Optional[str]
     x: Optional[float]
     y: Optional[float]
+    lat: Optional[float] = None
+    lng: Optional[float] = None
     lind_job_gbn_nm: Optional[str]
     lind_prcb_gbn_nm: Optional[str]
     lind_seq_no: Optional[str]
@@ -39,5 +42,61 @@ class ClinicRow(BaseModel):
     totep_num: Optional[str]
 
     class Config:
-        orm_mode = True
+        from_attributes = True
+
+
+class ClinicPage(BaseModel):
+    items: List[ClinicRow]
+    # 다음 페이지 조회 시 after 로 전달 (마지막 페이지면 None)
+    next_cursor: Optional[str] = None
+
+
+class NearbyClinic(BaseModel):
+    distance_m: float
+    clinic: ClinicRow
+
+
+class LoadSummary(BaseModel):
+    """구간 적재 결과 요약 (response=summary)"""
+    start: int
+    end: int
+    rows_fetched: int
+    rows_upserted: int
+    rows_inserted: int
+    rows_updated: int
+    rows_unchanged: int
+    duration: float
+    rows_per_sec: float
+
+
+class SyncSummary(BaseModel):
+    total_count: int
+    pages_total: int
+    pages_fetched: int
+    rows_fetched: int
+    rows_upserted: int
+    rows_inserted: int
+    rows_updated: int
+    rows_unchanged: int
+    rows_skipped: int
+    incremental: bool
+    watermark: Optional[str]
+    duration: float
+    rows_per_sec: float
+
+    class Config:
+        from_attributes = True
+
+
+class SyncJobRead(BaseModel):
+    id: str
+    status: str
+    params: Dict[str, Any]
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    error: Optional[str]
+    progress: SyncSummary
+
+    class Config:
         from_attributes = True
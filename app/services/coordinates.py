@@ -0,0 +1,158 @@
+# =============================
+# 좌표계 변환 (WGS84 ↔ 한국 중부원점 TM)
+# =============================
+"""
+서울시 인허가(LOCALDATA) X/Y 는 Bessel 타원체 기반 중부원점 TM 좌표(EPSG:2097)입니다.
+pyproj 없이 NumPy 로 Transverse Mercator 투영과 7-parameter Helmert 변환을 직접 계산하며,
+모든 함수는 스칼라와 배열을 모두 받아 배열 단위로 한 번에 변환합니다.
+"""
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+ArrayLike = np.ndarray | float
+
+ARCSEC_TO_RAD = np.pi / (180.0 * 3600.0)
+
+
+@dataclass(frozen=True)
+class Ellipsoid:
+    a: float
+    inv_f: float
+
+    @property
+    def e2(self) -> float:
+        f = 1.0 / self.inv_f
+        return f * (2.0 - f)
+
+
+WGS84 = Ellipsoid(a=6378137.0, inv_f=298.257223563)
+BESSEL_1841 = Ellipsoid(a=6377397.155, inv_f=299.1528128)
+
+
+@dataclass(frozen=True)
+class TMProjection:
+    """Transverse Mercator 투영 정의 (towgs84: tx, ty, tz[m], rx, ry, rz[arcsec], s[ppm], position vector)"""
+    name: str
+    ellipsoid: Ellipsoid
+    lat0: float
+    lon0: float
+    k0: float
+    false_easting: float
+    false_northing: float
+    towgs84: Tuple[float, float, float, float, float, float, float]
+
+    @property
+    def srid(self) -> int:
+        return int(self.name.split(":")[1])
+
+
+_KOREA_BESSEL_TOWGS84 = (-115.80, 474.99, 674.11, 1.16, -2.31, -1.63, 6.43)
+
+# Korean 1985 / Central Belt
+EPSG_2097 = TMProjection("EPSG:2097", BESSEL_1841, 38.0, 127.0, 1.0, 200000.0, 500000.0, _KOREA_BESSEL_TOWGS84)
+# Korean 1985 / Modified Central Belt (경도 원점 10.405" 보정)
+EPSG_5174 = TMProjection("EPSG:5174", BESSEL_1841, 38.0, 127.0028902777778, 1.0, 200000.0, 500000.0, _KOREA_BESSEL_TOWGS84)
+
+PROJECTIONS = {p.name: p for p in (EPSG_2097, EPSG_5174)}
+
+
+def _meridian_arc(ell: Ellipsoid, phi: ArrayLike) -> ArrayLike:
+    e2 = ell.e2
+    e4, e6 = e2 * e2, e2 * e2 * e2
+    return ell.a * ((1 - e2 / 4 - 3 * e4 / 64 - 5 * e6 / 256) * phi
+                    - (3 * e2 / 8 + 3 * e4 / 32 + 45 * e6 / 1024) * np.sin(2 * phi)
+                    + (15 * e4 / 256 + 45 * e6 / 1024) * np.sin(4 * phi)
+                    - (35 * e6 / 3072) * np.sin(6 * phi))
+
+
+def _geodetic_to_geocentric(ell: Ellipsoid, phi: ArrayLike, lam: ArrayLike):
+    e2 = ell.e2
+    n = ell.a / np.sqrt(1 - e2 * np.sin(phi) ** 2)
+    return (n * np.cos(phi) * np.cos(lam),
+            n * np.cos(phi) * np.sin(lam),
+            n * (1 - e2) * np.sin(phi))
+
+
+def _geocentric_to_geodetic(ell: Ellipsoid, x: ArrayLike, y: ArrayLike, z: ArrayLike):
+    e2 = ell.e2
+    p = np.hypot(x, y)
+    phi = np.arctan2(z, p * (1 - e2))
+    # 지표면 근처에서는 몇 번의 반복으로 mm 이하로 수렴
+    for _ in range(4):
+        n = ell.a / np.sqrt(1 - e2 * np.sin(phi) ** 2)
+        h = p / np.cos(phi) - n
+        phi = np.arctan2(z, p * (1 - e2 * n / (n + h)))
+    return phi, np.arctan2(y, x)
+
+
+def _helmert(x, y, z, params, inverse: bool = False):
+    tx, ty, tz, rx, ry, rz, s = params
+    rx, ry, rz, s = rx * ARCSEC_TO_RAD, ry * ARCSEC_TO_RAD, rz * ARCSEC_TO_RAD, s * 1e-6
+    if inverse:
+        # 회전각이 충분히 작아 부호 반전으로 역변환 근사 (오차 mm 미만)
+        x, y, z = x - tx, y - ty, z - tz
+        rx, ry, rz, s = -rx, -ry, -rz, -s
+        tx = ty = tz = 0.0
+    m = 1 + s
+    return (tx + m * (x - rz * y + ry * z),
+            ty + m * (rz * x + y - rx * z),
+            tz + m * (-ry * x + rx * y + z))
+
+
+def wgs84_to_tm(lat: ArrayLike, lng: ArrayLike, proj: TMProjection = EPSG_2097) -> Tuple[ArrayLike, ArrayLike]:
+    """WGS84 위경도(도) → TM 좌표(X=easting, Y=northing, m)"""
+    phi_w, lam_w = np.radians(np.asarray(lat, dtype=float)), np.radians(np.asarray(lng, dtype=float))
+    gx, gy, gz = _helmert(*_geodetic_to_geocentric(WGS84, phi_w, lam_w), proj.towgs84, inverse=True)
+    phi, lam = _geocentric_to_geodetic(proj.ellipsoid, gx, gy, gz)
+
+    ell = proj.ellipsoid
+    e2 = ell.e2
+    ep2 = e2 / (1 - e2)
+    n = ell.a / np.sqrt(1 - e2 * np.sin(phi) ** 2)
+    t = np.tan(phi) ** 2
+    c = ep2 * np.cos(phi) ** 2
+    a = (lam - np.radians(proj.lon0)) * np.cos(phi)
+    m = _meridian_arc(ell, phi)
+    m0 = _meridian_arc(ell, np.radians(proj.lat0))
+
+    x = proj.k0 * n * (a + (1 - t + c) * a ** 3 / 6
+                       + (5 - 18 * t + t ** 2 + 72 * c - 58 * ep2) * a ** 5 / 120)
+    y = proj.k0 * (m - m0 + n * np.tan(phi) * (a ** 2 / 2 + (5 - t + 9 * c + 4 * c ** 2) * a ** 4 / 24
+                                                 + (61 - 58 * t + t ** 2 + 600 * c - 330 * ep2) * a ** 6 / 720))
+    return x + proj.false_easting, y + proj.false_northing
+
+
+def tm_to_wgs84(x: ArrayLike, y: ArrayLike, proj: TMProjection = EPSG_2097) -> Tuple[ArrayLike, ArrayLike]:
+    """TM 좌표(X=easting, Y=northing, m) → WGS84 위경도(도), NaN 입력은 NaN 으로 전달"""
+    ell = proj.ellipsoid
+    e2 = ell.e2
+    ep2 = e2 / (1 - e2)
+    x = np.asarray(x, dtype=float) - proj.false_easting
+    y = np.asarray(y, dtype=float) - proj.false_northing
+
+    m = _meridian_arc(ell, np.radians(proj.lat0)) + y / proj.k0
+    mu = m / (ell.a * (1 - e2 / 4 - 3 * e2 ** 2 / 64 - 5 * e2 ** 3 / 256))
+    e1 = (1 - np.sqrt(1 - e2)) / (1 + np.sqrt(1 - e2))
+    phi1 = (mu + (3 * e1 / 2 - 27 * e1 ** 3 / 32) * np.sin(2 * mu)
+            + (21 * e1 ** 2 / 16 - 55 * e1 ** 4 / 32) * np.sin(4 * mu)
+            + (151 * e1 ** 3 / 96) * np.sin(6 * mu)
+            + (1097 * e1 ** 4 / 512) * np.sin(8 * mu))
+
+    sin1, cos1, tan1 = np.sin(phi1), np.cos(phi1), np.tan(phi1)
+    c1 = ep2 * cos1 ** 2
+    t1 = tan1 ** 2
+    n1 = ell.a / np.sqrt(1 - e2 * sin1 ** 2)
+    r1 = ell.a * (1 - e2) / (1 - e2 * sin1 ** 2) ** 1.5
+    d = x / (n1 * proj.k0)
+
+    phi = phi1 - (n1 * tan1 / r1) * (d ** 2 / 2
+                                     - (5 + 3 * t1 + 10 * c1 - 4 * c1 ** 2 - 9 * ep2) * d ** 4 / 24
+                                     + (61 + 90 * t1 + 298 * c1 + 45 * t1 ** 2 - 252 * ep2 - 3 * c1 ** 2) * d ** 6 / 720)
+    lam = np.radians(proj.lon0) + (d - (1 + 2 * t1 + c1) * d ** 3 / 6
+                                   + (5 - 2 * c1 + 28 * t1 - 3 * c1 ** 2 + 8 * ep2 + 24 * t1 ** 2) * d ** 5 / 120) / cos1
+
+    gx, gy, gz = _helmert(*_geodetic_to_geocentric(ell, phi, lam), proj.towgs84)
+    phi_w, lam_w = _geocentric_to_geodetic(WGS84, gx, gy, gz)
+    return np.degrees(phi_w), np.degrees(lam_w)
@@ -0,0 +1,310 @@
+# =============================
+# 백그라운드 적재 작업 실행기
+# =============================
+import asyncio
+import contextvars
+import json
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import get_settings
+from app.core.logging_config import logger
+from app.db import crud
+from app.db import session as db_session
+from app.models.sync_job import SyncJobRecord
+from app.schemas.pet_clinic import SyncJobRead, SyncSummary
+from app.services.pet_clinic_loader import SyncStats
+
+JobFunc = Callable[[SyncStats], Awaitable[Any]]
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass
+class SyncJob:
+    """큐에 등록된 동기화 작업 (진행 상황은 stats 에 실시간 반영)"""
+    id: str
+    key: str
+    params: Dict[str, Any]
+    status: JobStatus = JobStatus.QUEUED
+    stats: SyncStats = field(default_factory=SyncStats)
+    created_at: datetime = field(default_factory=_utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+
+    @property
+    def progress(self) -> SyncStats:
+        return self.stats
+
+    @property
+    def done(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+
+def job_key(params: Dict[str, Any]) -> str:
+    """params 를 키 순서와 무관하게 같은 문자열로 정규화 (중복 등록 판별용)"""
+    return json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+
+
+# 다른 worker 가 실행 중인 작업은 DB 에 기록된 마지막 상태(SyncJobRead)로 반환
+JobView = Union[SyncJob, SyncJobRead]
+
+
+class MemoryJobStore:
+    """
+    프로세스 내 작업 기록 (테스트/벤치마크, 단일 worker 전용)
+    - 완료된 작업은 최근 max_history 개만 보관
+    """
+
+    def __init__(self, max_history: int = 100):
+        self.max_history = max_history
+        self._jobs: "OrderedDict[str, SyncJob]" = OrderedDict()
+        self._in_flight: Dict[str, SyncJob] = {}
+
+    async def claim(self, job: SyncJob) -> Optional[JobView]:
+        """job 등록, 같은 key 의 대기/실행 중 작업이 있으면 등록하지 않고 그 작업 반환"""
+        existing = self._in_flight.get(job.key)
+        if existing is not None:
+            return existing
+        self._jobs[job.id] = job
+        self._in_flight[job.key] = job
+        return None
+
+    async def save(self, job: SyncJob) -> None:
+        if job.done:
+            self._in_flight.pop(job.key, None)
+            self._prune()
+
+    async def get(self, job_id: str) -> Optional[JobView]:
+        return self._jobs.get(job_id)
+
+    async def list(self) -> List[JobView]:
+        return list(reversed(self._jobs.values()))
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[:max(0, len(finished) - self.max_history)]:
+            del self._jobs[job_id]
+
+
+class DatabaseJobStore:
+    """
+    sync_jobs 테이블 작업 기록 (app/sql/sync_jobs.sql)
+    - uvicorn worker 여러 개가 작업 조회/중복 등록 판별을 공유
+    - 중복 판별은 대기/실행 중 job_key 의 unique 부분 인덱스로 DB 에서 원자적으로 처리
+    - heartbeat 가 stale_after 초 이상 끊긴 작업(worker 종료)은 다음 등록 시 실패 처리
+    - 실행 중인 작업의 진행 상황은 실행하는 worker 가 heartbeat 주기마다 기록
+    """
+
+    def __init__(self, session_factory: Optional[Callable] = None, max_history: int = 100,
+                 stale_after: float = 60.0):
+        self._session_factory = session_factory
+        self.max_history = max_history
+        self.stale_after = stale_after
+
+    def _session(self):
+        # 벤치마크 등에서 교체한 세션 팩토리를 따르도록 호출 시점에 조회
+        return (self._session_factory or db_session.async_session)()
+
+    async def claim(self, job: SyncJob) -> Optional[JobView]:
+        now = _utcnow()
+        async with self._session() as db:
+            await crud.fail_stale_sync_jobs(db, now - timedelta(seconds=self.stale_after), now)
+            await db.commit()
+            # 기존 작업이 확인 직전에 끝났으면 다시 등록 시도
+            for _ in range(3):
+                try:
+                    await crud.add_sync_job(db, SyncJobRecord(**self._values(job), id=job.id, job_key=job.key,
+                                                              params=job.params, created_at=job.created_at))
+                    await db.commit()
+                    return None
+                except IntegrityError:
+                    await db.rollback()
+                existing = await crud.get_in_flight_sync_job(db, job.key)
+                if existing is not None:
+                    return self._view(existing)
+        raise RuntimeError(f"sync job {job.key} could not be registered")
+
+    async def save(self, job: SyncJob) -> None:
+        async with self._session() as db:
+            await crud.update_sync_job(db, job.id, **self._values(job))
+            await db.commit()
+
+    async def get(self, job_id: str) -> Optional[JobView]:
+        async with self._session() as db:
+            record = await crud.get_sync_job(db, job_id)
+            return self._view(record) if record is not None else None
+
+    async def list(self) -> List[JobView]:
+        async with self._session() as db:
+            return [self._view(record) for record in await crud.list_sync_jobs(db, limit=self.max_history)]
+
+    @staticmethod
+    def _values(job: SyncJob) -> Dict[str, Any]:
+        return {
+            "status": job.status.value,
+            "progress": SyncSummary.model_validate(job.stats).model_dump(mode="json"),
+            "error": job.error,
+            "started_at": job.started_at,
+            "finished_at": job.finished_at,
+            "heartbeat_at": _utcnow(),
+        }
+
+    @staticmethod
+    def _view(record: SyncJobRecord) -> SyncJobRead:
+        return SyncJobRead(
+            id=record.id, status=record.status, params=record.params,
+            created_at=record.created_at, started_at=record.started_at, finished_at=record.finished_at,
+            error=record.error, progress=SyncSummary.model_validate(record.progress),
+        )
+
+
+class JobRunner:
+    """
+    asyncio 큐 기반 작업 실행기
+    - concurrency 개의 worker 가 큐에서 작업을 꺼내 실행 (작업은 등록받은 프로세스에서 실행)
+    - 같은 params 의 작업이 대기/실행 중이면 새로 만들지 않고 기존 작업을 반환
+      (params 는 기본값을 채워 정규화한 값으로 넘겨야 함, 예: sync_job_params)
+    - 작업 기록/중복 판별은 store 가 담당 (기본: MemoryJobStore, 여러 worker 는 DatabaseJobStore)
+    - 이 프로세스의 대기/실행 중 작업은 heartbeat 초마다 store 에 진행 상황을 기록
+    """
+
+    def __init__(self, concurrency: int = 1, max_history: int = 100, store=None, heartbeat: float = 5.0):
+        self.concurrency = max(1, concurrency)
+        self.store = store or MemoryJobStore(max_history=max_history)
+        self.heartbeat = heartbeat
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        # 이 프로세스에서 대기/실행 중인 작업 (진행 상황이 store 보다 최신)
+        self._local: Dict[str, SyncJob] = {}
+
+    def _ensure_workers(self) -> None:
+        # 실행 중인 이벤트 루프에 묶이도록 첫 submit 시점에 생성
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        self._workers = [w for w in self._workers if not w.done()]
+        # 요청 처리 중에 생성되더라도 그 요청의 contextvar(요청별 측정값 등)를 물려받지 않도록 빈 context 에서 생성
+        while len(self._workers) < self.concurrency:
+            self._workers.append(contextvars.Context().run(asyncio.create_task, self._worker()))
+        if self._heartbeat_task is None or self._heartbeat_task.done():
+            self._heartbeat_task = contextvars.Context().run(asyncio.create_task, self._beat())
+
+    async def submit(self, params: Dict[str, Any], func: JobFunc) -> Tuple[JobView, bool]:
+        """
+        작업 등록
+
+        Returns:
+            (작업, 새로 생성 여부) - 동일한 작업이 진행 중이면 (기존 작업, False)
+        """
+        job = SyncJob(id=uuid.uuid4().hex, key=job_key(params), params=dict(params))
+        existing = await self.store.claim(job)
+        if existing is not None:
+            return self._local.get(existing.id, existing), False
+
+        self._ensure_workers()
+        self._local[job.id] = job
+        self._queue.put_nowait((job, func))
+        logger.info(f"📥 동기화 작업 등록: {job.id} {job.params}")
+        return job, True
+
+    async def get(self, job_id: str) -> Optional[JobView]:
+        local = self._local.get(job_id)
+        return local if local is not None else await self.store.get(job_id)
+
+    async def list(self) -> List[JobView]:
+        return [self._local.get(job.id, job) for job in await self.store.list()]
+
+    async def _worker(self) -> None:
+        while True:
+            job, func = await self._queue.get()
+            try:
+                await self._run(job, func)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: SyncJob, func: JobFunc) -> None:
+        job.status = JobStatus.RUNNING
+        job.started_at = _utcnow()
+        job.stats.started_at = time.perf_counter()
+        await self._save(job)
+        try:
+            await func(job.stats)
+            job.status = JobStatus.SUCCEEDED
+        except asyncio.CancelledError:
+            job.status = JobStatus.FAILED
+            job.error = "cancelled"
+            raise
+        except Exception as e:
+            logger.exception(f"❌ 동기화 작업 실패: {job.id}")
+            job.status = JobStatus.FAILED
+            job.error = str(e)
+        finally:
+            job.finished_at = _utcnow()
+            if job.stats.finished_at is None:
+                job.stats.finished_at = time.perf_counter()
+            self._local.pop(job.id, None)
+            await self._save(job)
+
+    async def _save(self, job: SyncJob) -> None:
+        # 기록 실패(DB 일시 장애 등)로 작업 실행이 중단되지 않도록 로그만 남김
+        try:
+            await self.store.save(job)
+        except Exception as e:
+            logger.warning(f"⚠️ 동기화 작업 상태 기록 실패: {job.id} {type(e).__name__}: {e}")
+
+    async def _beat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat)
+            for job in list(self._local.values()):
+                await self._save(job)
+
+    async def join(self) -> None:
+        """대기 중인 작업이 모두 끝날 때까지 대기"""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def shutdown(self) -> None:
+        tasks = self._workers + ([self._heartbeat_task] if self._heartbeat_task else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._heartbeat_task = None
+        self._queue = None
+        # 실행되지 못한 대기 작업 정리
+        for job in list(self._local.values()):
+            job.status = JobStatus.FAILED
+            job.error = "cancelled"
+            job.finished_at = _utcnow()
+            await self._save(job)
+        self._local.clear()
+
+
+def create_job_store(settings=None):
+    settings = settings or get_settings()
+    if settings.PET_CLINIC_JOB_STORE == "memory":
+        return MemoryJobStore()
+    return DatabaseJobStore(stale_after=settings.PET_CLINIC_JOB_STALE_AFTER)
+
+
+settings = get_settings()
+job_runner = JobRunner(concurrency=settings.PET_CLINIC_JOB_CONCURRENCY, store=create_job_store(settings),
+                       heartbeat=settings.PET_CLINIC_JOB_HEARTBEAT)
@@ -0,0 +1,386 @@
+# =============================
+# 서울시 동물병원 공공데이터 수집 및 적재
+# =============================
+import asyncio
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import numpy as np
+from pydantic import TypeAdapter
+
+from app.api.common.client import APIClient
+from app.api.common.coalescing import SingleFlight
+from app.api.common.exceptions import APIError
+from app.api.common.streaming import JSONArrayStream
+from app.core.cache import clinic_cache
+from app.core.config import get_settings
+from app.core.http_clients import client_registry
+from app.core.logging_config import logger
+from app.core.metrics import observe_ingestion
+from app.db.crud import get_sync_watermark, set_sync_watermark, upsert_pet_clinics
+from app.db.session import async_session
+from app.schemas.pet_clinic import ClinicRow
+from app.services.coordinates import PROJECTIONS, TMProjection, tm_to_wgs84
+from app.services.spatial_index import clinic_index
+
+SEOUL_OPEN_API_BASE_URL = "http://openapi.seoul.go.kr:8088"
+SERVICE_NAME = "LOCALDATA_020301"
+# 서울 열린데이터 광장은 호출 1회당 최대 1000건까지 반환
+MAX_PAGE_SIZE = 1000
+
+# fetch_page 동시 요청 병합 (HTTP_COALESCE_GETS=true 일 때)
+page_flights = SingleFlight()
+
+
+@dataclass
+class SyncStats:
+    """전체 동기화 진행 상황"""
+    total_count: int = 0
+    pages_total: int = 0
+    pages_fetched: int = 0
+    rows_fetched: int = 0
+    rows_upserted: int = 0
+    rows_inserted: int = 0
+    rows_updated: int = 0
+    # 증분 동기화에서 watermark 이전 수정분이라 DB 에 보내지 않은 행
+    rows_skipped: int = 0
+    incremental: bool = False
+    watermark: Optional[str] = None
+    batch_counts: List[int] = field(default_factory=list)
+    started_at: float = field(default_factory=time.perf_counter)
+    finished_at: Optional[float] = None
+
+    @property
+    def duration(self) -> float:
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    @property
+    def rows_unchanged(self) -> int:
+        return self.rows_upserted - self.rows_inserted - self.rows_updated
+
+    @property
+    def rows_per_sec(self) -> float:
+        duration = self.duration
+        return self.rows_upserted / duration if duration else 0.0
+
+
+def page_ranges(total_count: int, page_size: int = MAX_PAGE_SIZE, first: int = 1) -> List[Tuple[int, int]]:
+    """first 부터 total_count 까지를 page_size 단위의 (start, end) 구간으로 분할 (1-based, 양끝 포함)"""
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    return [(start, min(start + page_size - 1, total_count))
+            for start in range(first, total_count + 1, page_size)]
+
+
+def stream_page(client: APIClient, api_key: str, start: int, end: int) -> JSONArrayStream:
+    """
+    /{start}/{end}/ 구간의 row 를 응답 본문을 받는 대로 하나씩 반환하는 스트림
+    (row 배열 밖의 list_total_count / RESULT 는 순회가 끝난 뒤 page_total_count 로 확인)
+    """
+    return client.stream_json(f"{api_key}/json/{SERVICE_NAME}/{start}/{end}/", (SERVICE_NAME, "row"))
+
+
+def page_total_count(stream: JSONArrayStream) -> int:
+    """
+    다 읽은 스트림의 결과 코드 확인
+
+    Returns:
+        list_total_count
+
+    Raises:
+        APIError: 응답에 서비스 데이터가 없거나 오류 코드가 반환된 경우
+    """
+    data = stream.envelope or {}
+    body = data.get(SERVICE_NAME)
+    if body is None:
+        result = data.get("RESULT", {})
+        raise APIError(
+            f"{result.get('CODE', 'UNKNOWN')}: {result.get('MESSAGE', 'No data returned from API')}",
+            response_data=data
+        )
+    return int(body.get("list_total_count", 0))
+
+
+async def fetch_page(client: APIClient, api_key: str, start: int, end: int) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    /{start}/{end}/ 구간 조회 (본문 전체 문자열을 메모리에 올리지 않고 row 단위로 파싱)
+
+    Returns:
+        (row 목록, list_total_count)
+
+    Raises:
+        APIError: 응답에 서비스 데이터가 없거나 오류 코드가 반환된 경우
+    """
+    async def load() -> Tuple[List[Dict[str, Any]], int]:
+        stream = stream_page(client, api_key, start, end)
+        rows = [row async for row in stream]
+        return rows, page_total_count(stream)
+
+    if not get_settings().HTTP_COALESCE_GETS:
+        return await load()
+    # 같은 구간을 동시에 요청하면 (여러 사용자/작업) 업스트림 호출 한 번의 결과를 공유
+    return await page_flights.do((id(client), api_key, start, end), load)
+
+
+async def iter_batches(rows: AsyncIterator[Dict[str, Any]], size: int) -> AsyncIterator[List[Dict[str, Any]]]:
+    """비동기 row 스트림을 size 개씩 묶어서 반환"""
+    batch: List[Dict[str, Any]] = []
+    async for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# seoul_pet_clinics 컬럼 → 서울 열린데이터 광장 필드 (문자열 값은 그대로 복사, X/Y/위경도는 map_clinic_rows 에서 별도 처리)
+SEOUL_FIELD_MAP: Dict[str, str] = {
+    "opnsfteamcode": "OPNSFTEAMCODE",
+    "mgt_no": "MGTNO",
+    "apv_perm_ymd": "APVPERMYMD",
+    "apv_cancel_ymd": "APVCANCELYMD",
+    "trd_state_gbn": "TRDSTATEGBN",
+    "trd_state_nm": "TRDSTATENM",
+    "dtl_state_gbn": "DTLSTATEGBN",
+    "dtl_state_nm": "DTLSTATENM",
+    "dcby_md": "DCBYMD",
+    "clg_st_dt": "CLGSTDT",
+    "clg_end_dt": "CLGENDDT",
+    "ropn_ymd": "ROPNYMD",
+    "site_tel": "SITETEL",
+    "site_area": "SITEAREA",
+    "site_post_no": "SITEPOSTNO",
+    "site_whl_addr": "SITEWHLADDR",
+    "rdn_whl_addr": "RDNWHLADDR",
+    "rdn_post_no": "RDNPOSTNO",
+    "bplc_nm": "BPLCNM",
+    "last_mod_ts": "LASTMODTS",
+    "update_gbn": "UPDATEGBN",
+    "update_dt": "UPDATEDT",
+    "uptae_nm": "UPTAENM",
+    "lind_job_gbn_nm": "LINDJOBGBNNM",
+    "lind_prcb_gbn_nm": "LINDPRCBGBNNM",
+    "lind_seq_no": "LINDSEQNO",
+    "rgtmbds_no": "RGTMBDSNO",
+    "totep_num": "TOTEPNUM",
+}
+
+# 페이지 단위 일괄 검증 (row 마다 모델 검증기를 따로 호출하지 않음)
+clinic_rows_adapter = TypeAdapter(List[ClinicRow])
+
+
+def _parse_coordinate(value: Any) -> float:
+    return float(value) if value else np.nan
+
+
+def _tm_coordinates(rows: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+    xs = np.fromiter((_parse_coordinate(r.get("X")) for r in rows), dtype=float, count=len(rows))
+    ys = np.fromiter((_parse_coordinate(r.get("Y")) for r in rows), dtype=float, count=len(rows))
+    return xs, ys
+
+
+def _nullable(values: np.ndarray, decimals: Optional[int] = None) -> List[Optional[float]]:
+    # NaN 은 DB 에 NULL 로 저장되도록 None 으로 변환
+    if decimals is not None:
+        values = np.round(values, decimals)
+    return np.where(np.isnan(values), None, values).tolist()
+
+
+def map_clinic_rows(rows: List[Dict[str, Any]], projection: Optional[TMProjection] = None) -> List[Dict[str, Any]]:
+    """
+    공공 API row → seoul_pet_clinics 컬럼 dict (ORM 객체 없이 SEOUL_FIELD_MAP 기준으로 한 번만 변환)
+    - X/Y 는 한 번만 파싱해서 TM 좌표 컬럼과 위경도 변환에 같이 사용
+    - 결과 dict 는 upsert 에 그대로 전달
+    """
+    projection = projection or PROJECTIONS[get_settings().PET_CLINIC_TM_CRS]
+    xs, ys = _tm_coordinates(rows)
+    lats, lngs = tm_to_wgs84(xs, ys, projection)
+    fields = tuple(SEOUL_FIELD_MAP.items())
+    mapped = []
+    for r, x, y, lat, lng in zip(rows, _nullable(xs), _nullable(ys), _nullable(lats, 7), _nullable(lngs, 7)):
+        row = {column: r.get(field) for column, field in fields}
+        row["x"] = x
+        row["y"] = y
+        row["lat"] = lat
+        row["lng"] = lng
+        mapped.append(row)
+    return mapped
+
+
+def validate_clinic_rows(rows: List[Dict[str, Any]]) -> List[ClinicRow]:
+    """
+    map_clinic_rows 결과를 ClinicRow 목록으로 일괄 검증 (응답에 그대로 사용)
+
+    Raises:
+        pydantic.ValidationError: 필수 값 누락 또는 타입이 맞지 않는 row 가 있는 경우
+    """
+    return clinic_rows_adapter.validate_python(rows)
+
+
+async def after_ingestion(db) -> None:
+    """
+    적재 commit 이후 파생 데이터 갱신
+    - 조회 API 응답 캐시 버전을 올려 이전 응답 무효화
+    - 사용 중인 공간 인덱스는 새 데이터로 재빌드
+    """
+    await clinic_cache.invalidate()
+    if clinic_index.ready:
+        await clinic_index.refresh(db)
+
+
+def is_modified_since(row: Dict[str, Any], watermark: Optional[str]) -> bool:
+    """
+    LASTMODTS 가 watermark 이후(같은 시각 포함)인 row 인지 (값이 없으면 변경된 것으로 간주)
+    - LASTMODTS 는 초 단위이므로 watermark 와 같은 초에 지난 동기화 이후 수정된 행이 있을 수 있음
+    - 다시 보내진 동일한 행은 only_changed upsert(IS DISTINCT FROM)에서 갱신 없이 걸러짐
+    """
+    last_mod_ts = row.get("LASTMODTS")
+    return watermark is None or not last_mod_ts or last_mod_ts >= watermark
+
+
+async def _write_rows(db, rows: List[Dict[str, Any]], batch_size: int, stats: SyncStats,
+                      since: Optional[str] = None) -> None:
+    stats.rows_fetched += len(rows)
+
+    if stats.incremental:
+        changed = [r for r in rows if is_modified_since(r, since)]
+        stats.rows_skipped += len(rows) - len(changed)
+        page_max = max((r["LASTMODTS"] for r in rows if r.get("LASTMODTS")), default=None)
+        if page_max and (stats.watermark is None or page_max > stats.watermark):
+            stats.watermark = page_max
+        rows = changed
+
+    if not rows:
+        return
+
+    clinic_rows = map_clinic_rows(rows)
+    validate_clinic_rows(clinic_rows)
+    upserted = await upsert_pet_clinics(db, clinic_rows, batch_size=batch_size, only_changed=stats.incremental)
+
+    stats.rows_upserted += upserted.sent
+    stats.rows_inserted += upserted.inserted
+    stats.rows_updated += upserted.updated
+    stats.batch_counts.extend(upserted.batch_counts)
+
+
+async def _write_page(db, rows: List[Dict[str, Any]], batch_size: int, stats: SyncStats,
+                      since: Optional[str] = None) -> None:
+    # 변환/검증은 batch_size 단위로만 수행해 페이지 전체의 중간 객체를 동시에 들고 있지 않음
+    stats.pages_fetched += 1
+    for start in range(0, len(rows), batch_size):
+        await _write_rows(db, rows[start:start + batch_size], batch_size, stats, since)
+    await db.commit()
+
+
+async def _write_stream(db, stream: JSONArrayStream, batch_size: int, stats: SyncStats,
+                        since: Optional[str] = None) -> int:
+    """응답 본문이 도착하는 대로 batch_size 개씩 적재하고 list_total_count 반환"""
+    stats.pages_fetched += 1
+    async for batch in iter_batches(stream, batch_size):
+        await _write_rows(db, batch, batch_size, stats, since)
+    total_count = page_total_count(stream)
+    await db.commit()
+    return total_count
+
+
+async def sync_all_pet_clinics(db, client: APIClient, api_key: str,
+                               concurrency: int = 4,
+                               page_size: int = MAX_PAGE_SIZE,
+                               batch_size: int = 500,
+                               incremental: bool = False,
+                               stats: Optional[SyncStats] = None) -> SyncStats:
+    """
+    전체 데이터셋 동기화
+    - 첫 페이지로 list_total_count 를 확인한 뒤 나머지 페이지를 concurrency 개씩 동시에 요청
+    - 도착한 순서대로 페이지를 바로 DB 에 적재 (세션은 하나이므로 쓰기는 순차 수행)
+    - 동시 요청 슬롯은 페이지를 적재한 뒤에 반환하므로 적재 대기 중인 페이지도 concurrency 개를 넘지 않음
+    - incremental=True 이면 저장된 LASTMODTS watermark 이후 수정된 행만, 실제 값이 바뀐 경우에만 갱신하고
+      모든 페이지가 성공한 뒤 watermark 를 전진
+    """
+    stats = stats or SyncStats()
+    stats.incremental = incremental
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+
+    since = await get_sync_watermark(db, SERVICE_NAME) if incremental else None
+    stats.watermark = since
+
+    # 첫 페이지는 단독으로 요청하므로 본문을 스트리밍하면서 바로 적재
+    total_count = await _write_stream(db, stream_page(client, api_key, 1, page_size), batch_size, stats, since)
+    stats.total_count = total_count
+    stats.pages_total = max(1, math.ceil(total_count / page_size))
+
+    # 요청 중이거나 받아 놓고 아직 적재하지 않은 페이지 수 상한 (DB 가 API 보다 느려도 메모리에 쌓이는 페이지는 concurrency 개까지)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def bounded_fetch(start: int, end: int) -> List[Dict[str, Any]]:
+        # 슬롯은 페이지를 적재한 뒤 소비 쪽에서 반환
+        await semaphore.acquire()
+        try:
+            rows, _ = await fetch_page(client, api_key, start, end)
+        except BaseException:
+            semaphore.release()
+            raise
+        return rows
+
+    tasks = [asyncio.create_task(bounded_fetch(start, end))
+             for start, end in page_ranges(total_count, page_size, first=page_size + 1)]
+    try:
+        for next_page in asyncio.as_completed(tasks):
+            rows = await next_page
+            try:
+                await _write_page(db, rows, batch_size, stats, since)
+            finally:
+                semaphore.release()
+    finally:
+        # 중간에 실패하면 아직 진행 중인 요청은 취소하고, 스트림이 닫힐 때까지 대기
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    # 일부 페이지만 적재된 상태에서 watermark 를 올리면 누락이 생기므로 전체 성공 후에만 저장
+    if incremental and stats.watermark and stats.watermark != since:
+        await set_sync_watermark(db, SERVICE_NAME, stats.watermark)
+        await db.commit()
+
+    await after_ingestion(db)
+
+    stats.finished_at = time.perf_counter()
+    observe_ingestion("incremental" if incremental else "full", stats.rows_upserted, stats.duration)
+    logger.info(
+        f"🐾 동물병원 {'증분' if incremental else '전체'} 동기화 완료: {stats.rows_upserted}/{stats.total_count}건 "
+        f"(insert {stats.rows_inserted}, update {stats.rows_updated}, skip {stats.rows_skipped}), "
+        f"{stats.pages_fetched}페이지, {stats.duration:.3f}s, {stats.rows_per_sec:.1f} rows/s"
+    )
+    return stats
+
+
+def sync_job_params(incremental: bool = False, concurrency: Optional[int] = None,
+                    batch_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    기본값을 채운 동기화 작업 인자
+    - 작업 중복 제거 키로 쓰이므로, 생략한 값과 기본값을 명시한 값이 같은 작업으로 묶이도록 정규화
+    """
+    settings = get_settings()
+    return {
+        "incremental": incremental,
+        "concurrency": concurrency or settings.PET_CLINIC_SYNC_CONCURRENCY,
+        "batch_size": batch_size or settings.PET_CLINIC_UPSERT_BATCH_SIZE,
+    }
+
+
+async def run_pet_clinic_sync(stats: SyncStats, incremental: bool = False,
+                              concurrency: Optional[int] = None,
+                              batch_size: Optional[int] = None) -> SyncStats:
+    """요청 스코프 밖(백그라운드 작업)에서 자체 DB 세션과 API 클라이언트로 전체/증분 동기화 실행"""
+    settings = get_settings()
+    async with async_session() as db:
+        return await sync_all_pet_clinics(
+            db, client_registry.get(SEOUL_OPEN_API_BASE_URL), settings.SEOUL_OPEN_API_KEY,
+            concurrency=concurrency or settings.PET_CLINIC_SYNC_CONCURRENCY,
+            page_size=settings.PET_CLINIC_PAGE_SIZE,
+            batch_size=batch_size or settings.PET_CLINIC_UPSERT_BATCH_SIZE,
+            incremental=incremental,
+            stats=stats,
+        )
@@ -0,0 +1,178 @@
+# =============================
+# 동물병원 공간 인덱스 (근접 병원 조회)
+# =============================
+import asyncio
+import math
+import time
+from collections import defaultdict
+from typing import Dict, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+import numpy as np
+from sqlalchemy.future import select
+
+from app.core.config import get_settings
+from app.models.pet_clinic import OPEN_STATE_CODE, PetClinic
+from app.schemas.pet_clinic import ClinicRow
+
+T = TypeVar("T")
+
+# 인덱스에 보관하는 컬럼: 근접 조회 응답(ClinicRow)에 필요한 값만 Row 튜플로 조회 (ORM 인스턴스 생성 없이)
+INDEX_COLUMNS = [PetClinic.__table__.c[name] for name in ClinicRow.model_fields]
+
+
+class GridIndex(Generic[T]):
+    """
+    TM 평면 좌표(m) 위의 균일 격자 인덱스
+    - 점들을 cell_size 크기의 칸으로 나눠 보관하고, 질의 지점의 칸에서 바깥 고리 방향으로 넓혀가며 후보 탐색
+    - 이미 탐색한 고리 반경 안에 k 개가 모이면 더 먼 칸은 볼 필요가 없으므로 전체 스캔 없이 k-NN 을 구함
+    - 빌드 후에는 읽기 전용이므로 교체(rebuild) 는 새 인스턴스를 만들어 참조만 바꿈
+    """
+
+    def __init__(self, points: Iterable[Tuple[float, float, T]], cell_size: float = 500.0):
+        self.cell_size = cell_size
+        items: List[T] = []
+        xs: List[float] = []
+        ys: List[float] = []
+        for x, y, item in points:
+            xs.append(x)
+            ys.append(y)
+            items.append(item)
+
+        self.items = items
+        self.xs = np.asarray(xs, dtype=float)
+        self.ys = np.asarray(ys, dtype=float)
+
+        cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for i, key in enumerate(zip(np.floor(self.xs / cell_size).astype(int).tolist(),
+                                    np.floor(self.ys / cell_size).astype(int).tolist())):
+            cells[key].append(i)
+        self._cells = {key: np.asarray(idx, dtype=np.intp) for key, idx in cells.items()}
+
+        if cells:
+            keys = np.asarray(list(cells.keys()))
+            self._bounds = (keys[:, 0].min(), keys[:, 0].max(), keys[:, 1].min(), keys[:, 1].max())
+        else:
+            self._bounds = (0, -1, 0, -1)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def _ring(self, cx: int, cy: int, r: int) -> List[np.ndarray]:
+        if r == 0:
+            cell = self._cells.get((cx, cy))
+            return [cell] if cell is not None else []
+        found = []
+        for dx in range(-r, r + 1):
+            for dy in (-r, r) if abs(dx) != r else range(-r, r + 1):
+                cell = self._cells.get((cx + dx, cy + dy))
+                if cell is not None:
+                    found.append(cell)
+        return found
+
+    def _max_ring(self, cx: int, cy: int) -> int:
+        min_x, max_x, min_y, max_y = self._bounds
+        return int(max(abs(cx - min_x), abs(cx - max_x), abs(cy - min_y), abs(cy - max_y)))
+
+    def nearest(self, x: float, y: float, k: int = 10,
+                radius: Optional[float] = None) -> List[Tuple[float, T]]:
+        """
+        (x, y) 에서 가까운 순으로 최대 k 개의 (거리[m], item) 반환
+
+        Args:
+            radius: 지정 시 이 거리(m) 이내의 점만 반환
+        """
+        if not self.items or k <= 0:
+            return []
+
+        cx, cy = int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size))
+        max_ring = self._max_ring(cx, cy)
+        if radius is not None:
+            max_ring = min(max_ring, int(math.ceil(radius / self.cell_size)) + 1)
+
+        candidates: List[np.ndarray] = []
+        found = 0
+        for r in range(max_ring + 1):
+            ring = self._ring(cx, cy, r)
+            candidates.extend(ring)
+            found += sum(len(cell) for cell in ring)
+            # 고리 r 까지 탐색하면 질의 지점에서 최소 r * cell_size 거리 안의 점은 모두 본 상태
+            if found >= k:
+                idx = np.concatenate(candidates)
+                dist = np.hypot(self.xs[idx] - x, self.ys[idx] - y)
+                if np.partition(dist, k - 1)[k - 1] <= r * self.cell_size:
+                    break
+
+        if not candidates:
+            return []
+        idx = np.concatenate(candidates)
+        dist = np.hypot(self.xs[idx] - x, self.ys[idx] - y)
+        if radius is not None:
+            within = dist <= radius
+            idx, dist = idx[within], dist[within]
+        order = np.argsort(dist, kind="stable")[:k]
+        return [(float(dist[i]), self.items[idx[i]]) for i in order]
+
+
+class ClinicSpatialIndex:
+    """
+    동물병원 근접 조회용 인메모리 인덱스
+    - 적재가 끝날 때마다 refresh() 로 DB 에서 다시 빌드
+    - 조회는 빌드된 GridIndex 를 참조만 하므로 rebuild 중에도 이전 인덱스로 응답
+    - refresh 는 lock 으로 한 번에 하나만 실행 (stale 인덱스를 만난 동시 요청이 각자 전체 테이블을 읽지 않도록)
+    """
+
+    def __init__(self, cell_size: float = 500.0):
+        self.cell_size = cell_size
+        self._index: Optional[GridIndex] = None
+        self.built_at: Optional[float] = None
+        self.refreshes = 0
+        self._lock = asyncio.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._index is not None
+
+    def build(self, clinics: Iterable) -> None:
+        """x, y 가 있는 Row(또는 PetClinic 등 같은 속성을 가진 객체) 목록으로 인덱스 교체"""
+        self._index = GridIndex(((c.x, c.y, c) for c in clinics if c.x is not None and c.y is not None),
+                                cell_size=self.cell_size)
+        self.built_at = time.time()
+
+    def is_stale(self, max_age: float) -> bool:
+        """다른 worker 에서 적재된 데이터를 반영하도록 max_age 초가 지나면 재빌드 대상"""
+        return self.built_at is None or time.time() - self.built_at > max_age
+
+    async def refresh(self, db, max_age: Optional[float] = None) -> None:
+        """
+        DB 에서 다시 빌드
+
+        Args:
+            max_age: 지정 시 lock 을 얻은 뒤 다시 확인해, 기다리는 동안 다른 요청이 재빌드했으면 건너뜀
+                     (미지정이면 적재 직후처럼 항상 재빌드)
+        """
+        async with self._lock:
+            if max_age is not None and not self.is_stale(max_age):
+                return
+            result = await db.execute(
+                select(*INDEX_COLUMNS).where(PetClinic.x.is_not(None), PetClinic.y.is_not(None))
+            )
+            self.build(result.all())
+            self.refreshes += 1
+
+    def nearest(self, x: float, y: float, k: int = 10, radius: Optional[float] = None,
+                include_closed: bool = False):
+        if self._index is None:
+            return []
+        if include_closed:
+            return self._index.nearest(x, y, k=k, radius=radius)
+        # 폐업 병원을 건너뛰어도 k 개가 채워지도록 후보를 넉넉히 가져와 거름
+        fetch = k
+        while True:
+            found = self._index.nearest(x, y, k=fetch, radius=radius)
+            open_ = [(d, c) for d, c in found if c.trd_state_gbn == OPEN_STATE_CODE]
+            if len(open_) >= k or len(found) < fetch:
+                return open_[:k]
+            fetch *= 4
+
+
+clinic_index = ClinicSpatialIndex(cell_size=get_settings().PET_CLINIC_INDEX_CELL_SIZE)
@@ -24,6 +24,8 @@ CREATE TABLE IF NOT EXISTS seoul_pet_clinics (
     uptae_nm VARCHAR,
     x FLOAT,
     y FLOAT,
+    lat FLOAT,                                -- 위도 (WGS84)
+    lng FLOAT,                                -- 경도 (WGS84)
     lind_job_gbn_nm VARCHAR,
     lind_prcb_gbn_nm VARCHAR,
     lind_seq_no VARCHAR,
@@ -32,3 +34,12 @@ CREATE TABLE IF NOT EXISTS seoul_pet_clinics (
     created_at TIMESTAMPTZ DEFAULT NOW(),     -- 생성일자
     updated_at TIMESTAMPTZ                    -- 수정일자
 );
+
+-- 기존 테이블 마이그레이션
+ALTER TABLE seoul_pet_clinics ADD COLUMN IF NOT EXISTS lat FLOAT;
+ALTER TABLE seoul_pet_clinics ADD COLUMN IF NOT EXISTS lng FLOAT;
+
+-- 목록 조회 인덱스 (필터 + mgt_no keyset 페이지네이션, 사업장명 접두어 검색)
+CREATE INDEX IF NOT EXISTS ix_seoul_pet_clinics_trd_state_gbn_mgt_no ON seoul_pet_clinics (trd_state_gbn, mgt_no);
+CREATE INDEX IF NOT EXISTS ix_seoul_pet_clinics_opnsfteamcode_mgt_no ON seoul_pet_clinics (opnsfteamcode, mgt_no);
+CREATE INDEX IF NOT EXISTS ix_seoul_pet_clinics_bplc_nm_prefix ON seoul_pet_clinics (bplc_nm text_pattern_ops);
@@ -0,0 +1,17 @@
+-- PET_CLINIC_NEARBY_BACKEND=postgis 사용 시 적용 (PostGIS 확장 필요)
+-- x/y 는 PET_CLINIC_TM_CRS 의 TM 좌표이므로 같은 SRID 의 식 인덱스로 KNN(<->) 정렬을 인덱스로 처리
+-- ⚠️ 인덱스 SRID 는 PET_CLINIC_TM_CRS 와 같아야 함 (다르면 질의 식이 인덱스와 맞지 않아 순차 탐색)
+--   EPSG:2097(기본값): psql -f app/sql/seoul_pet_clinics_postgis.sql
+--   EPSG:5174:        psql -v srid=5174 -f app/sql/seoul_pet_clinics_postgis.sql
+--   설정을 바꾸면 DROP INDEX ix_seoul_pet_clinics_geom; 후 다시 적용
+\if :{?srid}
+\else
+    \set srid 2097
+\endif
+
+CREATE EXTENSION IF NOT EXISTS postgis;
+
+CREATE INDEX IF NOT EXISTS ix_seoul_pet_clinics_geom
+    ON seoul_pet_clinics
+    USING GIST (ST_SetSRID(ST_MakePoint(x, y), :srid))
+    WHERE x IS NOT NULL AND y IS NOT NULL;
@@ -0,0 +1,18 @@
+CREATE TABLE IF NOT EXISTS sync_jobs (
+    id VARCHAR PRIMARY KEY,                   -- 작업 id
+    job_key VARCHAR NOT NULL,                 -- 정규화된 params (중복 등록 판별용)
+    params JSON NOT NULL,                     -- 작업 파라미터
+    status VARCHAR NOT NULL,                  -- queued | running | succeeded | failed
+    progress JSON,                            -- 진행 상황 (SyncSummary)
+    error TEXT,                               -- 실패 사유
+    created_at TIMESTAMPTZ NOT NULL,          -- 등록 시각
+    started_at TIMESTAMPTZ,                   -- 실행 시작 시각
+    finished_at TIMESTAMPTZ,                  -- 종료 시각
+    heartbeat_at TIMESTAMPTZ NOT NULL         -- 실행 중인 worker 가 마지막으로 기록한 시각
+);
+
+-- uvicorn worker 여러 개가 같은 작업을 동시에 등록해도 대기/실행 중인 작업은 params 당 한 건
+CREATE UNIQUE INDEX IF NOT EXISTS uq_sync_jobs_in_flight_key
+    ON sync_jobs (job_key) WHERE status IN ('queued', 'running');
+
+CREATE INDEX IF NOT EXISTS ix_sync_jobs_created_at ON sync_jobs (created_at);
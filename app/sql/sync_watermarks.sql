@@ -0,0 +1,5 @@
+CREATE TABLE IF NOT EXISTS sync_watermarks (
+    source VARCHAR PRIMARY KEY,               -- 데이터 출처 (공공 API 서비스명)
+    last_mod_ts VARCHAR,                      -- 마지막으로 적재한 최종수정일자
+    synced_at TIMESTAMPTZ DEFAULT NOW()       -- 마지막 동기화 시각
+);
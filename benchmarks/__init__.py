@@ -0,0 +1,12 @@
+"""
+Offline load-test and benchmark suite
+
+Runs the FastAPI app in-process against a local database (SQLite stand-in by default,
+or Postgres via --database-url) and a fake Seoul open-API server on localhost, measures
+latency percentiles and throughput per scenario and saves the results as JSON.
+
+Usage:
+    python -m benchmarks.run
+    python -m benchmarks.run --rows 100 1000 --requests 500 --concurrency 20
+    python -m benchmarks.run --database-url postgresql+asyncpg://postgres:pw@localhost:5432/bench
+"""
@@ -0,0 +1,72 @@
+"""
+Benchmark database wiring (SQLite stand-in or a local Postgres)
+"""
+
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Sequence
+from unittest.mock import patch
+
+from sqlalchemy import func, or_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db import crud
+from app.db import session as db_session
+from app.models import pet_clinic, sync_watermark, users
+from app.models.pet_clinic import PetClinic
+from app.services import pet_clinic_loader
+
+MODEL_BASES = (users.Base, pet_clinic.Base, sync_watermark.Base)
+
+
+def build_sqlite_pet_clinic_upsert(batch: Sequence[Dict[str, Any]], only_changed: bool = False):
+    """
+    SQLite version of crud.build_pet_clinic_upsert (same ON CONFLICT (mgt_no) DO UPDATE).
+    SQLite has no xmax; updated_at is only set by the conflict branch, so NULL means inserted
+    (checked with typeof(): `updated_at IS NULL` evaluates to false inside RETURNING on SQLite 3.40).
+    """
+    stmt = sqlite_insert(PetClinic).values(list(batch))
+    columns = [col for col in batch[0] if col != "mgt_no"]
+    set_ = {col: stmt.excluded[col] for col in columns}
+    set_["updated_at"] = func.now()
+
+    where = None
+    if only_changed:
+        where = or_(*[PetClinic.__table__.c[col].is_distinct_from(stmt.excluded[col]) for col in columns])
+
+    stmt = stmt.on_conflict_do_update(index_elements=["mgt_no"], set_=set_, where=where)
+    return stmt.returning((func.typeof(PetClinic.updated_at) == "null").label("inserted"))
+
+
+@asynccontextmanager
+async def benchmark_database(url: str) -> AsyncIterator[sessionmaker]:
+    """
+    Create fresh tables at `url` and route the app's primary and read sessions to it
+    for the duration of the block.
+    """
+    is_sqlite = url.startswith("sqlite")
+    # Concurrent writers on one SQLite file wait for the lock instead of failing fast
+    engine = create_async_engine(url, connect_args={"timeout": 30} if is_sqlite else {})
+    async with engine.begin() as conn:
+        for base in MODEL_BASES:
+            await conn.run_sync(base.metadata.drop_all)
+            await conn.run_sync(base.metadata.create_all)
+
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    patches = [
+        patch.object(db_session, "async_session", factory),
+        patch.object(db_session, "async_read_session", factory),
+        # background sync jobs open their own session
+        patch.object(pet_clinic_loader, "async_session", factory),
+    ]
+    if is_sqlite:
+        patches.append(patch.object(crud, "build_pet_clinic_upsert", build_sqlite_pet_clinic_upsert))
+    for p in patches:
+        p.start()
+    try:
+        yield factory
+    finally:
+        for p in reversed(patches):
+            p.stop()
+        await engine.dispose()
@@ -0,0 +1,117 @@
+"""
+Fake Seoul open-API server (LOCALDATA_020301) for benchmarks
+
+Serves deterministic clinic rows under the real URL layout
+/{key}/json/LOCALDATA_020301/{start}/{end}/ so the app's APIClient, streaming parser
+and page splitting run unchanged. Pages are encoded once and cached, so the fake server
+costs little compared with the app under test.
+"""
+
+import asyncio
+import threading
+from functools import lru_cache
+from typing import Any, Dict
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.responses import Response
+from starlette.routing import Route
+
+from app.core.responses import dumps
+from app.services.pet_clinic_loader import SERVICE_NAME
+
+DISTRICT_CODES = ("3000000", "3130000", "3210000", "3220000", "3230000")
+
+
+def make_row(i: int) -> Dict[str, Any]:
+    """The i-th (0-based) row, shaped like a real LOCALDATA_020301 row."""
+    open_ = i % 7 != 0
+    return {
+        "OPNSFTEAMCODE": DISTRICT_CODES[i % len(DISTRICT_CODES)],
+        "MGTNO": f"BENCH-{i:07d}",
+        "APVPERMYMD": "20240101",
+        "APVCANCELYMD": "",
+        "TRDSTATEGBN": "01" if open_ else "03",
+        "TRDSTATENM": "영업/정상" if open_ else "폐업",
+        "DTLSTATEGBN": "0000" if open_ else "0003",
+        "DTLSTATENM": "정상" if open_ else "폐업",
+        "DCBYMD": "" if open_ else "20240601",
+        "CLGSTDT": "",
+        "CLGENDDT": "",
+        "ROPNYMD": "",
+        "SITETEL": f"02-{1000 + i % 9000}-{i % 10000:04d}",
+        "SITEAREA": f"{50 + i % 200}.5",
+        "SITEPOSTNO": "135080",
+        "SITEWHLADDR": f"서울특별시 강남구 역삼동 {i}",
+        "RDNWHLADDR": f"서울특별시 강남구 테헤란로 {i}",
+        "RDNPOSTNO": "06133",
+        "BPLCNM": f"벤치마크 동물병원 {i}호점",
+        "LASTMODTS": f"2024-01-{1 + i % 28:02d} 12:00:00",
+        "UPDATEGBN": "I",
+        "UPDATEDT": "2024-01-03 02:40:00.0",
+        "UPTAENM": "",
+        # Spread over roughly 10km x 10km of Seoul in the Bessel TM (EPSG:2097) plane
+        "X": f"{195000 + (i * 37) % 10000:.3f}",
+        "Y": f"{440000 + (i * 53) % 10000:.4f}",
+        "LINDJOBGBNNM": "",
+        "LINDPRCBGBNNM": "",
+        "LINDSEQNO": "",
+        "RGTMBDSNO": "",
+        "TOTEPNUM": str(1 + i % 10),
+    }
+
+
+@lru_cache(maxsize=256)
+def encode_page(total: int, start: int, end: int) -> bytes:
+    rows = [make_row(i) for i in range(start - 1, min(end, total))]
+    return dumps({SERVICE_NAME: {
+        "list_total_count": total,
+        "RESULT": {"CODE": "INFO-000", "MESSAGE": "정상 처리되었습니다"},
+        "row": rows,
+    }})
+
+
+def create_app(total_rows: int) -> Starlette:
+    """ASGI app serving total_rows rows; app.state.total_rows can be changed between scenarios."""
+    async def page(request):
+        start, end = request.path_params["start"], request.path_params["end"]
+        return Response(encode_page(request.app.state.total_rows, start, end), media_type="application/json")
+
+    app = Starlette(routes=[Route("/{key}/json/{service}/{start:int}/{end:int}/", page)])
+    app.state.total_rows = total_rows
+    return app
+
+
+class FakeSeoulServer:
+    """Runs the fake API with uvicorn on 127.0.0.1 (free port) in a background thread."""
+
+    def __init__(self, total_rows: int = 1000):
+        self.app = create_app(total_rows)
+        self.server = uvicorn.Server(uvicorn.Config(
+            self.app, host="127.0.0.1", port=0, log_level="warning", lifespan="off", access_log=False))
+        self.thread = threading.Thread(target=self.server.run, name="fake-seoul-api", daemon=True)
+
+    @property
+    def total_rows(self) -> int:
+        return self.app.state.total_rows
+
+    @total_rows.setter
+    def total_rows(self, value: int) -> None:
+        self.app.state.total_rows = value
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.servers[0].sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def __aenter__(self) -> "FakeSeoulServer":
+        self.thread.start()
+        while not self.server.started:
+            if not self.thread.is_alive():
+                raise RuntimeError("Fake Seoul API server failed to start")
+            await asyncio.sleep(0.01)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.server.should_exit = True
+        await asyncio.to_thread(self.thread.join, 5)
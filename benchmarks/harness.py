@@ -0,0 +1,86 @@
+"""
+Closed-loop load generator and latency statistics
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List
+
+import httpx
+import numpy as np
+
+RequestFactory = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+@dataclass
+class ScenarioResult:
+    """Latencies (seconds) of one scenario run."""
+    name: str
+    concurrency: int
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    duration: float = 0.0
+    params: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies) + self.errors
+
+    def to_dict(self) -> Dict[str, Any]:
+        summary: Dict[str, Any] = {
+            "name": self.name,
+            "params": self.params,
+            "requests": self.requests,
+            "errors": self.errors,
+            "concurrency": self.concurrency,
+            "duration_s": round(self.duration, 4),
+            "rps": round(self.requests / self.duration, 2) if self.duration else 0.0,
+        }
+        if self.latencies:
+            latencies_ms = np.asarray(self.latencies) * 1000
+            p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99])
+            summary.update({
+                "p50_ms": round(float(p50), 3),
+                "p95_ms": round(float(p95), 3),
+                "p99_ms": round(float(p99), 3),
+                "mean_ms": round(float(latencies_ms.mean()), 3),
+                "min_ms": round(float(latencies_ms.min()), 3),
+                "max_ms": round(float(latencies_ms.max()), 3),
+            })
+        return summary
+
+
+async def run_load(client: httpx.AsyncClient, name: str, make_request: RequestFactory,
+                   requests: int, concurrency: int = 1, warmup: int = 0,
+                   expected_status: Iterable[int] = (200,), **params: Any) -> ScenarioResult:
+    """
+    Send `requests` requests from `concurrency` workers, each issuing its next request as soon
+    as the previous one finished (closed loop). Unexpected statuses and exceptions are counted
+    as errors and excluded from the latency percentiles.
+    """
+    expected = set(expected_status)
+    for i in range(warmup):
+        await make_request(client, -1 - i)
+
+    result = ScenarioResult(name=name, concurrency=concurrency, params=params)
+    next_index = iter(range(requests))
+
+    async def worker() -> None:
+        for i in next_index:
+            started = time.perf_counter()
+            try:
+                response = await make_request(client, i)
+                ok = response.status_code in expected
+            except Exception:
+                ok = False
+            elapsed = time.perf_counter() - started
+            if ok:
+                result.latencies.append(elapsed)
+            else:
+                result.errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, requests)))))
+    result.duration = time.perf_counter() - started
+    return result
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Run the benchmark scenarios and save the results as JSON
+
+Scenarios (in order, so the read scenarios see loaded data):
+  - health:                    GET /api/v1/health
+  - users_create / users_read: POST /api/v1/users/, GET /api/v1/users/{id}
+  - load_pet_clinics[rows=N]:  GET /pet-clinic/load-pet-clinics?start=1&end=N&response=summary
+  - sync_all[rows=N]:          POST /pet-clinic/sync-jobs, polled until the sync job finishes
+  - clinics_list:              GET /pet-clinic/clinics (rotating filters)
+  - clinics_nearby:            GET /pet-clinic/nearby (rotating points, in-memory index)
+
+Usage:
+    python -m benchmarks.run --rows 100 500 1000 --sync-rows 5000 --requests 300 --concurrency 10
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from unittest.mock import patch
+
+# Settings are read at import time; keep the benchmark away from SSH tunnels and Redis
+os.environ.setdefault("ENV", "bench")
+os.environ.setdefault("CACHE_BACKEND", "memory")
+
+import httpx  # noqa: E402
+from httpx import ASGITransport  # noqa: E402
+
+from app.api.common.registry import create_client_registry  # noqa: E402
+from app.api.v1.endpoints import pet_clinic  # noqa: E402
+from app.core import responses  # noqa: E402
+from app.core.cache import clinic_cache  # noqa: E402
+from app.core.config import get_settings  # noqa: E402
+from app.core.http_clients import client_registry  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.pet_clinic import SEOUL_DISTRICT_CODES  # noqa: E402
+from app.services import pet_clinic_loader  # noqa: E402
+from app.services.jobs import JobRunner  # noqa: E402
+from app.services.spatial_index import ClinicSpatialIndex  # noqa: E402
+from benchmarks.database import benchmark_database  # noqa: E402
+from benchmarks.fake_seoul import FakeSeoulServer  # noqa: E402
+from benchmarks.harness import ScenarioResult, run_load  # noqa: E402
+
+ROOT = Path(__file__).resolve().parents[1]
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+API = "/api/v1"
+DISTRICTS = list(SEOUL_DISTRICT_CODES)[:5]
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_all(client: httpx.AsyncClient, seoul: FakeSeoulServer, args: argparse.Namespace,
+                  record: Callable[[ScenarioResult], None]) -> None:
+    requests, concurrency, warmup = args.requests, args.concurrency, args.warmup
+
+    record(await run_load(client, "health", lambda c, i: c.get(f"{API}/health"), requests, concurrency, warmup))
+
+    record(await run_load(
+        client, "users_create",
+        lambda c, i: c.post(f"{API}/users/", json={"username": f"bench-{i}", "email": f"bench{i}@example.com"}),
+        requests, concurrency, warmup))
+    user_count = requests + warmup
+    record(await run_load(client, "users_read", lambda c, i: c.get(f"{API}/users/{1 + i % user_count}"),
+                          requests, concurrency, warmup))
+
+    for rows in args.rows:
+        record(await run_load(
+            client, f"load_pet_clinics[rows={rows}]",
+            lambda c, i, rows=rows: c.get(f"{API}/pet-clinic/load-pet-clinics",
+                                          params={"start": 1, "end": rows, "response": "summary"}),
+            args.load_requests, args.load_concurrency, 1, rows=rows))
+
+    async def sync_all(c, i):
+        # The endpoint only queues the job (202); the latency is until the job has finished
+        response = await c.post(f"{API}/pet-clinic/sync-jobs")
+        job = response.json()
+        while job["status"] in ("queued", "running"):
+            await asyncio.sleep(0.01)
+            job = (await c.get(f"{API}/pet-clinic/sync-jobs/{job['id']}")).json()
+        return httpx.Response(200 if job["status"] == "succeeded" else 500)
+
+    if args.sync_rows:
+        seoul.total_rows = args.sync_rows
+        record(await run_load(client, f"sync_all[rows={args.sync_rows}]", sync_all,
+                              args.sync_requests, 1, 0, rows=args.sync_rows))
+
+    def list_clinics(c, i):
+        params = {"district": DISTRICTS[i % len(DISTRICTS)], "limit": 50}
+        if i % 2:
+            params["status"] = "open"
+        return c.get(f"{API}/pet-clinic/clinics", params=params)
+
+    record(await run_load(client, "clinics_list", list_clinics, requests, concurrency, warmup))
+
+    def nearby(c, i):
+        return c.get(f"{API}/pet-clinic/nearby", params={
+            "lat": 37.48 + (i % 20) * 0.003, "lng": 127.0 + (i % 17) * 0.003, "k": 10})
+
+    record(await run_load(client, "clinics_nearby", nearby, requests, concurrency, warmup))
+
+
+async def run_scenarios(args: argparse.Namespace) -> List[ScenarioResult]:
+    results: List[ScenarioResult] = []
+
+    def record(result: ScenarioResult) -> None:
+        results.append(result)
+        summary = result.to_dict()
+        print(f"{result.name:<30} {summary['rps']:>9.1f} rps  "
+              f"p50 {summary.get('p50_ms', 0):>8.2f}ms  p95 {summary.get('p95_ms', 0):>8.2f}ms  "
+              f"p99 {summary.get('p99_ms', 0):>8.2f}ms  errors {result.errors}")
+
+    # Same client settings and hooks as the app, but a private registry and spatial index
+    # so a run leaves no state behind in the process
+    registry = create_client_registry(get_settings(), hooks=client_registry.hooks)
+    spatial_index = ClinicSpatialIndex(cell_size=get_settings().PET_CLINIC_INDEX_CELL_SIZE)
+    job_runner = JobRunner()
+
+    async with FakeSeoulServer(total_rows=max(args.rows + [args.sync_rows])) as seoul, \
+            benchmark_database(args.database_url):
+        with ExitStack() as stack:
+            stack.enter_context(patch.object(pet_clinic, "SEOUL_OPEN_API_BASE_URL", seoul.base_url))
+            stack.enter_context(patch.object(pet_clinic, "client_registry", registry))
+            stack.enter_context(patch.object(pet_clinic, "clinic_index", spatial_index))
+            stack.enter_context(patch.object(pet_clinic_loader, "clinic_index", spatial_index))
+            stack.enter_context(patch.object(pet_clinic_loader, "SEOUL_OPEN_API_BASE_URL", seoul.base_url))
+            stack.enter_context(patch.object(pet_clinic_loader, "client_registry", registry))
+            stack.enter_context(patch.object(pet_clinic, "job_runner", job_runner))
+            try:
+                async with httpx.AsyncClient(transport=ASGITransport(app=app), base_url="http://bench",
+                                             timeout=120) as client:
+                    await run_all(client, seoul, args, record)
+            finally:
+                await job_runner.shutdown()
+                await registry.close_all()
+                await clinic_cache.invalidate()
+    return results
+
+
+def build_report(args: argparse.Namespace, results: List[ScenarioResult]) -> Dict[str, Any]:
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": args.database_url.split(":", 1)[0],
+            "json_backend": "orjson" if responses.orjson is not None else "json",
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+        },
+        "scenarios": [result.to_dict() for result in results],
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=f"sqlite+aiosqlite:///{RESULTS_DIR / 'bench.db'}",
+                        help="SQLAlchemy async URL; tables are dropped and recreated")
+    parser.add_argument("--requests", type=int, default=300, help="requests per read/user scenario")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=10, help="untimed requests before each scenario")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 500, 1000],
+                        help="row counts for load_pet_clinics (Seoul API allows at most 1000 per call)")
+    parser.add_argument("--load-requests", type=int, default=20)
+    parser.add_argument("--load-concurrency", type=int, default=2)
+    parser.add_argument("--sync-rows", type=int, default=5000, help="dataset size for sync_all (0 to skip)")
+    parser.add_argument("--sync-requests", type=int, default=3)
+    parser.add_argument("--output", type=Path,
+                        help="result JSON path (default: benchmarks/results/bench_<time>_<commit>.json)")
+    parser.add_argument("--log-level", default="WARNING", help="app log level while benchmarking")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+
+    root_logger = logging.getLogger()
+    previous_level = root_logger.level
+    root_logger.setLevel(args.log_level)
+    try:
+        results = asyncio.run(run_scenarios(args))
+    finally:
+        root_logger.setLevel(previous_level)
+    report = build_report(args, results)
+
+    output = args.output or RESULTS_DIR / (
+        f"bench_{datetime.datetime.now():%Y%m%d_%H%M%S}_{report['meta']['commit'] or 'nogit'}.json")
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+    print(f"Results saved to: {output}")
+    return 1 if any(result.errors for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+JSON response serialization micro-benchmark on the clinic list payload
+
+Compares, for a GET /pet-clinic/clinics page:
+  - jsonable_encoder: model validation + jsonable_encoder + stdlib JSONResponse
+  - response_model:   what FastAPI does for a response_model with Pydantic v2
+                      (validate + serialize to Python) + stdlib JSONResponse
+  - fast_json:        FastJSONResponse on the cached, already-validated JSON value
+
+Usage:
+    python scripts/benchmark_json_response.py --items 50 500 --repeat 200
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from app.core import responses  # noqa: E402
+from app.core.responses import FastJSONResponse  # noqa: E402
+from app.schemas.pet_clinic import ClinicPage, ClinicRow  # noqa: E402
+
+page_adapter = TypeAdapter(ClinicPage)
+
+
+def make_page(items: int) -> Dict[str, Any]:
+    """A cached ClinicPage value (model_dump(mode="json")) with realistic field values."""
+    rows = []
+    for i in range(items):
+        row = {name: f"{name}-{i}" for name in ClinicRow.model_fields}
+        row.update({"mgt_no": f"3220000-104-2020-{i:05d}", "bplc_nm": f"행복동물병원 {i}호점",
+                    "x": 203091.134 + i, "y": 444543.2133 + i, "lat": 37.5030973, "lng": 127.0328574})
+        rows.append(row)
+    return ClinicPage(items=rows, next_cursor=rows[-1]["mgt_no"]).model_dump(mode="json")
+
+
+def via_jsonable_encoder(payload):
+    return JSONResponse(jsonable_encoder(ClinicPage.model_validate(payload))).body
+
+
+def via_response_model(payload):
+    value = page_adapter.validate_python(payload)
+    return JSONResponse(page_adapter.dump_python(value, mode="json")).body
+
+
+def via_fast_json(payload):
+    return FastJSONResponse(payload).body
+
+
+def measure(func: Callable, payload, repeat: int) -> Dict[str, float]:
+    func(payload)  # warm-up
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(payload)
+        timings.append(time.perf_counter() - started)
+    median = statistics.median(timings)
+    return {"median_us": round(median * 1e6, 1), "ops_per_sec": round(1 / median, 1)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, nargs="+", default=[50, 500], help="items per page (limit)")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    results = {"orjson": responses.orjson is not None, "pages": []}
+    for items in args.items:
+        payload = make_page(items)
+        assert json.loads(via_fast_json(payload)) == json.loads(via_jsonable_encoder(payload))
+        timings = {name: measure(func, payload, args.repeat) for name, func in (
+            ("jsonable_encoder", via_jsonable_encoder),
+            ("response_model", via_response_model),
+            ("fast_json", via_fast_json),
+        )}
+        baseline = timings["response_model"]["median_us"]
+        results["pages"].append({
+            "items": items,
+            "bytes": len(via_fast_json(payload)),
+            **timings,
+            "speedup_vs_response_model": round(baseline / timings["fast_json"]["median_us"], 2),
+        })
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
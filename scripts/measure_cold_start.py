@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Worker cold-start measurement
+
+Starts fresh interpreters (like new uvicorn workers) and measures:
+  - import_ms:  `import app.main` (all app modules and dependencies)
+  - startup_ms: the lifespan startup phase until the app accepts requests
+  - total_ms:   interpreter start to ready, as seen from the parent process
+
+Optionally lists the slowest imports (python -X importtime, cumulative).
+
+Usage:
+    python scripts/measure_cold_start.py --runs 5 --top 15
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Runs inside the child interpreter; prints one JSON line
+CHILD = """
+import asyncio, json, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+
+async def startup():
+    async with app.main.app.router.lifespan_context(app.main.app):
+        return time.perf_counter()
+
+ready = asyncio.run(startup())
+print(json.dumps({"import_ms": (imported - started) * 1000, "startup_ms": (ready - imported) * 1000}))
+"""
+
+
+def measure_once(env: Dict[str, str]) -> Dict[str, float]:
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", CHILD], cwd=ROOT, env=env, capture_output=True,
+                            text=True, check=True)
+    total_ms = (time.perf_counter() - started) * 1000
+    return {**json.loads(result.stdout.strip().splitlines()[-1]), "total_ms": total_ms}
+
+
+def slowest_imports(env: Dict[str, str], top: int) -> List[tuple]:
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app.main"], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if name.strip() != "app.main":
+            imports.append((int(cumulative) / 1000, name.strip()))
+    return sorted(imports, reverse=True)[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="list the N slowest imports (0 to skip)")
+    parser.add_argument("--env", default="prod", help="ENV for the child process (dev opens the SSH tunnel)")
+    args = parser.parse_args()
+
+    env = {**os.environ, "ENV": args.env, "PYTHONWARNINGS": "ignore"}
+    runs = [measure_once(env) for _ in range(args.runs)]
+
+    print(f"Cold start over {args.runs} runs (ENV={args.env}):")
+    for key in ("import_ms", "startup_ms", "total_ms"):
+        values = [run[key] for run in runs]
+        print(f"  {key:<11} median {statistics.median(values):8.1f}   min {min(values):8.1f}   max {max(values):8.1f}")
+
+    if args.top:
+        print(f"\nSlowest imports (cumulative ms, including nested imports):")
+        for cumulative_ms, name in slowest_imports(env, args.top):
+            print(f"  {cumulative_ms:8.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,46 +6,86 @@ Test runner with visualization and automatic saving
 import os
 import sys
 import json
+import heapq
+import argparse
 import datetime
+import tempfile
+import statistics
 import subprocess
 from pathlib import Path
 import matplotlib.pyplot as plt
 import pandas as pd
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Optional
+
+# Benchmark metrics kept in the history (see benchmarks/run.py for the JSON layout)
+BENCHMARK_METRICS = ["rps", "p50_ms", "p95_ms", "p99_ms", "mean_ms"]
+# Metrics where a larger value is an improvement; all others are latencies
+HIGHER_IS_BETTER = {"rps"}
 
 
 class TestRunner:
     """Test runner with visualization capabilities."""
     
-    def __init__(self):
-        self.results_dir = Path("test_results")
+    def __init__(self, results_dir: str = "test_results"):
+        self.results_dir = Path(results_dir)
         self.results_dir.mkdir(exist_ok=True)
         self.timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.benchmark_history_file = self.results_dir / "benchmark_history.csv"
+        self.test_durations_file = self.results_dir / "test_durations.json"
     
-    def run_tests(self, test_path: str = "tests") -> Dict[str, Any]:
-        """Run tests and return results."""
-        print(f"Running tests from: {test_path}")
+    def run_tests(self, test_path: str = "tests", workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Run tests in parallel shards and return results.
         
-        # Run pytest with JSON output
-        cmd = [
-            sys.executable, "-m", "pytest",
-            test_path,
-            "--json-report",
-            "--json-report-file=none",
-            "-v"
-        ]
+        Tests are collected once, split into `workers` shards balanced by the durations of
+        previous runs, and each shard runs in its own pytest process writing a JSON report.
+        """
+        workers = max(1, workers or os.cpu_count() or 1)
+        print(f"Running tests from: {test_path} ({workers} workers)")
         
         try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                cwd=os.getcwd()
-            )
-            
-            # Parse test results
-            test_results = self._parse_test_output(result.stdout, result.stderr, result.returncode)
+            with tempfile.TemporaryDirectory(prefix="test_shards_") as tmp:
+                tmp_dir = Path(tmp)
+                test_ids = self.collect_tests(test_path, tmp_dir / "collect.json")
+                if test_ids:
+                    shards = self.shard_tests(test_ids, workers, self.load_test_durations())
+                else:
+                    # Collection failed: run the path as one shard so pytest reports the errors
+                    shards = [[test_path]]
+                
+                processes = []
+                for index, shard in enumerate(shards):
+                    report_file = tmp_dir / f"shard_{index}.json"
+                    stdout_file = open(tmp_dir / f"shard_{index}.out", "w+", encoding='utf-8')
+                    stderr_file = open(tmp_dir / f"shard_{index}.err", "w+", encoding='utf-8')
+                    # --json-report-omit takes several values, so the node ids go first
+                    cmd = [
+                        sys.executable, "-m", "pytest",
+                        *shard,
+                        "-q", "-p", "no:cacheprovider",
+                        "--json-report",
+                        f"--json-report-file={report_file}",
+                        "--json-report-omit", "collectors", "log"
+                    ]
+                    process = subprocess.Popen(cmd, stdout=stdout_file, stderr=stderr_file, text=True,
+                                               cwd=os.getcwd())
+                    processes.append((process, report_file, stdout_file, stderr_file))
+                
+                shard_results = []
+                for process, report_file, stdout_file, stderr_file in processes:
+                    process.wait()
+                    stdout_file.seek(0)
+                    stderr_file.seek(0)
+                    report = None
+                    if report_file.exists():
+                        with open(report_file, encoding='utf-8') as f:
+                            report = json.load(f)
+                    shard_results.append((report, stdout_file.read(), stderr_file.read(), process.returncode))
+                    stdout_file.close()
+                    stderr_file.close()
             
+            test_results = self._merge_shard_reports(shard_results)
+            self.save_test_durations(test_results["tests"])
             return test_results
             
         except Exception as e:
@@ -62,53 +102,113 @@ class TestRunner:
                 }
             }
     
-    def _parse_test_output(self, stdout: str, stderr: str, return_code: int) -> Dict[str, Any]:
-        """Parse pytest output and extract test results."""
-        lines = stdout.split('\n')
+    def collect_tests(self, test_path: str, report_file: Path) -> List[str]:
+        """Collect test node ids from pytest's JSON report (empty if collection failed)."""
+        cmd = [
+            sys.executable, "-m", "pytest",
+            test_path,
+            "--collect-only", "-q", "-p", "no:cacheprovider",
+            "--json-report",
+            f"--json-report-file={report_file}"
+        ]
+        subprocess.run(cmd, capture_output=True, text=True, cwd=os.getcwd())
+        if not report_file.exists():
+            return []
+        
+        with open(report_file, encoding='utf-8') as f:
+            report = json.load(f)
+        collectors = report.get("collectors", [])
+        if any(collector["outcome"] != "passed" for collector in collectors):
+            return []
+        
+        # Leaf items (Function / Coroutine) are the results that are not collectors themselves
+        collector_ids = {collector["nodeid"] for collector in collectors}
+        return [item["nodeid"] for collector in collectors for item in collector.get("result", [])
+                if item["nodeid"] not in collector_ids]
+    
+    @staticmethod
+    def shard_tests(test_ids: List[str], workers: int, durations: Dict[str, float]) -> List[List[str]]:
+        """
+        Split tests into at most `workers` shards of similar total duration.
+        
+        Longest-first greedy assignment to the least loaded shard; tests without history
+        count as the median known duration. Each shard keeps the collection order so
+        module/class fixtures are still set up once per shard.
+        """
+        default = statistics.median(durations.values()) if durations else 1.0
+        shards: List[List[str]] = [[] for _ in range(min(workers, len(test_ids)))]
+        loads = [(0.0, index) for index in range(len(shards))]
+        
+        for test_id in sorted(test_ids, key=lambda t: durations.get(t, default), reverse=True):
+            load, index = heapq.heappop(loads)
+            shards[index].append(test_id)
+            heapq.heappush(loads, (load + durations.get(test_id, default), index))
+        
+        order = {test_id: position for position, test_id in enumerate(test_ids)}
+        return [sorted(shard, key=order.__getitem__) for shard in shards if shard]
+    
+    def load_test_durations(self) -> Dict[str, float]:
+        """Per-test durations (seconds) recorded by previous runs."""
+        if self.test_durations_file.exists():
+            with open(self.test_durations_file, encoding='utf-8') as f:
+                return json.load(f)
+        return {}
+    
+    def save_test_durations(self, tests: List[Dict[str, Any]]) -> None:
+        durations = self.load_test_durations()
+        durations.update({test["name"]: test["duration"] for test in tests if test.get("duration") is not None})
+        with open(self.test_durations_file, 'w', encoding='utf-8') as f:
+            json.dump(durations, f, indent=2, sort_keys=True)
+    
+    def _merge_shard_reports(self, shard_results: List[Any]) -> Dict[str, Any]:
+        """Merge per-shard pytest JSON reports into one result."""
         tests = []
-        current_test = None
-        
-        for line in lines:
-            if line.startswith('tests/'):
-                # Test result line
-                parts = line.split()
-                if len(parts) >= 2:
-                    test_name = parts[0]
-                    status = parts[1]
-                    
-                    test_info = {
-                        "name": test_name,
-                        "status": status,
-                        "duration": None
-                    }
-                    
-                    # Extract duration if available
-                    for part in parts[2:]:
-                        if part.startswith('[') and part.endswith('s]'):
-                            test_info["duration"] = float(part[1:-2])
-                    
-                    tests.append(test_info)
+        stdout_parts = []
+        stderr_parts = []
+        return_code = 0
         
-        # Calculate summary
-        total = len(tests)
-        passed = len([t for t in tests if t["status"] == "PASSED"])
-        failed = len([t for t in tests if t["status"] == "FAILED"])
-        skipped = len([t for t in tests if t["status"] == "SKIPPED"])
+        for index, (report, stdout, stderr, shard_code) in enumerate(shard_results):
+            stdout_parts.append(stdout)
+            if stderr.strip():
+                stderr_parts.append(f"[shard {index}]\n{stderr}")
+            if report is None:
+                stderr_parts.append(f"[shard {index}] no JSON report written (exit code {shard_code})")
+            else:
+                tests.extend(self._parse_json_report(report))
+            return_code = return_code or shard_code
         
+        # Calculate summary
+        statuses = [t["status"] for t in tests]
         return {
             "success": return_code == 0,
             "tests": tests,
             "summary": {
-                "total": total,
-                "passed": passed,
-                "failed": failed,
-                "skipped": skipped
+                "total": len(tests),
+                "passed": statuses.count("PASSED"),
+                "failed": statuses.count("FAILED") + statuses.count("ERROR"),
+                "skipped": statuses.count("SKIPPED") + statuses.count("XFAILED")
             },
-            "stdout": stdout,
-            "stderr": stderr,
+            "shards": len(shard_results),
+            "stdout": "\n".join(stdout_parts),
+            "stderr": "\n".join(stderr_parts),
             "return_code": return_code
         }
     
+    @staticmethod
+    def _parse_json_report(report: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Extract test results from a pytest-json-report document."""
+        tests = []
+        for test in report.get("tests", []):
+            # setup + call + teardown, so fixture-heavy tests are balanced correctly next time
+            duration = sum(test[stage].get("duration", 0.0) for stage in ("setup", "call", "teardown")
+                           if stage in test)
+            tests.append({
+                "name": test["nodeid"],
+                "status": test["outcome"].upper(),
+                "duration": round(duration, 4)
+            })
+        return tests
+    
     def save_results(self, results: Dict[str, Any]) -> str:
         """Save test results to file."""
         filename = f"test_results_{self.timestamp}.json"
@@ -183,7 +283,130 @@ class TestRunner:
         print(f"Visualization saved to: {viz_filepath}")
         return str(viz_filepath)
     
-    def generate_report(self, results: Dict[str, Any], results_file: str, viz_file: str) -> str:
+    def load_benchmark_history(self) -> pd.DataFrame:
+        """Load the per-benchmark history (one row per benchmark per run)."""
+        if self.benchmark_history_file.exists():
+            return pd.read_csv(self.benchmark_history_file)
+        return pd.DataFrame(columns=["run", "commit", "source", "benchmark", "requests", "errors",
+                                     *BENCHMARK_METRICS])
+    
+    def ingest_benchmarks(self, paths: Iterable[str]) -> pd.DataFrame:
+        """
+        Append benchmark JSON outputs (files, or directories of *.json) to the history.
+        
+        Files already in the history are skipped, so the same results directory can be
+        ingested on every run.
+        """
+        history = self.load_benchmark_history()
+        known = set(history["source"])
+        
+        files: List[Path] = []
+        for path in map(Path, paths):
+            files.extend(sorted(path.glob("*.json")) if path.is_dir() else [path])
+        
+        rows = []
+        for file in files:
+            if file.name in known:
+                continue
+            with open(file, encoding='utf-8') as f:
+                data = json.load(f)
+            if "scenarios" not in data:
+                print(f"Skipping {file}: not a benchmark result")
+                continue
+            meta = data.get("meta", {})
+            for scenario in data["scenarios"]:
+                rows.append({
+                    "run": meta.get("timestamp", file.stem),
+                    "commit": meta.get("commit"),
+                    "source": file.name,
+                    "benchmark": scenario["name"],
+                    "requests": scenario.get("requests"),
+                    "errors": scenario.get("errors"),
+                    **{metric: scenario.get(metric) for metric in BENCHMARK_METRICS},
+                })
+            known.add(file.name)
+        
+        if rows:
+            new_rows = pd.DataFrame(rows)
+            history = new_rows if history.empty else pd.concat([history, new_rows], ignore_index=True)
+            history = history.sort_values("run", kind="stable").reset_index(drop=True)
+            history.to_csv(self.benchmark_history_file, index=False)
+        
+        print(f"Benchmark history: {history['run'].nunique()} runs, {len(rows)} new entries "
+              f"({self.benchmark_history_file})")
+        return history
+    
+    def check_benchmark_regressions(self, history: pd.DataFrame, metric: str = "p95_ms",
+                                    threshold: float = 0.2, window: int = 5) -> List[Dict[str, Any]]:
+        """
+        Compare each benchmark of the latest run with its rolling baseline.
+        
+        The baseline is the median of the benchmark's previous `window` runs. A benchmark
+        regresses when it is worse than the baseline by more than `threshold` (0.2 = 20%).
+        """
+        if history.empty:
+            return []
+        
+        latest_run = history["run"].max()
+        regressions = []
+        for name, runs in history.groupby("benchmark", sort=False):
+            values = runs.sort_values("run", kind="stable").set_index("run")[metric].dropna()
+            if latest_run not in values.index or len(values) < 2:
+                continue
+            latest = float(values.iloc[-1])
+            baseline = float(values.iloc[:-1].tail(window).median())
+            if baseline <= 0:
+                continue
+            if metric in HIGHER_IS_BETTER:
+                change = (baseline - latest) / baseline
+            else:
+                change = (latest - baseline) / baseline
+            if change > threshold:
+                regressions.append({
+                    "benchmark": name,
+                    "metric": metric,
+                    "baseline": round(baseline, 3),
+                    "latest": round(latest, 3),
+                    "change": round(change, 4),
+                })
+        return regressions
+    
+    def create_benchmark_trends(self, history: pd.DataFrame) -> Optional[str]:
+        """Plot p50/p95/p99 latency per benchmark across runs."""
+        if history.empty:
+            return None
+        
+        benchmarks = list(dict.fromkeys(history["benchmark"]))
+        columns = min(3, len(benchmarks))
+        rows = (len(benchmarks) + columns - 1) // columns
+        fig, axes = plt.subplots(rows, columns, figsize=(6 * columns, 4 * rows), squeeze=False)
+        fig.suptitle(f'Benchmark Trends - {self.timestamp}', fontsize=16)
+        
+        for ax, name in zip(axes.flat, benchmarks):
+            runs = history[history["benchmark"] == name].sort_values("run", kind="stable")
+            labels = [str(commit) if pd.notna(commit) else str(run)[:10]
+                      for run, commit in zip(runs["run"], runs["commit"])]
+            for metric, color in (("p50_ms", '#2ecc71'), ("p95_ms", '#f39c12'), ("p99_ms", '#e74c3c')):
+                ax.plot(range(len(runs)), runs[metric], marker='o', color=color, label=metric)
+            ax.set_title(name)
+            ax.set_ylabel('Latency (ms)')
+            ax.set_xticks(range(len(runs)))
+            ax.set_xticklabels(labels, rotation=45, ha='right', fontsize=8)
+            ax.legend(fontsize=8)
+        for ax in list(axes.flat)[len(benchmarks):]:
+            ax.axis('off')
+        
+        plt.tight_layout()
+        
+        trend_filepath = self.results_dir / f"benchmark_trends_{self.timestamp}.png"
+        plt.savefig(trend_filepath, dpi=150, bbox_inches='tight')
+        plt.close()
+        
+        print(f"Benchmark trends saved to: {trend_filepath}")
+        return str(trend_filepath)
+    
+    def generate_report(self, results: Dict[str, Any], results_file: str, viz_file: str,
+                        benchmarks: Optional[Dict[str, Any]] = None) -> str:
         """Generate a comprehensive test report."""
         report_filename = f"test_report_{self.timestamp}.md"
         report_filepath = self.results_dir / report_filename
@@ -203,13 +426,28 @@ class TestRunner:
             
             f.write("## Test Results\n\n")
             for test in results['tests']:
-                status_emoji = "✅" if test['status'] == 'PASSED' else "❌" if test['status'] == 'FAILED' else "⏭️"
+                status_emoji = "✅" if test['status'] == 'PASSED' else "⏭️" if test['status'] in ('SKIPPED', 'XFAILED') else "❌"
                 duration_str = f" ({test['duration']:.2f}s)" if test['duration'] else ""
                 f.write(f"- {status_emoji} {test['name']}{duration_str}\n")
             
+            if benchmarks:
+                f.write(f"\n## Benchmarks\n\n")
+                f.write(f"- **Runs in history**: {benchmarks['runs']}\n")
+                f.write(f"- **Gate**: {benchmarks['metric']} worse than the median of the last "
+                        f"{benchmarks['window']} runs by more than {benchmarks['threshold']:.0%}\n")
+                if benchmarks['regressions']:
+                    f.write(f"\n| Benchmark | Baseline | Latest | Change |\n|---|---|---|---|\n")
+                    for regression in benchmarks['regressions']:
+                        f.write(f"| ❌ {regression['benchmark']} | {regression['baseline']} | "
+                                f"{regression['latest']} | {regression['change']:+.1%} |\n")
+                else:
+                    f.write(f"- ✅ No regressions\n")
+            
             f.write(f"\n## Files\n\n")
             f.write(f"- **Results JSON**: `{results_file}`\n")
             f.write(f"- **Visualization**: `{viz_file}`\n")
+            if benchmarks and benchmarks.get('trend_file'):
+                f.write(f"- **Benchmark Trends**: `{benchmarks['trend_file']}`\n")
             f.write(f"- **Report**: `{report_filepath}`\n")
             
             if results.get('stderr'):
@@ -220,14 +458,67 @@ class TestRunner:
         return str(report_filepath)
 
 
-def main():
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run tests with visualization and benchmark trend tracking")
+    parser.add_argument("test_path", nargs="?", default="tests")
+    parser.add_argument("--skip-tests", action="store_true", help="only process benchmark results")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="parallel pytest processes (default: number of CPU cores)")
+    parser.add_argument("--benchmarks", nargs="*", metavar="PATH",
+                        help="benchmark JSON files or directories to add to the history "
+                             "(no value: benchmarks/results)")
+    parser.add_argument("--benchmark-metric", default="p95_ms", choices=BENCHMARK_METRICS,
+                        help="metric compared against the baseline")
+    parser.add_argument("--regression-threshold", type=float, default=0.2,
+                        help="allowed relative slowdown vs. the baseline (0.2 = 20%%)")
+    parser.add_argument("--baseline-window", type=int, default=5,
+                        help="number of previous runs in the rolling baseline (median)")
+    return parser.parse_args(argv)
+
+
+def run_benchmark_gate(runner: TestRunner, args: argparse.Namespace) -> Dict[str, Any]:
+    """Ingest benchmark results, plot trends and check for regressions."""
+    history = runner.ingest_benchmarks(args.benchmarks or ["benchmarks/results"])
+    regressions = runner.check_benchmark_regressions(
+        history, metric=args.benchmark_metric, threshold=args.regression_threshold, window=args.baseline_window
+    )
+    trend_file = runner.create_benchmark_trends(history)
+    
+    print(f"\n⏱️ Benchmark Gate ({args.benchmark_metric}, threshold {args.regression_threshold:.0%}, "
+          f"baseline: median of last {args.baseline_window} runs):")
+    for regression in regressions:
+        print(f"   ❌ {regression['benchmark']}: {regression['baseline']} → {regression['latest']} "
+              f"({regression['change']:+.1%})")
+    if not regressions:
+        print("   ✅ No regressions")
+    
+    return {
+        "runs": int(history["run"].nunique()),
+        "metric": args.benchmark_metric,
+        "threshold": args.regression_threshold,
+        "window": args.baseline_window,
+        "regressions": regressions,
+        "trend_file": trend_file,
+    }
+
+
+def main(argv: Optional[List[str]] = None):
     """Main function to run tests with visualization."""
+    args = parse_args(argv)
     runner = TestRunner()
     
+    benchmarks = run_benchmark_gate(runner, args) if args.benchmarks is not None else None
+    benchmark_failed = bool(benchmarks and benchmarks["regressions"])
+    
+    if args.skip_tests:
+        if benchmark_failed:
+            sys.exit(1)
+        return
+    
     print("🚀 Starting test execution...")
     
     # Run tests
-    results = runner.run_tests()
+    results = runner.run_tests(args.test_path, workers=args.workers)
     
     # Save results
     results_file = runner.save_results(results)
@@ -236,7 +527,7 @@ def main():
     viz_file = runner.create_visualization(results)
     
     # Generate report
-    report_file = runner.generate_report(results, results_file, viz_file)
+    report_file = runner.generate_report(results, results_file, viz_file, benchmarks)
     
     # Print summary
     summary = results["summary"]
@@ -254,10 +545,12 @@ def main():
     print(f"   Results: {results_file}")
     print(f"   Visualization: {viz_file}")
     print(f"   Report: {report_file}")
+    if benchmarks and benchmarks["trend_file"]:
+        print(f"   Benchmark Trends: {benchmarks['trend_file']}")
     
-    if not results["success"]:
+    if not results["success"] or benchmark_failed:
         sys.exit(1)
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -4,6 +4,7 @@ Pytest configuration and fixtures
 
 import pytest
 import asyncio
+import httpx
 from typing import AsyncGenerator
 from httpx import AsyncClient
 from unittest.mock import AsyncMock, MagicMock
@@ -35,6 +36,40 @@ def mock_api_client():
     return client
 
 
+@pytest.fixture
+def mock_db_session():
+    """Create a mock AsyncSession whose execute() returns a synchronous Result-like mock."""
+    db = AsyncMock()
+    db.execute.return_value = MagicMock()
+    return db
+
+
+class FakeClock:
+    """Monotonic clock stand-in that only moves when a test sets or advances `now`."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def fake_clock():
+    """A FakeClock starting at 0.0, for TTL/backoff code that takes a `clock` callable."""
+    return FakeClock()
+
+
+@pytest.fixture
+def make_client():
+    """Factory for APIClients whose requests are answered by an httpx.MockTransport handler."""
+    def _make(handler, **kwargs) -> APIClient:
+        client = APIClient("http://test.api.com", **kwargs)
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return client
+    return _make
+
+
 @pytest.fixture
 def sample_api_response():
     """Sample API response for testing."""
@@ -55,4 +90,44 @@ def sample_error_response():
         "error": "Bad Request",
         "message": "Invalid parameters",
         "status_code": 400
-    } 
\ No newline at end of file
+    } 
+
+@pytest.fixture
+def make_seoul_clinic_row():
+    """Factory for LOCALDATA_020301 rows as returned by the Seoul open API."""
+    def _make(mgt_no: str = "1234567890", **overrides):
+        row = {
+            "OPNSFTEAMCODE": "3220000",
+            "MGTNO": mgt_no,
+            "APVPERMYMD": "20240101",
+            "APVCANCELYMD": "",
+            "TRDSTATEGBN": "01",
+            "TRDSTATENM": "영업/정상",
+            "DTLSTATEGBN": "0000",
+            "DTLSTATENM": "정상",
+            "DCBYMD": "",
+            "CLGSTDT": "",
+            "CLGENDDT": "",
+            "ROPNYMD": "",
+            "SITETEL": "02-1234-5678",
+            "SITEAREA": "100.5",
+            "SITEPOSTNO": "135080",
+            "SITEWHLADDR": "서울특별시 강남구 역삼동 123",
+            "RDNWHLADDR": "서울특별시 강남구 테헤란로 123",
+            "RDNPOSTNO": "06133",
+            "BPLCNM": f"테스트 동물병원 {mgt_no}",
+            "LASTMODTS": "2024-01-01 12:00:00",
+            "UPDATEGBN": "I",
+            "UPDATEDT": "2024-01-03 02:40:00.0",
+            "UPTAENM": "",
+            "X": "203091.134",
+            "Y": "444543.2133",
+            "LINDJOBGBNNM": "",
+            "LINDPRCBGBNNM": "",
+            "LINDSEQNO": "",
+            "RGTMBDSNO": "",
+            "TOTEPNUM": "5",
+        }
+        row.update(overrides)
+        return row
+    return _make
@@ -0,0 +1,100 @@
+"""
+Integration tests for the load_pet_clinics response modes (full / summary / ndjson)
+"""
+
+import json
+
+import httpx
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from unittest.mock import patch
+from sqlalchemy.dialects import postgresql
+
+from app.api.common.registry import ClientRegistry
+from app.api.v1.endpoints import pet_clinic
+from app.db.session import get_db
+from app.main import app
+from app.services.pet_clinic_loader import SERVICE_NAME
+
+
+@pytest_asyncio.fixture
+async def load_client(make_seoul_clinic_row, mock_db_session):
+    """ASGI client whose Seoul API and DB session are in-memory stand-ins."""
+    rows = [make_seoul_clinic_row(f"M{i:04d}") for i in range(250)]
+
+    def handler(request):
+        start, end = request.url.path.strip("/").split("/")[-2:]
+        return httpx.Response(200, json={SERVICE_NAME: {
+            "list_total_count": len(rows),
+            "RESULT": {"CODE": "INFO-000", "MESSAGE": "정상 처리되었습니다"},
+            "row": rows[int(start) - 1:int(end)],
+        }})
+
+    registry = ClientRegistry()
+    registry.get(pet_clinic.SEOUL_OPEN_API_BASE_URL)._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler))
+    mock_db_session.execute.return_value.scalars.return_value = [True] * 150 + [False] * 50
+    app.dependency_overrides[get_db] = lambda: mock_db_session
+
+    with patch.object(pet_clinic, "client_registry", registry):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            yield client
+
+    app.dependency_overrides.pop(get_db, None)
+
+
+class TestLoadResponseModes:
+    """Test cases for GET /pet-clinic/load-pet-clinics?response=..."""
+
+    @pytest.mark.asyncio
+    async def test_full_is_default(self, load_client):
+        response = await load_client.get("/api/v1/pet-clinic/load-pet-clinics", params={"start": 1, "end": 3})
+
+        assert response.status_code == 200
+        assert [row["mgt_no"] for row in response.json()] == ["M0000", "M0001", "M0002"]
+
+    @pytest.mark.asyncio
+    async def test_summary_returns_counts_only(self, load_client):
+        response = await load_client.get("/api/v1/pet-clinic/load-pet-clinics",
+                                         params={"start": 1, "end": 200, "response": "summary"})
+
+        body = response.json()
+        assert response.status_code == 200
+        assert body["rows_fetched"] == body["rows_upserted"] == 200
+        assert body["rows_inserted"] == 150
+        assert body["rows_updated"] == 50
+        assert body["rows_unchanged"] == 0
+        assert body["duration"] > 0
+        assert "mgt_no" not in response.text
+
+    @pytest.mark.asyncio
+    async def test_summary_counts_unchanged_rows(self, load_client, mock_db_session):
+        """Rows identical to the stored ones are skipped by the upsert and reported as unchanged."""
+        mock_db_session.execute.return_value.scalars.return_value = [True] * 20 + [False] * 30
+
+        response = await load_client.get("/api/v1/pet-clinic/load-pet-clinics",
+                                         params={"start": 1, "end": 200, "response": "summary"})
+
+        body = response.json()
+        assert (body["rows_inserted"], body["rows_updated"], body["rows_unchanged"]) == (20, 30, 150)
+        sql = str(mock_db_session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "IS DISTINCT FROM" in sql
+
+    @pytest.mark.asyncio
+    async def test_ndjson_streams_one_row_per_line(self, load_client):
+        async with load_client.stream("GET", "/api/v1/pet-clinic/load-pet-clinics",
+                                      params={"start": 1, "end": 250, "response": "ndjson"}) as response:
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("application/x-ndjson")
+            lines = [line async for line in response.aiter_lines() if line]
+
+        assert len(lines) == 250
+        assert json.loads(lines[0])["mgt_no"] == "M0000"
+        assert json.loads(lines[-1])["mgt_no"] == "M0249"
+
+    @pytest.mark.asyncio
+    async def test_unknown_mode_rejected(self, load_client):
+        response = await load_client.get("/api/v1/pet-clinic/load-pet-clinics", params={"response": "xml"})
+
+        assert response.status_code == 422
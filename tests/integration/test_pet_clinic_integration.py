@@ -2,11 +2,15 @@
 Integration tests for Pet Clinic API with common client
 """
 
+import json
 import pytest
 import os
-from unittest.mock import patch, AsyncMock
+import httpx
+from fastapi import HTTPException
+from unittest.mock import patch
 from app.api.v1.endpoints.pet_clinic import load_pet_clinics
 from app.api.common.client import APIClient
+from app.api.common.registry import ClientRegistry
 from app.api.common.exceptions import APIError
 
 
@@ -14,7 +18,7 @@ class TestPetClinicIntegration:
     """Integration tests for Pet Clinic API."""
     
     @pytest.mark.asyncio
-    async def test_load_pet_clinics_with_mock_api(self):
+    async def test_load_pet_clinics_with_mock_api(self, mock_db_session):
         """Test load_pet_clinics function with mocked API response."""
         # Mock API response
         mock_response = {
@@ -56,38 +60,60 @@ class TestPetClinicIntegration:
             }
         }
         
+        # Shared client from the registry with a mocked transport
+        registry = ClientRegistry()
+        shared_client = registry.get("http://openapi.seoul.go.kr:8088")
+        requests = []
+        
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json=mock_response)
+        
+        shared_client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        
         # Mock environment variable
         with patch.dict(os.environ, {"SEOUL_OPEN_API_KEY": "test_key"}):
-            # Mock httpx.AsyncClient
-            with patch("httpx.AsyncClient") as mock_client_class:
-                mock_client = AsyncMock()
-                mock_response_obj = AsyncMock()
-                mock_response_obj.json.return_value = mock_response
-                mock_client.get = AsyncMock(return_value=mock_response_obj)
-                mock_client_class.return_value.__aenter__.return_value = mock_client
-                
-                # Mock database session
-                with patch("app.api.v1.endpoints.pet_clinic.get_db") as mock_get_db:
-                    mock_db = AsyncMock()
-                    mock_get_db.return_value = mock_db
+            with patch("app.api.v1.endpoints.pet_clinic.client_registry", registry):
+                # settings is cached at import time, so patch the loaded value too
+                with patch("app.api.v1.endpoints.pet_clinic.settings.SEOUL_OPEN_API_KEY", "test_key"):
+                    # Mock database session
+                    mock_db = mock_db_session
                     
                     # Call the function
-                    result = await load_pet_clinics(start=1, end=1)
+                    result = await load_pet_clinics(start=1, end=1, db=mock_db)
                     
-                    # Verify API call was made
-                    mock_client.get.assert_called_once()
-                    call_args = mock_client.get.call_args
-                    assert "openapi.seoul.go.kr:8088" in call_args[0][0]
-                    assert "test_key" in call_args[0][0]
+                    # Verify API call was made through the shared client
+                    assert len(requests) == 1
+                    url = str(requests[0].url)
+                    assert "openapi.seoul.go.kr:8088" in url
+                    assert "test_key" in url
+                    assert "/LOCALDATA_020301/1/1/" in url
                     
                     # Verify database operations
                     assert mock_db.execute.called
                     assert mock_db.commit.called
                     
-                    # Verify result
-                    assert len(result) == 1
-                    assert result[0].bplc_nm == "테스트 동물병원"
-                    assert result[0].mgt_no == "1234567890"
+                    # Verify result (pre-serialized JSON body)
+                    assert result.media_type == "application/json"
+                    clinics = json.loads(result.body)
+                    assert len(clinics) == 1
+                    assert clinics[0]["bplc_nm"] == "테스트 동물병원"
+                    assert clinics[0]["mgt_no"] == "1234567890"
+    
+    @pytest.mark.asyncio
+    async def test_load_pet_clinics_maps_seoul_error_codes(self, mock_db_session):
+        """Seoul RESULT codes are mapped to the documented HTTP statuses."""
+        registry = ClientRegistry()
+        shared_client = registry.get("http://openapi.seoul.go.kr:8088")
+        shared_client._client = httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, json={"RESULT": {"CODE": "INFO-100", "MESSAGE": "인증키가 유효하지 않습니다."}})))
+        
+        with patch("app.api.v1.endpoints.pet_clinic.client_registry", registry):
+            with pytest.raises(HTTPException) as exc_info:
+                await load_pet_clinics(start=1, end=1, db=mock_db_session)
+        
+        assert exc_info.value.status_code == 401
+        mock_db_session.execute.assert_not_called()
     
     @pytest.mark.asyncio
     async def test_api_client_with_real_endpoint(self):
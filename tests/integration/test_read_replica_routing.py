@@ -0,0 +1,64 @@
+"""
+Integration tests for primary/replica session routing (SQLite stand-ins)
+"""
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from unittest.mock import patch
+
+from app.db import session as db_session
+from app.main import app
+from app.models.users import Base, User
+
+
+@pytest_asyncio.fixture
+async def primary_and_replica(tmp_path):
+    """Two independent SQLite databases playing primary and replica."""
+    engines = []
+    factories = []
+    for name in ("primary", "replica"):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/{name}.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        engines.append(engine)
+        factories.append(sessionmaker(engine, class_=AsyncSession, expire_on_commit=False))
+    
+    yield factories
+    
+    for engine in engines:
+        await engine.dispose()
+
+
+class TestReadReplicaRouting:
+    """Writes go to the primary, GET lookups go to the replica."""
+    
+    @pytest.mark.asyncio
+    async def test_user_routes(self, primary_and_replica):
+        primary, replica = primary_and_replica
+        async with replica() as db:
+            db.add(User(id=1, username="replica-only", email="replica@example.com"))
+            await db.commit()
+        
+        with patch.object(db_session, "async_session", primary), \
+             patch.object(db_session, "async_read_session", replica):
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                created = await client.post("/api/v1/users/", json={"username": "primary-user", "email": "p@example.com"})
+                assert created.status_code == 200
+                
+                # The replica has not "replicated" the new user yet, so the read must come from it
+                read = await client.get("/api/v1/users/1")
+                assert read.status_code == 200
+                assert read.json()["username"] == "replica-only"
+        
+        async with primary() as db:
+            assert await db.get(User, 1) is not None
+            assert (await db.get(User, 1)).username == "primary-user"
+    
+    @pytest.mark.asyncio
+    async def test_read_falls_back_to_primary(self):
+        """Without POSTGRES_READ_HOST the read session factory is the primary one."""
+        assert db_session.read_engine is None
+        assert db_session.async_read_session is db_session.async_session
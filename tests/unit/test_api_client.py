@@ -4,8 +4,9 @@ Unit tests for API Client
 
 import pytest
 import httpx
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from app.api.common.client import APIClient
+from app.api.common.registry import ClientRegistry
 from app.api.common.exceptions import APIError, ClientError, ConnectionError, TimeoutError
 
 
@@ -57,9 +58,9 @@ class TestAPIClient:
     async def test_get_request_success(self, mock_api_client, sample_api_response):
         """Test successful GET request."""
         # Mock the response
-        mock_response = AsyncMock()
+        mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json = AsyncMock(return_value=sample_api_response)
+        mock_response.json = MagicMock(return_value=sample_api_response)
         mock_response.content = b'{"status": "success"}'
         
         mock_api_client._client.request = AsyncMock(return_value=mock_response)
@@ -80,9 +81,9 @@ class TestAPIClient:
     async def test_post_request_success(self, mock_api_client, sample_api_response):
         """Test successful POST request."""
         # Mock the response
-        mock_response = AsyncMock()
+        mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.json = AsyncMock(return_value=sample_api_response)
+        mock_response.json = MagicMock(return_value=sample_api_response)
         mock_response.content = b'{"status": "success"}'
         
         mock_api_client._client.request = AsyncMock(return_value=mock_response)
@@ -187,4 +188,49 @@ class TestAPIClient:
             
             # Verify method was called
             call_args = mock_api_client._client.request.call_args
-            assert call_args[1]["method"].upper() == method.upper() 
\ No newline at end of file
+            assert call_args[1]["method"].upper() == method.upper()
+    
+    @pytest.mark.asyncio
+    async def test_limits_and_http2_passed_to_httpx(self):
+        """Connection limits are applied to the underlying httpx client."""
+        limits = httpx.Limits(max_connections=7, max_keepalive_connections=3, keepalive_expiry=12)
+        client = APIClient("http://test.api.com", limits=limits)
+        
+        with patch("httpx.AsyncClient") as mock_client_class:
+            await client._ensure_client()
+        
+        assert mock_client_class.call_args[1]["limits"] is limits
+        assert "http2" not in mock_client_class.call_args[1]
+    
+    def test_http2_without_h2_falls_back(self):
+        """HTTP/2 is disabled with a warning when h2 is not installed."""
+        with patch("importlib.util.find_spec", return_value=None):
+            client = APIClient("http://test.api.com", http2=True)
+        assert client.http2 is False
+
+
+class TestClientRegistry:
+    """Test cases for the shared client registry."""
+    
+    def test_same_client_per_base_url(self):
+        """Clients are shared per base URL regardless of trailing slash."""
+        registry = ClientRegistry(timeout=5)
+        first = registry.get("http://test.api.com/")
+        
+        assert registry.get("http://test.api.com") is first
+        assert registry.get("http://other.api.com") is not first
+        assert first.timeout == 5
+        assert "http://test.api.com" in registry
+        assert len(registry) == 2
+    
+    @pytest.mark.asyncio
+    async def test_close_all(self):
+        """close_all closes every client and empties the registry."""
+        registry = ClientRegistry()
+        client = registry.get("http://test.api.com")
+        await client._ensure_client()
+        
+        await registry.close_all()
+        
+        assert client._client is None
+        assert len(registry) == 0
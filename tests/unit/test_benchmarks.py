@@ -0,0 +1,64 @@
+"""
+Smoke tests for the offline benchmark suite
+"""
+
+import json
+
+import pytest
+
+from app.db import crud
+from app.services.pet_clinic_loader import map_clinic_rows
+from benchmarks import run
+from benchmarks.database import benchmark_database
+from benchmarks.fake_seoul import make_row
+from benchmarks.harness import ScenarioResult
+
+
+class TestScenarioResult:
+    """Test cases for latency statistics."""
+
+    def test_percentiles_and_rps(self):
+        result = ScenarioResult("x", concurrency=2, latencies=[i / 1000 for i in range(1, 101)],
+                                errors=2, duration=2.0)
+
+        summary = result.to_dict()
+
+        assert summary["requests"] == 102
+        assert summary["rps"] == 51.0
+        assert summary["p50_ms"] == pytest.approx(50.5)
+        assert summary["p99_ms"] == pytest.approx(99.01)
+        assert summary["max_ms"] == pytest.approx(100.0)
+
+
+class TestBenchmarkSuite:
+    """End-to-end runs against the SQLite stand-in and the fake Seoul API."""
+
+    @pytest.mark.asyncio
+    async def test_sqlite_upsert_counts(self, tmp_path):
+        rows = map_clinic_rows([make_row(i) for i in range(5)])
+
+        async with benchmark_database(f"sqlite+aiosqlite:///{tmp_path}/bench.db") as factory:
+            async with factory() as db:
+                first = await crud.upsert_pet_clinics(db, rows[:3])
+                second = await crud.upsert_pet_clinics(db, rows)
+                await db.commit()
+
+        assert (first.inserted, first.updated) == (3, 0)
+        assert (second.inserted, second.updated) == (2, 3)
+
+    def test_run_writes_report(self, tmp_path):
+        output = tmp_path / "result.json"
+
+        exit_code = run.main([
+            "--database-url", f"sqlite+aiosqlite:///{tmp_path}/bench.db", "--output", str(output),
+            "--requests", "5", "--concurrency", "2", "--warmup", "1", "--rows", "20",
+            "--load-requests", "2", "--sync-rows", "30", "--sync-requests", "1",
+        ])
+
+        report = json.loads(output.read_text())
+        names = [scenario["name"] for scenario in report["scenarios"]]
+        assert exit_code == 0
+        assert names == ["health", "users_create", "users_read", "load_pet_clinics[rows=20]",
+                         "sync_all[rows=30]", "clinics_list", "clinics_nearby"]
+        assert all(scenario["errors"] == 0 and "p95_ms" in scenario for scenario in report["scenarios"])
+        assert report["meta"]["database"] == "sqlite+aiosqlite"
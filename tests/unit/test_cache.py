@@ -0,0 +1,191 @@
+"""
+Unit tests for the response cache layer
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core.cache import MemoryLRUCache, NullCache, ResponseCache, cache_ttl, create_cache_backend
+from app.core.config import Settings
+from app.models.pet_clinic import PetClinic
+
+
+class TestMemoryLRUCache:
+    """Test cases for the in-process LRU cache."""
+    
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self, fake_clock):
+        cache = MemoryLRUCache(clock=fake_clock)
+        await cache.set("a", {"v": 1}, ttl=10)
+        
+        fake_clock.now = 9.9
+        assert await cache.get("a") == {"v": 1}
+        fake_clock.now = 10.0
+        assert await cache.get("a") is None
+    
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        """The least recently used entry is evicted first."""
+        cache = MemoryLRUCache(max_entries=2)
+        await cache.set("a", 1)
+        await cache.set("b", 2)
+        await cache.get("a")
+        await cache.set("c", 3)
+        
+        assert await cache.get("a") == 1
+        assert await cache.get("b") is None
+        assert await cache.get("c") == 3
+    
+    @pytest.mark.asyncio
+    async def test_counters_survive_eviction(self):
+        """Version counters are never evicted by LRU pressure."""
+        cache = MemoryLRUCache(max_entries=1)
+        assert await cache.incr("ns:version") == 1
+        await cache.set("a", 1)
+        await cache.set("b", 2)
+        assert await cache.get("ns:version") == 1
+
+
+class TestResponseCache:
+    """Test cases for the versioned response cache."""
+    
+    def test_normalize_ignores_order_and_none(self):
+        assert ResponseCache.normalize({"b": 1, "a": None, "c": "x"}) == ResponseCache.normalize({"c": "x", "b": 1})
+    
+    @pytest.mark.asyncio
+    async def test_get_or_set_and_invalidate(self):
+        """Loader runs once per params until the namespace version is bumped."""
+        cache = ResponseCache("test", MemoryLRUCache())
+        loader = AsyncMock(return_value={"items": []})
+        
+        await cache.get_or_set({"limit": 50, "after": None}, loader)
+        await cache.get_or_set({"after": None, "limit": 50}, loader)
+        assert loader.await_count == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+        
+        await cache.get_or_set({"limit": 10}, loader)
+        assert loader.await_count == 2
+        
+        await cache.invalidate()
+        await cache.get_or_set({"limit": 50}, loader)
+        assert loader.await_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_replica_reads_not_cached_right_after_invalidation(self, fake_clock):
+        """A lagging replica's old page is not stored under the new version during the lag window."""
+        cache = ResponseCache("test", MemoryLRUCache(clock=fake_clock), replica_lag=5)
+        loader = AsyncMock(return_value={"items": []})
+        
+        await cache.invalidate()
+        await cache.get_or_set({"limit": 50}, loader, replica=True)
+        await cache.get_or_set({"limit": 50}, loader, replica=True)
+        assert loader.await_count == 2
+        
+        # Primary reads are current and cached right away
+        await cache.get_or_set({"limit": 10}, loader)
+        await cache.get_or_set({"limit": 10}, loader)
+        assert loader.await_count == 3
+        
+        fake_clock.now += 5
+        await cache.get_or_set({"limit": 50}, loader, replica=True)
+        await cache.get_or_set({"limit": 50}, loader, replica=True)
+        assert loader.await_count == 4
+    
+    def test_replica_session_detection(self):
+        from app.db import session as db_session
+        
+        replica_engine = object()
+        with patch.object(db_session, "read_engine", replica_engine):
+            assert db_session.is_replica_session(MagicMock(bind=replica_engine))
+            assert not db_session.is_replica_session(MagicMock(bind=db_session.engine))
+        assert not db_session.is_replica_session(MagicMock(bind=None))
+    
+    @pytest.mark.asyncio
+    async def test_null_cache_always_loads(self):
+        cache = ResponseCache("test", NullCache())
+        loader = AsyncMock(return_value=[])
+        await cache.get_or_set({}, loader)
+        await cache.get_or_set({}, loader)
+        assert loader.await_count == 2
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("failing", ["get", "set"])
+    async def test_backend_errors_fall_back_to_loader(self, failing):
+        """A cache outage degrades to uncached responses instead of failing the request."""
+        backend = MemoryLRUCache()
+        setattr(backend, failing, AsyncMock(side_effect=ConnectionError("redis down")))
+        cache = ResponseCache("test", backend)
+        loader = AsyncMock(return_value={"items": [1]})
+        
+        assert await cache.get_or_set({"limit": 50}, loader) == {"items": [1]}
+        assert await cache.get_or_set({"limit": 50}, loader) == {"items": [1]}
+        assert loader.await_count == 2
+        assert cache.errors == 2
+    
+    @pytest.mark.asyncio
+    async def test_loader_errors_still_raise(self):
+        cache = ResponseCache("test", MemoryLRUCache())
+        
+        with pytest.raises(ValueError):
+            await cache.get_or_set({}, AsyncMock(side_effect=ValueError("db error")))
+        assert cache.errors == 0
+    
+    @pytest.mark.asyncio
+    async def test_invalidate_survives_backend_errors(self):
+        """A cache outage during invalidation is logged, not raised."""
+        backend = MemoryLRUCache()
+        backend.incr = AsyncMock(side_effect=ConnectionError("redis down"))
+        cache = ResponseCache("test", backend)
+        
+        assert await cache.invalidate() is None
+        assert cache.errors == 1
+    
+    def test_backend_selection(self):
+        assert isinstance(create_cache_backend(Settings(CACHE_BACKEND="memory")), MemoryLRUCache)
+        assert isinstance(create_cache_backend(Settings(CACHE_BACKEND="none")), NullCache)
+    
+    def test_memory_ttl_bounds_cross_worker_staleness(self):
+        """Per-process caches are not invalidated by other workers, so their TTL is capped."""
+        settings = Settings(CACHE_TTL=600, CACHE_MEMORY_TTL=30)
+        
+        assert cache_ttl(MemoryLRUCache(), settings) == 30
+        assert cache_ttl(NullCache(), settings) == 600
+
+
+class TestClinicCacheInvalidation:
+    """Clinic reads are cached until an ingestion commits."""
+    
+    @pytest.mark.asyncio
+    async def test_listing_cached_until_ingestion(self, mock_db_session):
+        from app.api.v1.endpoints import pet_clinic
+        from app.services import pet_clinic_loader
+        
+        cache = ResponseCache("pet_clinic", MemoryLRUCache())
+        mock_db_session.execute.return_value.scalars.return_value.all.return_value = [
+            PetClinic(mgt_no="M1", opnsfteamcode="3220000")
+        ]
+        
+        with patch.object(pet_clinic, "clinic_cache", cache), patch.object(pet_clinic_loader, "clinic_cache", cache):
+            first = await pet_clinic.list_clinics(status="open", limit=10, db=mock_db_session)
+            second = await pet_clinic.list_clinics(status="open", limit=10, db=mock_db_session)
+            assert mock_db_session.execute.await_count == 1
+            assert first.body == second.body
+            
+            await pet_clinic_loader.after_ingestion(mock_db_session)
+            await pet_clinic.list_clinics(status="open", limit=10, db=mock_db_session)
+            assert mock_db_session.execute.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_ingestion_continues_when_cache_is_down(self, mock_db_session):
+        """A committed load still refreshes the spatial index when invalidation fails."""
+        from app.services import pet_clinic_loader
+        
+        backend = MemoryLRUCache()
+        backend.incr = AsyncMock(side_effect=ConnectionError("redis down"))
+        index = AsyncMock(ready=True)
+        
+        with patch.object(pet_clinic_loader, "clinic_cache", ResponseCache("pet_clinic", backend)), \
+             patch.object(pet_clinic_loader, "clinic_index", index):
+            await pet_clinic_loader.after_ingestion(mock_db_session)
+        
+        index.refresh.assert_awaited_once_with(mock_db_session)
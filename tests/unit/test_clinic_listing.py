@@ -0,0 +1,82 @@
+"""
+Unit tests for the keyset-paginated clinic listing
+"""
+
+import json
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from app.api.v1.endpoints import pet_clinic
+from app.db.crud import list_pet_clinics
+from app.models.pet_clinic import PetClinic
+
+
+def compiled_sql(db) -> str:
+    stmt = db.execute.call_args[0][0]
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+class TestListPetClinics:
+    """Test cases for the clinic listing query."""
+    
+    @pytest.mark.asyncio
+    async def test_keyset_instead_of_offset(self, mock_db_session):
+        """Pages continue from the last mgt_no without OFFSET."""
+        await list_pet_clinics(mock_db_session, after="3220000-104-2020-00001", limit=51)
+        
+        sql = compiled_sql(mock_db_session)
+        assert "seoul_pet_clinics.mgt_no > '3220000-104-2020-00001'" in sql
+        assert "ORDER BY seoul_pet_clinics.mgt_no" in sql
+        assert "LIMIT 51" in sql
+        assert "OFFSET" not in sql
+    
+    @pytest.mark.asyncio
+    async def test_filters(self, mock_db_session):
+        """Status, district and escaped name prefix filters are applied."""
+        await list_pet_clinics(mock_db_session, status="closed", district_code="3220000", name_prefix="100%_")
+        
+        sql = compiled_sql(mock_db_session)
+        assert "seoul_pet_clinics.trd_state_gbn != '01'" in sql
+        assert "seoul_pet_clinics.opnsfteamcode = '3220000'" in sql
+        assert "seoul_pet_clinics.bplc_nm LIKE " in sql and "ESCAPE" in sql
+        params = mock_db_session.execute.call_args[0][0].compile(dialect=postgresql.dialect()).params
+        assert "100\\%\\_%" in params.values()
+    
+    def test_supporting_indexes_declared(self):
+        """Filter + keyset and prefix indexes are part of the model."""
+        ddl = {index.name: str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+               for index in PetClinic.__table__.indexes}
+        
+        assert "(trd_state_gbn, mgt_no)" in ddl["ix_seoul_pet_clinics_trd_state_gbn_mgt_no"]
+        assert "(opnsfteamcode, mgt_no)" in ddl["ix_seoul_pet_clinics_opnsfteamcode_mgt_no"]
+        assert "bplc_nm text_pattern_ops" in ddl["ix_seoul_pet_clinics_bplc_nm_prefix"]
+
+
+class TestListClinicsEndpoint:
+    """Test cases for GET /pet-clinic/clinics."""
+    
+    @pytest.mark.asyncio
+    async def test_next_cursor(self, mock_db_session):
+        """next_cursor is the last returned mgt_no only when more rows exist."""
+        clinics = [PetClinic(mgt_no=f"M{i}", opnsfteamcode="3220000") for i in range(3)]
+        mock_db_session.execute.return_value.scalars.return_value.all.return_value = clinics
+        
+        response = await pet_clinic.list_clinics(district="강남구", limit=2, db=mock_db_session)
+        page = json.loads(response.body)
+        
+        assert [c["mgt_no"] for c in page["items"]] == ["M0", "M1"]
+        assert page["next_cursor"] == "M1"
+        assert "seoul_pet_clinics.opnsfteamcode = '3220000'" in compiled_sql(mock_db_session)
+        
+        mock_db_session.execute.return_value.scalars.return_value.all.return_value = clinics[2:]
+        last = await pet_clinic.list_clinics(after="M1", limit=2, db=mock_db_session)
+        assert json.loads(last.body)["next_cursor"] is None
+    
+    @pytest.mark.asyncio
+    async def test_unknown_district(self, mock_db_session):
+        with pytest.raises(HTTPException) as exc_info:
+            await pet_clinic.list_clinics(district="해운대구", db=mock_db_session)
+        assert exc_info.value.status_code == 400
@@ -0,0 +1,170 @@
+"""
+Unit tests for GET request coalescing and the conditional response cache
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from app.api.common.coalescing import HTTPResponseCache, SingleFlight
+from app.api.common.exceptions import APIError
+from app.services import pet_clinic_loader
+
+
+class TestSingleFlight:
+    """Test cases for SingleFlight."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"value": len(calls)}
+
+        results = await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+
+        assert calls == [1]
+        assert all(result is results[0] for result in results)
+        assert (flight.started, flight.coalesced, len(flight)) == (1, 4, 0)
+
+        await flight.do("k", work)  # finished calls are not reused
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_shared_and_cancelled_caller_isolated(self):
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def fail():
+            await release.wait()
+            raise APIError("boom")
+
+        first = asyncio.create_task(flight.do("k", fail))
+        second = asyncio.create_task(flight.do("k", fail))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+
+        with pytest.raises(APIError):
+            await second
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+
+class TestCoalescedGet:
+    """Test cases for APIClient.get with coalescing enabled."""
+
+    @pytest.mark.asyncio
+    async def test_identical_gets_share_one_request(self, make_client):
+        requests = []
+
+        async def handler(request):
+            requests.append(str(request.url))
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"ok": True})
+
+        client = make_client(handler, coalesce=True)
+
+        results = await asyncio.gather(
+            client.get("/data", params={"page": 1}),
+            client.get("/data", params={"page": 1}),
+            client.get("/data", params={"page": 2}),
+        )
+
+        assert results[0] is results[1]
+        assert sorted(requests) == ["http://test.api.com/data?page=1", "http://test.api.com/data?page=2"]
+        assert client.single_flight.coalesced == 1
+
+
+class TestResponseCache:
+    """Test cases for the short-TTL GET cache with revalidation."""
+
+    @pytest.mark.asyncio
+    async def test_fresh_hit_then_etag_revalidation(self, fake_clock, make_client):
+        seen = []
+
+        def handler(request):
+            seen.append(dict(request.headers))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json={"rows": [1, 2]}, headers={"ETag": '"v1"'})
+
+        client = make_client(handler, cache_ttl=30)
+        client.response_cache._clock = fake_clock
+
+        first = await client.get("/data")
+        assert await client.get("/data") is first
+        assert len(seen) == 1
+
+        fake_clock.now = 31
+        assert await client.get("/data") is first
+        assert len(seen) == 2
+        assert seen[1]["if-none-match"] == '"v1"'
+        assert client.response_cache.revalidated == 1
+        assert client.response_cache.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_last_modified_and_changed_content(self, fake_clock, make_client):
+        versions = iter([
+            httpx.Response(200, json={"v": 1}, headers={"Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"}),
+            httpx.Response(200, json={"v": 2}),
+        ])
+        seen = []
+
+        def handler(request):
+            seen.append(request.headers.get("If-Modified-Since"))
+            return next(versions)
+
+        client = make_client(handler, cache_ttl=5)
+        client.response_cache._clock = fake_clock
+
+        assert await client.get("/data") == {"v": 1}
+        fake_clock.now = 10
+        assert await client.get("/data") == {"v": 2}
+        assert seen == [None, "Wed, 01 Jan 2025 00:00:00 GMT"]
+
+    def test_cache_is_bounded(self, fake_clock):
+        cache = HTTPResponseCache(ttl=10, max_entries=2, clock=fake_clock)
+        for key in "abc":
+            cache.store(key, key)
+
+        assert len(cache) == 2
+        assert cache.lookup("a") == (None, None)
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self, make_client):
+        calls = []
+        client = make_client(lambda request: calls.append(1) or httpx.Response(200, json={}))
+
+        await client.get("/data")
+        await client.get("/data")
+
+        assert client.single_flight is None and client.response_cache is None
+        assert len(calls) == 2
+
+
+class TestCoalescedFetchPage:
+    """Test cases for coalescing in the Seoul page loader."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_pages_fetched_once(self, make_seoul_clinic_row, make_client):
+        rows = [make_seoul_clinic_row("M1")]
+        calls = []
+
+        async def handler(request):
+            calls.append(request.url.path)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={pet_clinic_loader.SERVICE_NAME: {"list_total_count": 1, "row": rows}})
+
+        client = make_client(handler)
+
+        with patch.object(pet_clinic_loader.get_settings(), "HTTP_COALESCE_GETS", True):
+            results = await asyncio.gather(*(pet_clinic_loader.fetch_page(client, "key", 1, 1) for _ in range(3)))
+
+        assert len(calls) == 1
+        assert all(result == (rows, 1) for result in results)
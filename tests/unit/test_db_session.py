@@ -0,0 +1,60 @@
+"""
+Unit tests for database engine/pool configuration
+"""
+
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import Settings
+from app.db.session import TimedAsyncQueuePool, build_engine_kwargs, pool_stats
+
+
+class TestEngineConfig:
+    """Test cases for Settings-driven engine options."""
+    
+    def test_pool_settings_forwarded(self):
+        settings = Settings(DB_POOL_SIZE=7, DB_MAX_OVERFLOW=3, DB_POOL_TIMEOUT=2, DB_POOL_RECYCLE=60,
+                            DB_ECHO=False, DB_STATEMENT_CACHE_SIZE=0)
+        kwargs = build_engine_kwargs("postgresql+asyncpg://u:p@localhost/db", settings)
+        
+        assert kwargs["poolclass"] is TimedAsyncQueuePool
+        assert (kwargs["pool_size"], kwargs["max_overflow"], kwargs["pool_timeout"]) == (7, 3, 2)
+        assert kwargs["pool_recycle"] == 60
+        assert kwargs["echo"] is False
+        assert kwargs["connect_args"] == {"prepared_statement_cache_size": 0}
+    
+    def test_statement_echo_off_by_default(self):
+        assert Settings().DB_ECHO is False
+    
+    def test_asyncpg_only_connect_args(self):
+        assert "connect_args" not in build_engine_kwargs("sqlite+aiosqlite:///:memory:", Settings())
+
+
+class TestPoolStats:
+    """Test cases for pool diagnostics."""
+    
+    @pytest.mark.asyncio
+    async def test_checkout_and_timeout_stats(self, tmp_path):
+        """Checked-out connections, overflow, waits and timeouts are reported."""
+        settings = Settings(DB_POOL_SIZE=1, DB_MAX_OVERFLOW=0, DB_POOL_TIMEOUT=0.1, DB_POOL_PRE_PING=False)
+        url = f"sqlite+aiosqlite:///{tmp_path}/pool.db"
+        engine = create_async_engine(url, **build_engine_kwargs(url, settings))
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                stats = pool_stats(engine)
+                assert stats["checked_out"] == 1
+                assert stats["pool_size"] == 1
+                
+                with pytest.raises(exc.TimeoutError):
+                    async with engine.connect() as other:
+                        await other.execute(text("SELECT 1"))
+            
+            stats = pool_stats(engine)
+            assert stats["checked_out"] == 0
+            assert stats["checkouts"] == 2
+            assert stats["timeouts"] == 1
+            assert stats["wait_max_ms"] >= 100
+        finally:
+            await engine.dispose()
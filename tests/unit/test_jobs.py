@@ -0,0 +1,286 @@
+"""
+Unit tests for the background ingestion job runner
+"""
+
+import asyncio
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from unittest.mock import AsyncMock, patch
+
+from app.models.sync_job import SyncJobRecord
+from app.services.jobs import DatabaseJobStore, JobRunner, JobStatus
+
+
+class TestJobRunner:
+    """Test cases for JobRunner."""
+    
+    @pytest.mark.asyncio
+    async def test_job_runs_and_reports_progress(self):
+        """Jobs run in the background and expose live SyncStats progress."""
+        runner = JobRunner()
+        release = asyncio.Event()
+        
+        async def work(stats):
+            stats.pages_fetched = 1
+            stats.rows_upserted = 1000
+            await release.wait()
+        
+        job, created = await runner.submit({"incremental": False}, work)
+        assert created
+        assert job.status == JobStatus.QUEUED
+        
+        await asyncio.sleep(0)
+        assert job.status == JobStatus.RUNNING
+        assert job.progress.rows_upserted == 1000
+        
+        release.set()
+        await runner.join()
+        assert job.status == JobStatus.SUCCEEDED
+        assert job.finished_at is not None
+        assert await runner.get(job.id) is job
+        await runner.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_identical_in_flight_jobs_are_deduplicated(self):
+        """Submitting the same params while a job is in flight returns that job."""
+        runner = JobRunner()
+        work = AsyncMock()
+        
+        first, created_first = await runner.submit({"incremental": True, "batch_size": None}, work)
+        second, created_second = await runner.submit({"batch_size": None, "incremental": True}, work)
+        other, created_other = await runner.submit({"incremental": False, "batch_size": None}, work)
+        
+        assert created_first and not created_second and created_other
+        assert second is first
+        assert other is not first
+        
+        await runner.join()
+        assert work.await_count == 2
+        
+        # Once finished, the same params start a fresh job
+        third, created_third = await runner.submit({"incremental": True, "batch_size": None}, work)
+        assert created_third and third is not first
+        await runner.join()
+        await runner.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self):
+        """No more than `concurrency` jobs run at the same time."""
+        runner = JobRunner(concurrency=2)
+        running = 0
+        peak = 0
+        
+        async def work(stats):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+        
+        jobs = [(await runner.submit({"n": i}, work))[0] for i in range(5)]
+        await runner.join()
+        
+        assert peak == 2
+        assert all(job.status == JobStatus.SUCCEEDED for job in jobs)
+        await runner.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_failed_job_records_error(self):
+        """Exceptions mark the job failed without killing the worker."""
+        runner = JobRunner()
+        
+        failed, _ = await runner.submit({"n": 1}, AsyncMock(side_effect=RuntimeError("upstream down")))
+        ok, _ = await runner.submit({"n": 2}, AsyncMock())
+        await runner.join()
+        
+        assert failed.status == JobStatus.FAILED
+        assert failed.error == "upstream down"
+        assert ok.status == JobStatus.SUCCEEDED
+        await runner.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_history_is_bounded(self):
+        """Only the most recent finished jobs are kept."""
+        runner = JobRunner(max_history=3)
+        for i in range(5):
+            await runner.submit({"n": i}, AsyncMock())
+        await runner.join()
+        
+        assert [job.params["n"] for job in await runner.list()] == [4, 3, 2]
+        await runner.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_shutdown_cancels_queued_jobs(self):
+        """Jobs still waiting in the queue are marked cancelled on shutdown."""
+        runner = JobRunner()
+        running, _ = await runner.submit({"n": 1}, lambda stats: asyncio.sleep(10))
+        queued, _ = await runner.submit({"n": 2}, AsyncMock())
+        await asyncio.sleep(0)
+        
+        await runner.shutdown()
+        
+        assert running.status == JobStatus.FAILED
+        assert queued.status == JobStatus.FAILED
+        assert queued.error == "cancelled"
+
+
+class TestSyncJobEndpoints:
+    """Test cases for the sync job endpoints."""
+    
+    @pytest.mark.asyncio
+    async def test_create_and_read_sync_job(self):
+        """POST returns a job id that can be polled for progress."""
+        from app.api.v1.endpoints import pet_clinic
+        
+        runner = JobRunner()
+        with patch.object(pet_clinic, "job_runner", runner), \
+             patch.object(pet_clinic, "run_pet_clinic_sync", new_callable=AsyncMock) as mock_sync:
+            created = await pet_clinic.create_sync_job(incremental=True)
+            duplicate = await pet_clinic.create_sync_job(incremental=True)
+            await runner.join()
+            polled = await pet_clinic.read_sync_job(created.id)
+        
+        assert duplicate.id == created.id
+        assert polled.status == "succeeded"
+        assert mock_sync.await_args.kwargs["incremental"] is True
+        await runner.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_defaults_share_one_job(self):
+        """Omitting a parameter and passing its default value are the same job."""
+        from app.api.v1.endpoints import pet_clinic
+        
+        settings = pet_clinic.settings
+        runner = JobRunner()
+        with patch.object(pet_clinic, "job_runner", runner), \
+             patch.object(pet_clinic, "run_pet_clinic_sync", new_callable=AsyncMock) as mock_sync:
+            implicit = await pet_clinic.create_sync_job()
+            explicit = await pet_clinic.create_sync_job(concurrency=settings.PET_CLINIC_SYNC_CONCURRENCY,
+                                                        batch_size=settings.PET_CLINIC_UPSERT_BATCH_SIZE)
+            other = await pet_clinic.create_sync_job(concurrency=settings.PET_CLINIC_SYNC_CONCURRENCY + 1)
+            await runner.join()
+        
+        assert explicit.id == implicit.id
+        assert other.id != implicit.id
+        assert mock_sync.await_count == 2
+        await runner.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_sync_is_started_by_post_only(self):
+        """Syncs are queued with POST /sync-jobs; the old GET alias with side effects is gone."""
+        from app.api.v1.endpoints import pet_clinic
+        from app.main import app
+        
+        runner = JobRunner()
+        with patch.object(pet_clinic, "job_runner", runner), \
+             patch.object(pet_clinic, "run_pet_clinic_sync", new_callable=AsyncMock) as mock_sync:
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                legacy = await client.get("/api/v1/pet-clinic/load-pet-clinics/all")
+                response = await client.post("/api/v1/pet-clinic/sync-jobs", params={"incremental": True})
+                await runner.join()
+                polled = await client.get(f"/api/v1/pet-clinic/sync-jobs/{response.json()['id']}")
+        
+        assert legacy.status_code == 404
+        assert response.status_code == 202
+        assert response.json()["params"]["incremental"] is True
+        assert polled.json()["status"] == "succeeded"
+        mock_sync.assert_awaited_once()
+        await runner.shutdown()
+
+
+class TestDatabaseJobStore:
+    """Test cases for job records shared between uvicorn workers through the sync_jobs table."""
+    
+    @pytest.mark.asyncio
+    async def test_job_is_visible_from_other_worker(self, tmp_path):
+        """A job submitted on one worker can be polled on another, including progress and the final state."""
+        first, second = workers = _workers(await _session_factory(tmp_path))
+        release = asyncio.Event()
+        
+        async def work(stats):
+            stats.rows_upserted = 1000
+            await release.wait()
+        
+        job, _ = await first.submit({"incremental": False}, work)
+        polled = await asyncio.wait_for(_poll(second, job.id, lambda j: j.progress.rows_upserted == 1000), 5)
+        assert polled.status == "running"
+        
+        release.set()
+        await first.join()
+        polled = await second.get(job.id)
+        assert polled.status == "succeeded"
+        assert polled.finished_at is not None
+        assert [j.id for j in await second.list()] == [job.id]
+        for runner in workers:
+            await runner.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_identical_jobs_are_deduplicated_across_workers(self, tmp_path):
+        """The same params submitted on two workers run once."""
+        first, second = workers = _workers(await _session_factory(tmp_path))
+        release = asyncio.Event()
+        runs = []
+        
+        async def work(stats):
+            runs.append(stats)
+            await release.wait()
+        
+        job, created = await first.submit({"incremental": True}, work)
+        duplicate, created_duplicate = await second.submit({"incremental": True}, work)
+        
+        assert created and not created_duplicate
+        assert duplicate.id == job.id
+        
+        release.set()
+        await first.join()
+        await second.join()
+        assert len(runs) == 1
+        
+        # Once finished, either worker starts a fresh job
+        fresh, created_fresh = await second.submit({"incremental": True}, AsyncMock())
+        assert created_fresh and fresh.id != job.id
+        await second.join()
+        for runner in workers:
+            await runner.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_job_of_dead_worker_does_not_block_new_jobs(self, tmp_path):
+        """A job whose worker stopped heartbeating is failed so the same params can run again."""
+        store = DatabaseJobStore(await _session_factory(tmp_path), stale_after=0)
+        dead = JobRunner(store=store, heartbeat=3600)
+        stuck, _ = await dead.submit({"incremental": True}, lambda stats: asyncio.Event().wait())
+        await asyncio.sleep(0)
+        
+        alive = JobRunner(store=store)
+        job, created = await alive.submit({"incremental": True}, AsyncMock())
+        await alive.join()
+        
+        assert created and job.id != stuck.id
+        lost = await alive.get(stuck.id)
+        assert lost.status == "failed" and lost.error == "worker lost"
+        assert (await alive.get(job.id)).status == "succeeded"
+        await alive.shutdown()
+        await dead.shutdown()
+
+
+async def _session_factory(path):
+    """sync_jobs on a SQLite file that every session (worker) connects to separately"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path / 'jobs.db'}", connect_args={"timeout": 30})
+    async with engine.begin() as conn:
+        await conn.run_sync(SyncJobRecord.metadata.create_all)
+    return sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+def _workers(session_factory):
+    """Two runners standing in for two worker processes that share one database."""
+    return [JobRunner(store=DatabaseJobStore(session_factory), heartbeat=0.01) for _ in range(2)]
+
+
+async def _poll(runner, job_id, condition):
+    while True:
+        job = await runner.get(job_id)
+        if condition(job):
+            return job
+        await asyncio.sleep(0.01)
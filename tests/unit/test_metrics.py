@@ -0,0 +1,150 @@
+"""
+Unit tests for the Prometheus metrics registry and /metrics endpoint
+"""
+
+import asyncio
+import json
+import os
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from unittest.mock import patch
+
+from app.core import metrics
+from app.core.metrics import MetricsRegistry
+from app.main import app
+
+DEAD_PID = 2 ** 22 + 1  # above Linux pid_max, never alive
+
+
+def sample_lines(text: str, name: str) -> list:
+    return [line for line in text.splitlines() if line.startswith(name)]
+
+
+class TestMetricsRegistry:
+    """Test cases for MetricsRegistry in single- and multi-process mode."""
+
+    def test_render_counter_and_histogram(self):
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests", ("route",))
+        latency = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+        requests.inc('/a"b')
+        requests.inc('/a"b', amount=2)
+        for value in (0.05, 0.1, 0.5, 3.0):
+            latency.observe(value, "/x")
+
+        text = registry.render()
+
+        assert "# TYPE requests_total counter" in text
+        assert 'requests_total{route="/a\\"b"} 3.0' in text
+        assert sample_lines(text, "latency_seconds") == [
+            'latency_seconds_bucket{route="/x",le="0.1"} 2.0',
+            'latency_seconds_bucket{route="/x",le="1.0"} 3.0',
+            'latency_seconds_bucket{route="/x",le="+Inf"} 4.0',
+            'latency_seconds_sum{route="/x"} 3.65',
+            'latency_seconds_count{route="/x"} 4.0',
+        ]
+
+    def test_collectors_run_before_snapshot(self):
+        registry = MetricsRegistry()
+        gauge = registry.gauge("pool_in_use", "In use")
+        registry.add_collector(lambda: gauge.set(7))
+
+        assert "pool_in_use 7.0" in registry.render()
+
+    def test_duplicate_name_rejected(self):
+        registry = MetricsRegistry()
+        registry.counter("x_total", "x")
+        with pytest.raises(ValueError):
+            registry.gauge("x_total", "x")
+
+    def test_multiprocess_aggregation(self, tmp_path):
+        registry = MetricsRegistry(str(tmp_path))
+        requests = registry.counter("requests_total", "Requests", ("route",))
+        in_use = registry.gauge("in_use", "In use")
+        latency = registry.histogram("latency_seconds", "Latency", buckets=(1.0,))
+        requests.inc("/a")
+        in_use.set(2)
+        latency.observe(0.5)
+
+        # 다른 worker (살아있는 부모 프로세스) 와 이미 종료된 worker 의 스냅샷
+        for pid in (os.getppid(), DEAD_PID):
+            (tmp_path / f"{pid}.json").write_text(json.dumps({"metrics": {
+                "requests_total": [[["/a"], 10.0], [["/b"], 1.0]],
+                "in_use": [[[], 3.0]],
+                "latency_seconds": [[[], [0.0, 1.0, 2.0, 1.0]]],
+            }}))
+        (tmp_path / "garbage.json").write_text("{")
+
+        text = registry.render()
+
+        assert 'requests_total{route="/a"} 21.0' in text
+        assert 'requests_total{route="/b"} 2.0' in text
+        assert "in_use 5.0" in text  # dead worker's gauge dropped
+        assert 'latency_seconds_bucket{le="+Inf"} 3.0' in text
+        assert "latency_seconds_sum 4.5" in text
+        assert (tmp_path / f"{os.getpid()}.json").exists()
+
+    @pytest.mark.asyncio
+    async def test_touch_schedules_single_flush(self, tmp_path):
+        registry = MetricsRegistry(str(tmp_path), flush_interval=0.01)
+        counter = registry.counter("events_total", "Events")
+        counter.inc()
+        registry.touch()
+        registry.touch()
+        path = tmp_path / f"{os.getpid()}.json"
+        assert not path.exists()
+
+        await asyncio.sleep(0.05)
+
+        assert json.loads(path.read_text())["metrics"]["events_total"] == [[[], 1.0]]
+        assert registry._flush_handle is None
+
+
+    @pytest.mark.asyncio
+    async def test_lifespan_shutdown_flushes_pending_values(self, tmp_path):
+        """A worker exiting before its scheduled flush still leaves its last values on disk."""
+        registry = MetricsRegistry(str(tmp_path), flush_interval=3600)
+        counter = registry.counter("events_total", "Events")
+
+        with patch("app.main.metrics_registry", registry):
+            async with app.router.lifespan_context(app):
+                counter.inc(amount=3)
+                registry.touch()
+                assert not (tmp_path / f"{os.getpid()}.json").exists()
+
+        snapshot = json.loads((tmp_path / f"{os.getpid()}.json").read_text())
+        assert snapshot["metrics"]["events_total"] == [[[], 3.0]]
+        assert registry._flush_handle is None
+
+
+class TestAppMetrics:
+    """Test cases for the app-level metrics and /metrics endpoint."""
+
+    def test_upstream_errors_by_host(self):
+        before = metrics.upstream_errors.values.get(("api.example.com",), 0.0)
+
+        metrics.observe_upstream_call("GET", "http://api.example.com/x", 200, 0.1)
+        metrics.observe_upstream_call("GET", "http://api.example.com/x", 503, 0.2)
+        metrics.observe_upstream_call("GET", "http://api.example.com/x", None, 0.3)
+
+        assert metrics.upstream_errors.values[("api.example.com",)] == before + 2
+        assert metrics.upstream_requests.values[("api.example.com", "GET", "error")] >= 1
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint(self):
+        metrics.observe_ingestion("page", 100, 0.5)
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            await client.get("/api/v1/health")
+            await client.get("/api/v1/does-not-exist")
+            response = await client.get("/api/v1/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        text = response.text
+        assert 'http_requests_total{method="GET",route="/api/v1/health",status="200"}' in text
+        assert 'http_requests_total{method="GET",route="unmatched",status="404"}' in text
+        assert 'http_request_duration_seconds_bucket{method="GET",route="/api/v1/health",le="+Inf"}' in text
+        assert 'db_pool_connections{engine="primary",state="checked_out"} 0.0' in text
+        assert 'ingest_rows_total{mode="page"}' in text
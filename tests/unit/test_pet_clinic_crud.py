@@ -0,0 +1,104 @@
+"""
+Unit tests for pet clinic bulk upsert helpers
+"""
+
+import pytest
+from unittest.mock import AsyncMock
+from sqlalchemy.dialects import postgresql
+
+from app.db.crud import build_pet_clinic_upsert, set_sync_watermark, upsert_pet_clinics, PG_MAX_BIND_PARAMS
+
+
+def make_row(mgt_no: str, name: str = "테스트 동물병원") -> dict:
+    return {"mgt_no": mgt_no, "opnsfteamcode": "3000000", "bplc_nm": name, "x": 1.0, "y": 2.0}
+
+
+class TestPetClinicUpsert:
+    """Test cases for the multi-row pet clinic upsert."""
+    
+    def test_build_upsert_is_single_multi_row_statement(self):
+        """All rows of a batch go into one INSERT ... ON CONFLICT statement."""
+        stmt = build_pet_clinic_upsert([make_row("A"), make_row("B")])
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        
+        assert sql.count("INSERT INTO seoul_pet_clinics") == 1
+        assert "ON CONFLICT (mgt_no) DO UPDATE SET" in sql
+        assert "bplc_nm = excluded.bplc_nm" in sql
+        assert "mgt_no = excluded.mgt_no" not in sql
+        assert "updated_at = now()" in sql
+    
+    @pytest.mark.asyncio
+    async def test_upsert_splits_into_batches(self, mock_db_session):
+        """Rows are sent in batch_size chunks and per-batch counts are returned."""
+        db = mock_db_session
+        rows = [make_row(str(i)) for i in range(7)]
+        
+        stats = await upsert_pet_clinics(db, rows, batch_size=3)
+        
+        assert stats.batch_counts == [3, 3, 1]
+        assert stats.sent == 7
+        assert db.execute.await_count == 3
+        db.commit.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_upsert_deduplicates_mgt_no(self, mock_db_session):
+        """Duplicate mgt_no values in one load keep only the last row."""
+        db = mock_db_session
+        rows = [make_row("A", "old"), make_row("B"), make_row("A", "new")]
+        
+        stats = await upsert_pet_clinics(db, rows, batch_size=10)
+        
+        assert stats.batch_counts == [2]
+        stmt = db.execute.call_args[0][0]
+        params = stmt.compile(dialect=postgresql.dialect()).params
+        assert "new" in params.values()
+        assert "old" not in params.values()
+    
+    @pytest.mark.asyncio
+    async def test_upsert_caps_batch_size_to_bind_param_limit(self, mock_db_session):
+        """Batch size is clamped so one statement stays under the bind parameter limit."""
+        db = mock_db_session
+        rows = [make_row(str(i)) for i in range(PG_MAX_BIND_PARAMS // 5 + 1)]
+        
+        stats = await upsert_pet_clinics(db, rows, batch_size=100000)
+        
+        assert stats.batch_counts == [PG_MAX_BIND_PARAMS // 5, 1]
+    
+    @pytest.mark.asyncio
+    async def test_upsert_empty_rows(self):
+        """No statement is executed for an empty load."""
+        db = AsyncMock()
+        stats = await upsert_pet_clinics(db, [])
+        assert stats.batch_counts == []
+        db.execute.assert_not_called()
+    
+    def test_only_changed_adds_is_distinct_from_guard(self):
+        """Incremental upserts only rewrite rows whose values actually changed."""
+        plain = str(build_pet_clinic_upsert([make_row("A")]).compile(dialect=postgresql.dialect()))
+        guarded = str(build_pet_clinic_upsert([make_row("A")], only_changed=True).compile(dialect=postgresql.dialect()))
+        
+        assert "IS DISTINCT FROM" not in plain
+        assert "WHERE (seoul_pet_clinics.opnsfteamcode, seoul_pet_clinics.bplc_nm, seoul_pet_clinics.x, seoul_pet_clinics.y) " \
+               "IS DISTINCT FROM (excluded.opnsfteamcode, excluded.bplc_nm, excluded.x, excluded.y)" in guarded
+        assert "RETURNING (xmax = 0) AS inserted" in guarded
+    
+    @pytest.mark.asyncio
+    async def test_upsert_counts_inserted_updated_unchanged(self, mock_db_session):
+        """RETURNING (xmax = 0) rows are split into inserted and updated counts."""
+        db = mock_db_session
+        # 4 rows sent: 1 inserted, 2 updated, 1 skipped by the IS DISTINCT FROM guard
+        db.execute.return_value.scalars.return_value = iter([True, False, False])
+        
+        stats = await upsert_pet_clinics(db, [make_row(str(i)) for i in range(4)], only_changed=True)
+        
+        assert (stats.inserted, stats.updated, stats.unchanged) == (1, 2, 1)
+    
+    @pytest.mark.asyncio
+    async def test_set_sync_watermark_never_moves_backwards(self):
+        """The stored high-water mark is merged with GREATEST on conflict."""
+        db = AsyncMock()
+        
+        await set_sync_watermark(db, "LOCALDATA_020301", "2024-01-01 00:00:00")
+        
+        sql = str(db.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (source) DO UPDATE SET last_mod_ts = greatest(sync_watermarks.last_mod_ts, excluded.last_mod_ts)" in sql
@@ -0,0 +1,273 @@
+"""
+Unit tests for the pet clinic ingestion service
+"""
+
+import asyncio
+import json
+import pytest
+from pydantic import ValidationError
+from unittest.mock import AsyncMock, patch
+
+from app.api.common.exceptions import APIError
+from app.api.common.streaming import JSONArrayStream
+from app.db.crud import UpsertStats
+from app.models.pet_clinic import PetClinic
+from app.schemas.pet_clinic import ClinicRow
+from app.services.pet_clinic_loader import (
+    SERVICE_NAME, fetch_page, is_modified_since, map_clinic_rows, page_ranges, sync_all_pet_clinics,
+    validate_clinic_rows
+)
+
+
+class FakeSeoulAPI:
+    """Serves LOCALDATA_020301 pages from memory and records request concurrency."""
+    
+    def __init__(self, rows, delay: float = 0.01):
+        self.rows = rows
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+    
+    def stream_json(self, endpoint, item_path, params=None, headers=None):
+        return JSONArrayStream(self._body(endpoint), item_path)
+    
+    async def _body(self, endpoint):
+        _, _, _, start, end = endpoint.strip("/").split("/")
+        self.calls.append((int(start), int(end)))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        body = json.dumps({SERVICE_NAME: {
+            "list_total_count": len(self.rows),
+            "RESULT": {"CODE": "INFO-000", "MESSAGE": "정상 처리되었습니다"},
+            "row": self.rows[int(start) - 1:int(end)],
+        }}, ensure_ascii=False).encode()
+        # 여러 chunk 로 나눠 보내 스트리밍 파서를 거치게 함
+        for i in range(0, len(body), 512):
+            yield body[i:i + 512]
+
+
+class ErrorSeoulAPI:
+    """Answers every request with a RESULT error payload."""
+    
+    def __init__(self, code: str, message: str):
+        self.payload = {"RESULT": {"CODE": code, "MESSAGE": message}}
+    
+    def stream_json(self, endpoint, item_path, params=None, headers=None):
+        async def body():
+            yield json.dumps(self.payload).encode()
+        return JSONArrayStream(body(), item_path)
+
+
+class TestPageRanges:
+    """Test cases for page range splitting."""
+    
+    def test_exact_and_partial_pages(self):
+        assert page_ranges(2500, 1000) == [(1, 1000), (1001, 2000), (2001, 2500)]
+        assert page_ranges(1000, 1000) == [(1, 1000)]
+        assert page_ranges(0, 1000) == []
+    
+    def test_page_size_capped_at_api_limit(self):
+        assert page_ranges(3000, 5000) == [(1, 1000), (1001, 2000), (2001, 3000)]
+    
+    def test_offset_first_page(self):
+        assert page_ranges(25, 10, first=11) == [(11, 20), (21, 25)]
+
+
+class TestMapClinicRows:
+    """Test cases for mapping upstream rows to clinic columns."""
+    
+    def test_wgs84_coordinates_added_per_page(self, make_seoul_clinic_row):
+        """lat/lng are derived from X/Y, and rows without coordinates keep NULLs."""
+        rows = map_clinic_rows([
+            make_seoul_clinic_row("A"),
+            make_seoul_clinic_row("B", X="", Y=""),
+        ])
+        
+        assert rows[0]["x"] == pytest.approx(203091.134)
+        assert rows[0]["lat"] == pytest.approx(37.5030973, abs=1e-6)
+        assert rows[0]["lng"] == pytest.approx(127.0328574, abs=1e-6)
+        assert rows[1]["x"] is None and rows[1]["lat"] is None and rows[1]["lng"] is None
+    
+    def test_columns_cover_clinic_row_and_table(self, make_seoul_clinic_row):
+        """The table-driven mapping yields exactly the ClinicRow fields, all of which are table columns."""
+        row = map_clinic_rows([make_seoul_clinic_row("A", BPLCNM="행복동물병원")])[0]
+        
+        assert set(row) == set(ClinicRow.model_fields)
+        assert set(row) <= set(PetClinic.__table__.columns.keys())
+        assert row["mgt_no"] == "A" and row["bplc_nm"] == "행복동물병원"
+        assert all(isinstance(value, (str, float, type(None))) for value in row.values())
+    
+    def test_batch_validation(self, make_seoul_clinic_row):
+        rows = map_clinic_rows([make_seoul_clinic_row("A"), make_seoul_clinic_row("B")])
+        
+        clinics = validate_clinic_rows(rows)
+        
+        assert [clinic.mgt_no for clinic in clinics] == ["A", "B"]
+        rows[1]["mgt_no"] = None
+        with pytest.raises(ValidationError):
+            validate_clinic_rows(rows)
+
+
+class TestSyncAllPetClinics:
+    """Test cases for the concurrent full-dataset sync."""
+    
+    @pytest.mark.asyncio
+    async def test_fetch_page_error_result(self):
+        """Seoul API error payloads surface as APIError."""
+        client = ErrorSeoulAPI("INFO-200", "해당하는 데이터가 없습니다.")
+        
+        with pytest.raises(APIError) as exc_info:
+            await fetch_page(client, "key", 1, 10)
+        
+        assert "INFO-200" in str(exc_info.value)
+    
+    @pytest.mark.asyncio
+    async def test_full_sync_fetches_every_page(self, make_seoul_clinic_row, mock_db_session):
+        """All pages are fetched once and every row is upserted."""
+        api = FakeSeoulAPI([make_seoul_clinic_row(f"M{i:04d}") for i in range(95)])
+        db = mock_db_session
+        
+        stats = await sync_all_pet_clinics(db, api, "key", concurrency=3, page_size=10, batch_size=4)
+        
+        assert sorted(api.calls) == page_ranges(95, 10)
+        assert stats.total_count == 95
+        assert stats.pages_total == stats.pages_fetched == 10
+        assert stats.rows_fetched == stats.rows_upserted == 95
+        assert db.commit.await_count == 10
+        assert stats.finished_at is not None
+    
+    @pytest.mark.asyncio
+    async def test_first_page_written_in_batches_while_streaming(self, make_seoul_clinic_row, mock_db_session):
+        """The probe page is upserted batch by batch as rows are decoded."""
+        api = FakeSeoulAPI([make_seoul_clinic_row(f"M{i:04d}") for i in range(25)])
+        
+        with patch("app.services.pet_clinic_loader.upsert_pet_clinics", new_callable=AsyncMock) as mock_upsert:
+            mock_upsert.side_effect = lambda db, rows, **kwargs: UpsertStats([len(rows)])
+            stats = await sync_all_pet_clinics(mock_db_session, api, "key", page_size=25, batch_size=10)
+        
+        assert [len(call.args[1]) for call in mock_upsert.call_args_list] == [10, 10, 5]
+        assert stats.total_count == stats.rows_upserted == 25
+        assert mock_db_session.commit.await_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_full_sync_respects_concurrency(self, make_seoul_clinic_row, mock_db_session):
+        """No more than `concurrency` page requests are in flight at once."""
+        api = FakeSeoulAPI([make_seoul_clinic_row(f"M{i:04d}") for i in range(100)])
+        
+        await sync_all_pet_clinics(mock_db_session, api, "key", concurrency=2, page_size=10)
+        
+        assert api.max_in_flight == 2
+    
+    @pytest.mark.asyncio
+    async def test_full_sync_runs_pages_concurrently(self, make_seoul_clinic_row, mock_db_session):
+        """Pages after the probe overlap instead of being fetched one after another."""
+        api = FakeSeoulAPI([make_seoul_clinic_row(f"M{i:04d}") for i in range(90)], delay=0.05)
+        
+        stats = await sync_all_pet_clinics(mock_db_session, api, "key", concurrency=8, page_size=10)
+        
+        # peak in-flight fetches, not wall time, so the check holds on a loaded machine
+        assert 1 < api.max_in_flight <= 8
+        assert stats.pages_fetched == 9
+
+    @pytest.mark.asyncio
+    async def test_slow_database_bounds_buffered_pages(self, make_seoul_clinic_row, mock_db_session):
+        """Fetched pages wait for a free slot, so a slow DB cannot make pages pile up in memory."""
+        api = FakeSeoulAPI([make_seoul_clinic_row(f"M{i:04d}") for i in range(100)], delay=0)
+        committed = 0
+        backlog = []
+        
+        async def slow_commit():
+            nonlocal committed
+            # pages requested (in flight or fetched) but not yet written
+            backlog.append(len(api.calls) - committed)
+            await asyncio.sleep(0.01)
+            committed += 1
+        mock_db_session.commit.side_effect = slow_commit
+        
+        stats = await sync_all_pet_clinics(mock_db_session, api, "key", concurrency=2, page_size=10)
+        
+        assert stats.pages_fetched == 10
+        assert max(backlog) <= 2
+    
+    @pytest.mark.asyncio
+    async def test_failed_sync_waits_for_cancelled_pages(self, make_seoul_clinic_row, mock_db_session):
+        """Pages still in flight when another page fails are cancelled and awaited before the error surfaces."""
+        api = FakeSeoulAPI([make_seoul_clinic_row(f"M{i:04d}") for i in range(50)], delay=0)
+        original_body = api._body
+        stalled = []
+        
+        async def body(endpoint):
+            if endpoint.endswith("/11/20/"):
+                raise APIError("Server error: 500", status_code=500)
+            if not endpoint.endswith("/1/10/"):
+                stalled.append(endpoint)
+                try:
+                    await asyncio.sleep(10)
+                finally:
+                    stalled.remove(endpoint)
+            async for chunk in original_body(endpoint):
+                yield chunk
+        api._body = body
+        
+        with pytest.raises(APIError):
+            await sync_all_pet_clinics(mock_db_session, api, "key", concurrency=4, page_size=10)
+        
+        assert stalled == []
+    
+    @pytest.mark.asyncio
+    async def test_incremental_sync_skips_rows_before_watermark(self, make_seoul_clinic_row):
+        """Only rows modified at or after the stored watermark are written, then the watermark advances."""
+        rows = [make_seoul_clinic_row(f"M{i:04d}", LASTMODTS=f"2024-01-{i + 1:02d} 00:00:00") for i in range(20)]
+        api = FakeSeoulAPI(rows)
+        
+        with patch("app.services.pet_clinic_loader.upsert_pet_clinics", new_callable=AsyncMock) as mock_upsert, \
+             patch("app.services.pet_clinic_loader.get_sync_watermark", AsyncMock(return_value="2024-01-15 00:00:00")), \
+             patch("app.services.pet_clinic_loader.set_sync_watermark", new_callable=AsyncMock) as mock_set:
+            mock_upsert.side_effect = lambda db, rows, **kwargs: UpsertStats([len(rows)])
+            
+            stats = await sync_all_pet_clinics(AsyncMock(), api, "key", page_size=10, incremental=True)
+        
+        written = [row["mgt_no"] for call in mock_upsert.call_args_list for row in call.args[1]]
+        # M0014 was modified in the watermark's second (2024-01-15 00:00:00) and is re-sent
+        assert written == [f"M{i:04d}" for i in range(14, 20)]
+        assert all(call.kwargs["only_changed"] for call in mock_upsert.call_args_list)
+        assert stats.rows_fetched == 20
+        assert stats.rows_skipped == 14
+        assert stats.rows_upserted == 6
+        mock_set.assert_awaited_once()
+        assert mock_set.call_args.args[2] == "2024-01-20 00:00:00"
+    
+    def test_row_at_watermark_second_is_modified(self):
+        """LASTMODTS has second precision, so a row stamped with the watermark itself may be newer."""
+        watermark = "2024-01-15 10:00:00"
+        
+        assert is_modified_since({"LASTMODTS": "2024-01-15 10:00:00"}, watermark)
+        assert is_modified_since({"LASTMODTS": "2024-01-15 10:00:01"}, watermark)
+        assert not is_modified_since({"LASTMODTS": "2024-01-15 09:59:59"}, watermark)
+        assert is_modified_since({"LASTMODTS": None}, watermark)
+        assert is_modified_since({"LASTMODTS": "2024-01-01 00:00:00"}, None)
+    
+    @pytest.mark.asyncio
+    async def test_incremental_sync_keeps_watermark_on_failure(self, make_seoul_clinic_row, mock_db_session):
+        """A failed page leaves the stored watermark untouched."""
+        api = FakeSeoulAPI([make_seoul_clinic_row(f"M{i:04d}") for i in range(20)])
+        original_body = api._body
+        
+        async def flaky_body(endpoint):
+            if endpoint.endswith("/11/20/"):
+                raise APIError("Server error: 500", status_code=500)
+            async for chunk in original_body(endpoint):
+                yield chunk
+        api._body = flaky_body
+        
+        with patch("app.services.pet_clinic_loader.get_sync_watermark", AsyncMock(return_value=None)), \
+             patch("app.services.pet_clinic_loader.set_sync_watermark", new_callable=AsyncMock) as mock_set:
+            with pytest.raises(APIError):
+                await sync_all_pet_clinics(mock_db_session, api, "key", page_size=10, incremental=True)
+        
+        mock_set.assert_not_called()
@@ -0,0 +1,109 @@
+"""
+Unit tests for the client-side token bucket rate limiter
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from unittest.mock import patch
+
+from app.api.common.ratelimit import TokenBucket
+from app.api.common.registry import ClientRegistry
+
+
+@pytest.fixture
+def fake_time(fake_clock):
+    """Clock advanced by the patched asyncio.sleep, so waits take no real time."""
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(delay):
+        fake_clock.now += delay
+        await real_sleep(0)
+
+    with patch("app.api.common.ratelimit.asyncio.sleep", fake_sleep):
+        yield fake_clock
+
+
+class TestTokenBucket:
+    """Test cases for TokenBucket."""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_steady_rate(self, fake_time):
+        """A full bucket allows a burst, then requests are spaced at 1/rate."""
+        bucket = TokenBucket(rate=5, capacity=2, clock=fake_time)
+
+        waits = [await bucket.acquire() for _ in range(4)]
+
+        assert waits[:2] == [0.0, 0.0]
+        assert waits[2:] == pytest.approx([0.2, 0.2])
+        assert fake_time.now == pytest.approx(0.4)
+        assert bucket.acquired == 4
+
+    @pytest.mark.asyncio
+    async def test_concurrent_waiters_share_the_rate(self, fake_time):
+        """Coroutines sharing one bucket are throttled together, in FIFO order."""
+        bucket = TokenBucket(rate=10, capacity=1, clock=fake_time)
+        order = []
+
+        async def worker(i):
+            await bucket.acquire()
+            order.append((i, round(fake_time.now, 3)))
+
+        await asyncio.gather(*(worker(i) for i in range(5)))
+
+        assert order == [(0, 0.0), (1, 0.1), (2, 0.2), (3, 0.3), (4, 0.4)]
+
+    def test_refill_and_try_acquire(self, fake_clock):
+        bucket = TokenBucket(rate=2, capacity=2, clock=fake_clock)
+
+        assert bucket.try_acquire() and bucket.try_acquire()
+        assert not bucket.try_acquire()
+        fake_clock.now = 0.5
+        assert bucket.try_acquire()
+
+    def test_drain_and_validation(self, fake_clock):
+        bucket = TokenBucket(rate=4, clock=fake_clock)
+        assert bucket.capacity == 4
+
+        bucket.drain()
+        assert bucket.tokens == 0
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+
+class TestRateLimitedClient:
+    """Test cases for APIClient / ClientRegistry integration."""
+
+    @pytest.mark.asyncio
+    async def test_each_request_takes_a_token(self, fake_time, make_client):
+        bucket = TokenBucket(rate=10, capacity=1, clock=fake_time)
+        client = make_client(lambda request: httpx.Response(200, json={}), rate_limiter=bucket)
+
+        await asyncio.gather(*(client.get("/data") for _ in range(3)))
+
+        assert bucket.acquired == 3
+        assert fake_time.now == pytest.approx(0.2)
+
+    @pytest.mark.asyncio
+    async def test_429_drains_bucket(self, make_client):
+        bucket = TokenBucket(rate=1, capacity=5)
+        client = make_client(lambda request: httpx.Response(429, json={}), rate_limiter=bucket)
+
+        with pytest.raises(Exception):
+            await client.get("/data")
+
+        assert bucket.tokens < 1
+
+    def test_registry_limiter_per_host_or_key(self):
+        registry = ClientRegistry(rate_limit=5, rate_burst=10)
+
+        first = registry.get("http://test.api.com:8088/a")
+        second = registry.get("http://test.api.com:8088/b")
+        keyed = registry.get("http://other.api.com", rate_limit_key="seoul-key")
+
+        assert first.rate_limiter is second.rate_limiter
+        assert first.rate_limiter.capacity == 10
+        assert keyed.rate_limiter is registry.limiter_for("seoul-key")
+        assert set(registry.limiter_stats()) == {"test.api.com:8088", "seoul-key"}
+        assert ClientRegistry().get("http://test.api.com").rate_limiter is None
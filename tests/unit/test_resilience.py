@@ -0,0 +1,206 @@
+"""
+Unit tests for the retry policy and circuit breaker
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.api.common.exceptions import APIError, CircuitOpenError, ClientError, ConnectionError
+from app.api.common.registry import ClientRegistry
+from app.api.common.resilience import CircuitBreaker, RetryPolicy, parse_retry_after
+
+
+def scripted(*responses):
+    """MockTransport handler returning (or raising) the given items in order."""
+    calls = []
+
+    def handler(request):
+        item = responses[len(calls)]
+        calls.append(request)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    handler.calls = calls
+    return handler
+
+
+class TestRetryPolicy:
+    """Test cases for RetryPolicy."""
+
+    def test_exponential_backoff_capped(self):
+        policy = RetryPolicy(backoff_base=0.5, backoff_max=3.0, jitter=False)
+        assert [policy.backoff(n) for n in range(1, 5)] == [0.5, 1.0, 2.0, 3.0]
+
+    def test_full_jitter_within_bounds(self):
+        policy = RetryPolicy(backoff_base=1.0, backoff_max=10.0)
+        assert all(0 <= policy.backoff(3) <= 4.0 for _ in range(50))
+
+    def test_retry_after_overrides_backoff(self):
+        policy = RetryPolicy(max_retry_after=5.0)
+        assert policy.backoff(1, retry_after=2.0) == 2.0
+        assert policy.backoff(1, retry_after=120.0) == 5.0
+
+    def test_only_idempotent_methods_retried(self):
+        policy = RetryPolicy(max_attempts=3)
+        assert policy.can_retry("GET", 1)
+        assert not policy.can_retry("GET", 3)
+        assert not policy.can_retry("POST", 1)
+
+    def test_parse_retry_after(self):
+        assert parse_retry_after("7") == 7.0
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+
+
+class TestRetryingRequests:
+    """Test cases for retries inside APIClient._make_request."""
+
+    @pytest.mark.asyncio
+    async def test_retries_server_error_then_succeeds(self, make_client):
+        """A transient 503 is retried and the next success is returned."""
+        handler = scripted(httpx.Response(503), httpx.Response(200, json={"ok": True}))
+        client = make_client(handler, retry_policy=RetryPolicy(max_attempts=3, jitter=False))
+
+        with patch("app.api.common.client.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            assert await client.get("/data") == {"ok": True}
+
+        assert len(handler.calls) == 2
+        sleep.assert_awaited_once_with(0.5)
+
+    @pytest.mark.asyncio
+    async def test_honors_retry_after(self, make_client):
+        handler = scripted(httpx.Response(429, headers={"Retry-After": "3"}),
+                           httpx.Response(200, json={}))
+        client = make_client(handler, retry_policy=RetryPolicy())
+
+        with patch("app.api.common.client.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            await client.get("/data")
+
+        sleep.assert_awaited_once_with(3.0)
+
+    @pytest.mark.asyncio
+    async def test_connection_errors_exhaust_attempts(self, make_client):
+        handler = scripted(*[httpx.ConnectError("refused")] * 3)
+        client = make_client(handler, retry_policy=RetryPolicy(max_attempts=3))
+
+        with patch("app.api.common.client.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            with pytest.raises(ConnectionError):
+                await client.get("/data")
+
+        assert len(handler.calls) == 3
+        assert sleep.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_client_error_and_post_not_retried(self, make_client):
+        handler = scripted(httpx.Response(404, json={}), httpx.Response(503))
+        client = make_client(handler, retry_policy=RetryPolicy())
+
+        with pytest.raises(ClientError):
+            await client.get("/missing")
+        with pytest.raises(APIError) as exc_info:
+            await client.post("/create", data={})
+
+        assert exc_info.value.status_code == 503
+        assert len(handler.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_non_json_error_body(self, make_client):
+        handler = scripted(httpx.Response(502, text="<html>Bad Gateway</html>"))
+        client = make_client(handler)
+
+        with pytest.raises(APIError) as exc_info:
+            await client.get("/data")
+
+        assert exc_info.value.status_code == 502
+        assert exc_info.value.response_data == {"detail": "<html>Bad Gateway</html>"}
+
+
+class TestCircuitBreaker:
+    """Test cases for CircuitBreaker."""
+
+    def test_opens_after_threshold_and_recovers(self, fake_clock):
+        breaker = CircuitBreaker("test.api.com", failure_threshold=2, recovery_timeout=10, clock=fake_clock)
+
+        breaker.record_failure()
+        breaker.before_request()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        with pytest.raises(CircuitOpenError) as exc_info:
+            breaker.before_request()
+        assert exc_info.value.retry_after == 10
+
+        fake_clock.now = 10
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        breaker.before_request()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()  # only one probe at a time
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_failed_probe_reopens(self, fake_clock):
+        breaker = CircuitBreaker("test.api.com", failure_threshold=1, recovery_timeout=5, clock=fake_clock)
+        breaker.record_failure()
+
+        fake_clock.now = 5
+        breaker.before_request()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self, make_client):
+        """Once open, requests are rejected without touching the network."""
+        handler = scripted(httpx.Response(500), httpx.Response(500))
+        breaker = CircuitBreaker("test.api.com", failure_threshold=2)
+        client = make_client(handler, circuit_breaker=breaker)
+
+        for _ in range(2):
+            with pytest.raises(APIError):
+                await client.get("/data")
+        with pytest.raises(CircuitOpenError):
+            await client.get("/data")
+
+        assert len(handler.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_probe_releases_slot(self, fake_clock, make_client):
+        """A probe cancelled mid-flight must not leave the breaker rejecting everything."""
+        breaker = CircuitBreaker("test.api.com", failure_threshold=1, recovery_timeout=5, clock=fake_clock)
+        breaker.record_failure()
+        fake_clock.now = 5
+        entered = asyncio.Event()
+        calls = []
+
+        async def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                entered.set()
+                await asyncio.sleep(10)  # the probe hangs until cancelled
+            return httpx.Response(200, json={"ok": True})
+
+        client = make_client(handler, circuit_breaker=breaker)
+        probe = asyncio.create_task(client.get("/data"))
+        await entered.wait()
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert await client.get("/data") == {"ok": True}
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_registry_shares_breaker_per_host(self):
+        registry = ClientRegistry(failure_threshold=3)
+
+        first = registry.get("http://test.api.com:8088/v1")
+        second = registry.get("http://test.api.com:8088/v2")
+
+        assert first.circuit_breaker is second.circuit_breaker
+        assert registry.get("http://other.api.com").circuit_breaker is not first.circuit_breaker
+        assert ClientRegistry().get("http://test.api.com").circuit_breaker is None
+        assert registry.breaker_stats()["test.api.com:8088"]["state"] == "closed"
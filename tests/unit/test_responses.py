@@ -0,0 +1,63 @@
+"""
+Unit tests for the app-wide JSON response class
+"""
+
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from unittest.mock import patch
+
+from app.core import responses
+from app.core.responses import FastJSONResponse, dumps
+from app.main import app
+from app.schemas.pet_clinic import ClinicPage, LoadSummary
+
+PAYLOAD = {
+    "items": [{"mgt_no": "M1", "bplc_nm": "행복동물병원", "lat": 37.5, "lng": None}],
+    "next_cursor": None,
+}
+
+
+class TestDumps:
+    """Test cases for responses.dumps with and without orjson."""
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_same_document_either_way(self, use_orjson):
+        target = responses.orjson if use_orjson else None
+        with patch.object(responses, "orjson", target):
+            body = dumps(PAYLOAD)
+
+        assert json.loads(body) == PAYLOAD
+        assert "행복동물병원".encode() in body  # no \uXXXX escaping
+        assert b": " not in body and b", " not in body
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_models_and_extra_types(self, use_orjson):
+        summary = LoadSummary(start=1, end=5, rows_fetched=5, rows_upserted=5, rows_inserted=5,
+                              rows_updated=0, rows_unchanged=0, duration=0.1, rows_per_sec=50.0)
+        content = {"summary": summary, "at": datetime(2024, 1, 1, 12, 0), "area": Decimal("1.5")}
+        if use_orjson:
+            content["xs"] = np.array([1.0, 2.0])
+
+        with patch.object(responses, "orjson", responses.orjson if use_orjson else None):
+            decoded = json.loads(dumps(content))
+
+        assert decoded["summary"]["rows_fetched"] == 5
+        assert decoded["at"] == "2024-01-01T12:00:00"
+        assert float(decoded["area"]) == 1.5
+
+    def test_response_class(self):
+        response = FastJSONResponse(ClinicPage.model_validate(PAYLOAD | {"items": []}))
+
+        assert response.media_type == "application/json"
+        assert json.loads(response.body) == {"items": [], "next_cursor": None}
+
+    def test_app_default(self):
+        """Routers included under /api/v1 inherit the app-wide response class."""
+        route = next(route for route in app.routes if getattr(route, "path", None) == "/api/v1/pet-clinic/clinics")
+
+        assert app.router.default_response_class is FastJSONResponse
+        assert route.response_class is FastJSONResponse
@@ -0,0 +1,159 @@
+"""
+Unit tests for benchmark trend tracking in scripts/run_tests.py
+"""
+
+import json
+
+import pytest
+
+from scripts import run_tests
+
+
+def write_report(directory, index, p95_ms, rps=100.0, name="health"):
+    path = directory / f"bench_{index:02d}.json"
+    path.write_text(json.dumps({
+        "meta": {"timestamp": f"2024-01-{index + 1:02d}T00:00:00", "commit": f"c{index:02d}"},
+        "scenarios": [{"name": name, "requests": 100, "errors": 0, "rps": rps,
+                       "p50_ms": p95_ms / 2, "p95_ms": p95_ms, "p99_ms": p95_ms * 1.5, "mean_ms": p95_ms / 2}],
+    }))
+    return path
+
+
+@pytest.fixture
+def runner(tmp_path):
+    return run_tests.TestRunner(results_dir=str(tmp_path / "test_results"))
+
+
+class TestBenchmarkHistory:
+    """Test cases for ingesting benchmark JSON and checking regressions."""
+
+    def test_ingest_is_idempotent(self, runner, tmp_path):
+        results = tmp_path / "bench"
+        results.mkdir()
+        for i in range(3):
+            write_report(results, i, 10.0)
+        (results / "other.json").write_text(json.dumps({"summary": {}}))
+
+        history = runner.ingest_benchmarks([str(results)])
+        again = runner.ingest_benchmarks([str(results)])
+
+        assert len(history) == len(again) == 3
+        assert list(again["commit"]) == ["c00", "c01", "c02"]
+        assert runner.benchmark_history_file.exists()
+
+    @pytest.mark.parametrize("latest, regressed", [(11.5, False), (13.0, True)])
+    def test_latency_regression_vs_rolling_median(self, runner, tmp_path, latest, regressed):
+        # the oldest run is outside the 5-run window and must not drag the baseline up
+        for i, p95 in enumerate([100.0, 10.0, 9.0, 10.0, 11.0, 10.0, latest]):
+            write_report(tmp_path, i, p95)
+
+        history = runner.ingest_benchmarks([str(tmp_path)])
+        regressions = runner.check_benchmark_regressions(history, threshold=0.2, window=5)
+
+        assert bool(regressions) is regressed
+        if regressed:
+            assert regressions[0]["baseline"] == 10.0
+            assert regressions[0]["change"] == pytest.approx(0.3)
+
+    def test_throughput_drop_is_regression(self, runner, tmp_path):
+        for i, rps in enumerate([100.0, 100.0, 70.0]):
+            write_report(tmp_path, i, 10.0, rps=rps)
+
+        history = runner.ingest_benchmarks([str(tmp_path)])
+
+        assert runner.check_benchmark_regressions(history, metric="p95_ms") == []
+        assert runner.check_benchmark_regressions(history, metric="rps")[0]["change"] == pytest.approx(0.3)
+
+    def test_only_latest_run_is_gated(self, runner, tmp_path):
+        write_report(tmp_path, 0, 10.0, name="old")
+        write_report(tmp_path, 1, 50.0, name="old")
+        write_report(tmp_path, 2, 10.0, name="health")
+
+        history = runner.ingest_benchmarks([str(tmp_path)])
+
+        assert runner.check_benchmark_regressions(history) == []
+
+    def test_trend_chart(self, runner, tmp_path):
+        for i in range(3):
+            write_report(tmp_path, i, 10.0 + i)
+            write_report(tmp_path, i + 10, 5.0, name="users_read")
+
+        trend_file = runner.create_benchmark_trends(runner.ingest_benchmarks([str(tmp_path)]))
+
+        assert trend_file.endswith(".png")
+        assert runner.create_benchmark_trends(runner.load_benchmark_history().iloc[0:0]) is None
+
+    def test_gate_exit_code(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        results = tmp_path / "bench"
+        results.mkdir()
+        for i, p95 in enumerate([10.0, 10.0, 20.0]):
+            write_report(results, i, p95)
+
+        with pytest.raises(SystemExit) as exc_info:
+            run_tests.main(["--skip-tests", "--benchmarks", str(results)])
+
+        assert exc_info.value.code == 1
+        assert run_tests.main(["--skip-tests", "--benchmarks", str(results), "--regression-threshold", "1.5"]) is None
+
+
+class TestParallelRunner:
+    """Test cases for sharded test execution and JSON report parsing."""
+
+    def test_shards_balanced_by_duration(self):
+        test_ids = ["t::a", "t::b", "t::c", "t::d", "t::e", "t::new"]
+        durations = {"t::a": 5.0, "t::b": 4.0, "t::c": 3.0, "t::d": 2.0, "t::e": 1.0}
+
+        shards = run_tests.TestRunner.shard_tests(test_ids, 2, durations)
+
+        loads = [sum(durations.get(t, 3.0) for t in shard) for shard in shards]
+        assert sorted(t for shard in shards for t in shard) == sorted(test_ids)
+        assert max(loads) - min(loads) <= 1.0
+        # collection order is kept inside each shard
+        assert all(shard == sorted(shard, key=test_ids.index) for shard in shards)
+
+    def test_more_workers_than_tests(self):
+        assert run_tests.TestRunner.shard_tests(["t::a"], 8, {}) == [["t::a"]]
+
+    def test_merge_reports(self, runner):
+        report = {"tests": [
+            {"nodeid": "t::ok", "outcome": "passed", "setup": {"duration": 0.1}, "call": {"duration": 0.2},
+             "teardown": {"duration": 0.05}},
+            {"nodeid": "t::bad", "outcome": "error", "setup": {"duration": 0.01}},
+            {"nodeid": "t::skip", "outcome": "skipped", "setup": {"duration": 0.0}},
+        ]}
+
+        merged = runner._merge_shard_reports([(report, "out", "", 1), (None, "", "boom", 2)])
+
+        assert merged["summary"] == {"total": 3, "passed": 1, "failed": 1, "skipped": 1}
+        assert merged["tests"][0] == {"name": "t::ok", "status": "PASSED", "duration": 0.35}
+        assert merged["success"] is False and merged["return_code"] == 1
+        assert "no JSON report written" in merged["stderr"]
+
+    def test_run_tests_in_shards(self, runner, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "test_sample.py").write_text(
+            "import pytest\n"
+            "def test_one(): pass\n"
+            "def test_two(): assert False\n"
+            "@pytest.mark.parametrize('n', [1, 2])\n"
+            "def test_param(n): pass\n"
+            "@pytest.mark.skip\n"
+            "def test_skipped(): pass\n"
+        )
+
+        results = runner.run_tests("test_sample.py", workers=2)
+
+        assert results["shards"] == 2
+        assert results["summary"] == {"total": 5, "passed": 3, "failed": 1, "skipped": 1}
+        assert results["success"] is False
+        assert set(runner.load_test_durations()) == {t["name"] for t in results["tests"]}
+
+    def test_collection_error_reported(self, runner, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "test_broken.py").write_text("import does_not_exist\n")
+
+        results = runner.run_tests("test_broken.py", workers=2)
+
+        assert results["shards"] == 1
+        assert results["success"] is False
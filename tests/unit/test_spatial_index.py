@@ -0,0 +1,236 @@
+"""
+Unit tests for coordinate conversion and the clinic spatial index
+"""
+
+import asyncio
+import random
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.dialects import postgresql
+
+from app.db.crud import find_nearby_pet_clinics, get_clinic_geom_index_srid
+from app.services.coordinates import EPSG_2097, EPSG_5174, tm_to_wgs84, wgs84_to_tm
+from app.schemas.pet_clinic import ClinicRow
+from app.services.spatial_index import ClinicSpatialIndex, GridIndex
+
+
+def make_clinic(mgt_no, x, y, state="01"):
+    return SimpleNamespace(mgt_no=mgt_no, x=x, y=y, trd_state_gbn=state)
+
+
+class TestCoordinates:
+    """Test cases for WGS84 → Korean TM projection."""
+    
+    def test_seoul_city_hall_epsg_2097(self):
+        """Matches PROJ output for EPSG:2097 to well under a metre."""
+        x, y = wgs84_to_tm(37.5665, 126.9780, EPSG_2097)
+        assert x == pytest.approx(198242.05, abs=0.1)
+        assert y == pytest.approx(451579.84, abs=0.1)
+    
+    def test_modified_central_belt_offset(self):
+        """EPSG:5174 shifts the central meridian by 10.405 arc-seconds (~255m east-west)."""
+        x_2097, _ = wgs84_to_tm(37.5665, 126.9780, EPSG_2097)
+        x_5174, _ = wgs84_to_tm(37.5665, 126.9780, EPSG_5174)
+        assert x_2097 - x_5174 == pytest.approx(255.6, abs=1.0)
+    
+    def test_tm_to_wgs84_epsg_2097(self):
+        """Inverse projection matches PROJ output for a LOCALDATA sample point."""
+        lat, lng = tm_to_wgs84(203091.134, 444543.2133, EPSG_2097)
+        assert lat == pytest.approx(37.5030973, abs=1e-7)
+        assert lng == pytest.approx(127.0328574, abs=1e-7)
+    
+    def test_round_trip(self):
+        """Forward and inverse transforms agree to within a centimetre."""
+        xs, ys = [180000.0, 203091.134, 220000.0], [430000.0, 444543.2133, 470000.0]
+        lats, lngs = tm_to_wgs84(xs, ys)
+        back_x, back_y = wgs84_to_tm(lats, lngs)
+        assert list(back_x) == pytest.approx(xs, abs=0.01)
+        assert list(back_y) == pytest.approx(ys, abs=0.01)
+    
+    def test_vectorized(self):
+        """Arrays are converted element-wise in one call."""
+        xs, ys = wgs84_to_tm([37.5665, 37.5665], [126.9780, 126.9780])
+        assert len(xs) == len(ys) == 2
+        assert xs[0] == pytest.approx(xs[1])
+
+
+class TestGridIndex:
+    """Test cases for the grid k-nearest-neighbour index."""
+    
+    @pytest.fixture
+    def points(self):
+        rng = random.Random(42)
+        return [(rng.uniform(180000, 220000), rng.uniform(430000, 470000), i) for i in range(2000)]
+    
+    def brute_force(self, points, x, y, k, radius=None):
+        found = sorted((((px - x) ** 2 + (py - y) ** 2) ** 0.5, i) for px, py, i in points)
+        if radius is not None:
+            found = [(d, i) for d, i in found if d <= radius]
+        return found[:k]
+    
+    def test_matches_brute_force(self, points):
+        """k-NN results equal an exhaustive distance sort."""
+        index = GridIndex(points, cell_size=500)
+        for x, y in [(200000, 450000), (180500, 430100), (250000, 500000), (199999.5, 450000.5)]:
+            got = index.nearest(x, y, k=7)
+            expected = self.brute_force(points, x, y, 7)
+            assert [i for _, i in got] == [i for _, i in expected]
+            assert [d for d, _ in got] == pytest.approx([d for d, _ in expected])
+    
+    def test_radius_limit(self, points):
+        """Only points within the radius are returned."""
+        index = GridIndex(points, cell_size=500)
+        got = index.nearest(200000, 450000, k=100, radius=800)
+        expected = self.brute_force(points, 200000, 450000, 100, radius=800)
+        assert [i for _, i in got] == [i for _, i in expected]
+        assert all(d <= 800 for d, _ in got)
+    
+    def test_fewer_points_than_k(self):
+        """Asking for more neighbours than exist returns everything, nearest first."""
+        index = GridIndex([(0, 0, "a"), (3000, 0, "b")], cell_size=500)
+        assert [item for _, item in index.nearest(100, 0, k=5)] == ["a", "b"]
+    
+    def test_empty_index(self):
+        assert GridIndex([]).nearest(0, 0, k=3) == []
+
+
+class TestClinicSpatialIndex:
+    """Test cases for the clinic-level index wrapper."""
+    
+    def test_closed_clinics_filtered_by_default(self):
+        """Closed clinics are skipped but still fill k from further away open ones."""
+        index = ClinicSpatialIndex(cell_size=500)
+        index.build([
+            make_clinic("closed", 0, 10, state="03"),
+            make_clinic("near", 0, 100),
+            make_clinic("far", 0, 5000),
+            make_clinic("no-coords", None, None),
+        ])
+        
+        assert [c.mgt_no for _, c in index.nearest(0, 0, k=2)] == ["near", "far"]
+        assert [c.mgt_no for _, c in index.nearest(0, 0, k=2, include_closed=True)] == ["closed", "near"]
+    
+    def test_staleness(self):
+        index = ClinicSpatialIndex()
+        assert index.is_stale(60)
+        index.build([])
+        assert index.ready
+        assert not index.is_stale(60)
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_stale_refreshes_load_once(self):
+        """Requests that all see a stale index share one table load instead of each running their own."""
+        index = ClinicSpatialIndex()
+        result = MagicMock()
+        result.all.return_value = [make_clinic("a", 0, 0)]
+        
+        async def slow_execute(statement):
+            await asyncio.sleep(0.01)
+            return result
+        
+        db = AsyncMock()
+        db.execute.side_effect = slow_execute
+        
+        await asyncio.gather(*(index.refresh(db, max_age=60) for _ in range(10)))
+        
+        assert db.execute.await_count == 1
+        assert index.refreshes == 1
+        await index.refresh(db)  # without max_age (after ingestion) it always rebuilds
+        assert index.refreshes == 2
+    
+    @pytest.mark.asyncio
+    async def test_refresh_keeps_rows_not_orm_instances(self):
+        """The index holds lightweight Row tuples with only the response columns."""
+        from app.models.pet_clinic import PetClinic
+        
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(PetClinic.metadata.create_all)
+        async with AsyncSession(engine) as db:
+            db.add_all([PetClinic(mgt_no="A", opnsfteamcode="3000000", trd_state_gbn="01", x=10.0, y=0.0),
+                        PetClinic(mgt_no="B", opnsfteamcode="3000000", trd_state_gbn="01", x=None, y=None)])
+            await db.commit()
+            
+            index = ClinicSpatialIndex()
+            await index.refresh(db)
+        await engine.dispose()
+        
+        [(distance, clinic)] = index.nearest(0, 0, k=5)
+        assert isinstance(clinic, Row)
+        assert not hasattr(clinic, "created_at")
+        assert distance == 10.0
+        assert ClinicRow.model_validate(clinic).mgt_no == "A"
+
+
+class TestNearbyEndpoint:
+    """Test cases for /pet-clinic/nearby."""
+    
+    @pytest.mark.asyncio
+    async def test_nearby_uses_memory_index(self, mock_db_session):
+        """Query points are projected to TM and answered from the in-memory index."""
+        from app.api.v1.endpoints import pet_clinic
+        from app.models.pet_clinic import PetClinic
+        
+        x, y = wgs84_to_tm(37.5665, 126.9780)
+        index = ClinicSpatialIndex()
+        index.build([
+            PetClinic(mgt_no="A", opnsfteamcode="3000000", trd_state_gbn="01", x=float(x) + 30, y=float(y) + 40),
+            PetClinic(mgt_no="B", opnsfteamcode="3000000", trd_state_gbn="01", x=float(x) + 3000, y=float(y)),
+        ])
+        
+        with patch.object(pet_clinic, "clinic_index", index):
+            result = await pet_clinic.find_nearby_clinics(lat=37.5665, lng=126.9780, k=1, db=mock_db_session)
+        
+        assert len(result) == 1
+        assert result[0].clinic.mgt_no == "A"
+        assert result[0].distance_m == pytest.approx(50.0, abs=0.1)
+        mock_db_session.execute.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_postgis_query(self, mock_db_session):
+        """The PostGIS backend orders by the <-> KNN operator in the clinic SRID."""
+        await find_nearby_pet_clinics(mock_db_session, 37.5, 127.0, k=5, radius=1000)
+        
+        sql = str(mock_db_session.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+        assert "ST_Transform(ST_SetSRID(ST_MakePoint(" in sql
+        assert "ST_DWithin(" in sql
+        assert "<->" in sql
+        assert "seoul_pet_clinics.trd_state_gbn = " in sql
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("srid", [2097, 5174])
+    async def test_postgis_srid_is_rendered_like_the_index(self, mock_db_session, srid):
+        """The SRID is a literal, so the expression matches the GiST index even under a generic plan."""
+        await find_nearby_pet_clinics(mock_db_session, 37.5, 127.0, srid=srid)
+        
+        sql = str(mock_db_session.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+        assert f"ST_SetSRID(ST_MakePoint(seoul_pet_clinics.x, seoul_pet_clinics.y), {srid})" in sql
+    
+    @pytest.mark.asyncio
+    async def test_geom_index_srid_parsed_from_definition(self, mock_db_session):
+        mock_db_session.execute.return_value.scalar_one_or_none.return_value = (
+            "CREATE INDEX ix_seoul_pet_clinics_geom ON public.seoul_pet_clinics USING gist "
+            "(st_setsrid(st_makepoint(x, y), 5174)) WHERE ((x IS NOT NULL) AND (y IS NOT NULL))"
+        )
+        assert await get_clinic_geom_index_srid(mock_db_session) == 5174
+        
+        mock_db_session.execute.return_value.scalar_one_or_none.return_value = None
+        assert await get_clinic_geom_index_srid(mock_db_session) is None
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("index_srid, warned", [(2097, False), (5174, True), (None, True)])
+    async def test_index_srid_mismatch_is_logged_once(self, mock_db_session, index_srid, warned):
+        """A CRS setting that does not match the index would silently scan, so it is reported."""
+        from app.api.v1.endpoints import pet_clinic
+        
+        with patch.object(pet_clinic, "_geom_index_checked", False), \
+             patch.object(pet_clinic, "get_clinic_geom_index_srid", AsyncMock(return_value=index_srid)) as lookup, \
+             patch.object(pet_clinic, "logger") as logger:
+            await pet_clinic.check_geom_index(mock_db_session, 2097)
+            await pet_clinic.check_geom_index(mock_db_session, 2097)
+        
+        lookup.assert_awaited_once()
+        assert logger.warning.called is warned
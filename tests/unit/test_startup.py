@@ -0,0 +1,233 @@
+"""
+Unit tests for non-blocking startup, the SSH tunnel wrapper and /ready
+"""
+
+import asyncio
+import subprocess
+import sys
+import threading
+import time
+import types
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from unittest.mock import AsyncMock, patch
+
+from app.api import endpoints_router
+from app.core.config import Settings
+from app.core.ssh_tunnel import SSHTunnel
+from app.main import app
+
+
+class FakeForwarder:
+    """Stands in for sshtunnel.SSHTunnelForwarder; start() blocks like an SSH handshake."""
+    delay = 0.2
+    fail = False
+    instances = []
+    gate = None  # threading.Event: if given, start() blocks until the test sets it
+
+    def __init__(self, *args, **kwargs):
+        self.kwargs = kwargs
+        self.is_active = False
+        self.start_thread = None
+        FakeForwarder.instances.append(self)
+
+    def start(self):
+        self.start_thread = threading.current_thread()
+        if self.gate is not None:
+            self.gate.wait(10)
+        else:
+            time.sleep(self.delay)
+        if self.fail:
+            raise OSError("handshake failed")
+        self.is_active = True
+
+    def stop(self):
+        self.is_active = False
+
+
+@pytest.fixture
+def fake_sshtunnel(monkeypatch):
+    FakeForwarder.delay, FakeForwarder.fail, FakeForwarder.instances, FakeForwarder.gate = 0.2, False, [], None
+    monkeypatch.setitem(sys.modules, "sshtunnel", types.SimpleNamespace(SSHTunnelForwarder=FakeForwarder))
+    return FakeForwarder
+
+
+def make_tunnel(env: str = "dev", **overrides) -> SSHTunnel:
+    return SSHTunnel(Settings(ENV=env, **overrides))
+
+
+async def wait_until(condition):
+    while not condition():
+        await asyncio.sleep(0.01)
+
+
+class TestSSHTunnel:
+    """Test cases for SSHTunnel."""
+
+    @pytest.mark.asyncio
+    async def test_disabled_outside_dev(self):
+        tunnel = make_tunnel("prod")
+
+        await tunnel.start()
+
+        assert tunnel.ready is True
+        assert tunnel.status() == {"ok": True, "state": "disabled"}
+
+    @pytest.mark.asyncio
+    async def test_handshake_runs_off_the_event_loop(self, fake_sshtunnel):
+        fake_sshtunnel.gate = threading.Event()
+        tunnel = make_tunnel()
+        task = asyncio.create_task(tunnel.start())
+
+        # the loop keeps running other work while the handshake is blocked
+        await asyncio.wait_for(wait_until(lambda: fake_sshtunnel.instances), 5)
+        assert not task.done() and tunnel.state == "starting"
+        fake_sshtunnel.gate.set()
+        await task
+
+        forwarder = fake_sshtunnel.instances[0]
+        assert forwarder.start_thread is not threading.main_thread()
+        assert forwarder.kwargs["local_bind_address"] == ("127.0.0.1", tunnel.settings.POSTGRES_LOCAL_PORT)
+        assert tunnel.ready and tunnel.status()["state"] == "ready"
+
+        await tunnel.stop()
+        assert not tunnel.ready and tunnel.state == "stopped"
+
+    @pytest.mark.asyncio
+    async def test_failure_is_reported_not_raised(self, fake_sshtunnel):
+        fake_sshtunnel.fail = True
+        tunnel = make_tunnel()
+
+        await tunnel.start()
+
+        assert tunnel.ready is False
+        assert tunnel.status() == {"ok": False, "state": "failed", "error": "OSError: handshake failed"}
+
+
+class TestSSHTunnelSupervisor:
+    """Test cases for SSH tunnel monitoring and reconnect."""
+
+    @pytest.fixture
+    def tunnel(self, fake_sshtunnel):
+        fake_sshtunnel.delay = 0.01
+        return make_tunnel(SSH_TUNNEL_CHECK_INTERVAL=0.02, SSH_TUNNEL_BACKOFF_BASE=0.02,
+                           SSH_TUNNEL_BACKOFF_MAX=0.05)
+
+    @pytest.mark.asyncio
+    async def test_reconnects_after_drop_and_disposes_pool(self, tunnel, fake_sshtunnel):
+        dispose = AsyncMock()
+        tunnel.on_reconnect(dispose)
+        tunnel.on_reconnect(dispose)
+        await tunnel.start()
+        tunnel.start_supervisor()
+
+        fake_sshtunnel.instances[0].is_active = False  # tunnel drops
+        await asyncio.wait_for(wait_until(lambda: tunnel.reconnects == 1), 5)
+
+        assert tunnel.ready and len(fake_sshtunnel.instances) == 2
+        assert tunnel.status()["reconnects"] == 1
+        dispose.assert_awaited_once()
+
+        await tunnel.stop()
+        assert tunnel.state == "stopped"
+        assert not any(forwarder.is_active for forwarder in fake_sshtunnel.instances)
+
+    @pytest.mark.asyncio
+    async def test_retries_with_backoff_until_reachable(self, tunnel, fake_sshtunnel):
+        fake_sshtunnel.fail = True
+        delays = []
+        backoff = tunnel.backoff
+        tunnel.backoff = lambda attempt: delays.append(attempt) or backoff(attempt)
+
+        await tunnel.start()
+        tunnel.start_supervisor()
+        await asyncio.wait_for(wait_until(lambda: len(fake_sshtunnel.instances) >= 4), 5)
+        assert not tunnel.ready and tunnel.reconnects == 0
+
+        fake_sshtunnel.fail = False
+        await asyncio.wait_for(wait_until(lambda: tunnel.ready), 5)
+
+        # each failed attempt backs off further; a success resets the counter
+        assert len(delays) >= 2 and delays == list(range(1, len(delays) + 1))
+        assert tunnel.reconnects == 1
+        await tunnel.stop()
+
+    @pytest.mark.asyncio
+    async def test_stop_ends_supervisor_promptly(self, fake_sshtunnel):
+        fake_sshtunnel.delay = 0.01
+        tunnel = make_tunnel(SSH_TUNNEL_CHECK_INTERVAL=3600)
+        await tunnel.start()
+        tunnel.start_supervisor()
+        supervisor = tunnel._supervisor
+
+        # stop() must not wait for the next check interval
+        await asyncio.wait_for(tunnel.stop(), 10)
+
+        assert supervisor.done()
+        assert tunnel.state == "stopped"
+
+    def test_supervisor_disabled_outside_dev(self):
+        tunnel = make_tunnel("prod")
+
+        tunnel.start_supervisor()
+
+        assert tunnel._supervisor is None
+
+
+class TestStartup:
+    """Test cases for the lifespan startup and probes."""
+
+    @pytest.mark.asyncio
+    async def test_lifespan_does_not_wait_for_tunnel(self, fake_sshtunnel):
+        fake_sshtunnel.gate = threading.Event()
+        tunnel = make_tunnel()
+
+        with patch("app.main.ssh_tunnel", tunnel):
+            # the handshake stays blocked until released, so reaching the body proves startup did not wait
+            async with app.router.lifespan_context(app):
+                await asyncio.wait_for(wait_until(lambda: fake_sshtunnel.instances), 5)
+                assert tunnel.state == "starting"
+                assert set(app.state.cold_start) == {"import_ms", "startup_ms"}
+                fake_sshtunnel.gate.set()
+
+        # shutdown waited for the handshake and closed the tunnel
+        assert tunnel.state == "stopped"
+        assert fake_sshtunnel.instances[0].is_active is False
+
+    @pytest.mark.asyncio
+    async def test_ready_waits_for_tunnel(self):
+        tunnel = make_tunnel()
+        check = AsyncMock()
+
+        with patch.object(endpoints_router, "ssh_tunnel", tunnel), \
+             patch.object(endpoints_router, "check_database", check):
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                health = await client.get("/api/v1/health")
+                ready = await client.get("/api/v1/ready")
+
+        assert health.status_code == 200
+        assert ready.status_code == 503
+        assert ready.json()["checks"]["database"]["error"] == "waiting for SSH tunnel"
+        check.assert_not_called()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("database, status_code", [
+        ({"ok": True, "latency_ms": 1.0}, 200),
+        ({"ok": False, "error": "OSError: connection refused"}, 503),
+    ])
+    async def test_ready_checks_database(self, database, status_code):
+        with patch.object(endpoints_router, "ssh_tunnel", make_tunnel("prod")), \
+             patch.object(endpoints_router, "check_database", AsyncMock(return_value=database)):
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                response = await client.get("/api/v1/ready")
+
+        assert response.status_code == status_code
+        assert response.json()["checks"]["database"] == database
+
+    def test_heavy_imports_are_lazy(self):
+        code = "import sys, app.main; print(sorted(m for m in ('sshtunnel', 'paramiko', 'psycopg2') if m in sys.modules))"
+
+        result = subprocess.run([sys.executable, "-W", "ignore", "-c", code], capture_output=True, text=True, check=True)
+
+        assert result.stdout.strip() == "[]"
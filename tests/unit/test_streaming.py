@@ -0,0 +1,139 @@
+"""
+Unit tests for incremental JSON array streaming
+"""
+
+import json
+
+import httpx
+import pytest
+
+from app.api.common.exceptions import APIError, ClientError
+from app.api.common.streaming import JSONArrayStream
+
+DOCUMENT = {
+    "LOCALDATA_020301": {
+        "list_total_count": 3,
+        "RESULT": {"CODE": "INFO-000", "MESSAGE": "정상 \"처리\" [ok] {row}"},
+        "row": [
+            {"BPLCNM": "가나]동물병원", "X": "203091.134", "NESTED": {"row": [1]}},
+            {"BPLCNM": "\\escaped\\", "X": ""},
+            {"BPLCNM": "다라", "X": None},
+        ],
+        "tail": [1, 2],
+    }
+}
+PATH = ("LOCALDATA_020301", "row")
+
+
+async def chunked(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+class TestJSONArrayStream:
+    """Test cases for JSONArrayStream."""
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, 1 << 16])
+    async def test_items_and_envelope_for_any_chunking(self, chunk_size):
+        """Items match json.loads regardless of where chunks split (incl. inside UTF-8 characters)."""
+        raw = json.dumps(DOCUMENT, ensure_ascii=False).encode()
+        stream = JSONArrayStream(chunked(raw, chunk_size), PATH)
+        
+        items = [item async for item in stream]
+        
+        assert items == DOCUMENT["LOCALDATA_020301"]["row"]
+        assert stream.items_yielded == 3
+        assert stream.envelope["LOCALDATA_020301"]["row"] == []
+        assert stream.envelope["LOCALDATA_020301"]["list_total_count"] == 3
+        assert stream.envelope["LOCALDATA_020301"]["tail"] == [1, 2]
+    
+    @pytest.mark.asyncio
+    async def test_scalar_items_split_across_chunks(self):
+        async def body():
+            yield b'{"a": {"row": [1, 23'
+            yield b'4, true, "s"]}}'
+        
+        stream = JSONArrayStream(body(), ("a", "row"))
+        assert [item async for item in stream] == [1, 234, True, "s"]
+    
+    @pytest.mark.asyncio
+    async def test_numbers_split_at_every_offset(self):
+        """A number cut off at a chunk boundary ("1." / "1.5e") is not yielded early."""
+        row = [1.5, -0.25, 1.5e-07, 12345.678, 2e10, 0, -7, True, None, False, 3.0]
+        raw = b'{"a": {"row": ' + json.dumps(row).replace(", ", ",").encode() + b'}}'
+        
+        for split in range(1, len(raw)):
+            async def body():
+                yield raw[:split]
+                yield raw[split:]
+            
+            stream = JSONArrayStream(body(), ("a", "row"))
+            assert [item async for item in stream] == row, f"split at {split}"
+    
+    @pytest.mark.asyncio
+    async def test_missing_array_keeps_whole_document(self):
+        error = {"RESULT": {"CODE": "INFO-200", "MESSAGE": "해당하는 데이터가 없습니다."}}
+        stream = JSONArrayStream(chunked(json.dumps(error).encode(), 5), PATH)
+        
+        assert [item async for item in stream] == []
+        assert stream.envelope == error
+    
+    @pytest.mark.asyncio
+    async def test_truncated_body(self):
+        raw = json.dumps(DOCUMENT).encode()[:-40]
+        stream = JSONArrayStream(chunked(raw, 16), PATH)
+        
+        with pytest.raises(APIError):
+            [item async for item in stream]
+
+
+class TestAPIClientStreamJSON:
+    """Test cases for APIClient.stream_json."""
+    
+    @pytest.mark.asyncio
+    async def test_stream_json_over_http(self, make_client):
+        raw = json.dumps(DOCUMENT, ensure_ascii=False).encode()
+        requests = []
+        
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, stream=httpx.ByteStream(raw))
+        
+        client = make_client(handler)
+        
+        stream = client.stream_json("/key/json/LOCALDATA_020301/1/3/", PATH, chunk_size=32)
+        assert requests == []  # nothing is sent until iteration starts
+        items = [item async for item in stream]
+        
+        assert [item["BPLCNM"] for item in items] == ["가나]동물병원", "\\escaped\\", "다라"]
+        assert str(requests[0].url) == "http://test.api.com/key/json/LOCALDATA_020301/1/3/"
+        assert stream.envelope["LOCALDATA_020301"]["RESULT"]["CODE"] == "INFO-000"
+    
+    @pytest.mark.asyncio
+    async def test_stream_json_error_status(self, make_client):
+        client = make_client(lambda request: httpx.Response(404, json={"detail": "missing"}))
+        
+        with pytest.raises(ClientError) as exc_info:
+            [item async for item in client.stream_json("/missing", PATH)]
+        
+        assert exc_info.value.response_data == {"detail": "missing"}
+    
+    @pytest.mark.asyncio
+    async def test_stream_json_bypasses_response_cache(self, make_client):
+        """cache_ttl only covers get(); streamed fetches (clinic ingestion) always hit upstream."""
+        raw = json.dumps(DOCUMENT, ensure_ascii=False).encode()
+        requests = []
+        
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, headers={"ETag": '"v1"'}, stream=httpx.ByteStream(raw))
+        
+        client = make_client(handler, cache_ttl=60)
+        
+        for _ in range(2):
+            assert len([item async for item in client.stream_json("/page", PATH)]) == 3
+        
+        assert len(requests) == 2
+        assert "If-None-Match" not in requests[1].headers
+        assert len(client.response_cache) == 0
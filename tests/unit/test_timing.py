@@ -0,0 +1,136 @@
+"""
+Unit tests for per-request Server-Timing instrumentation
+"""
+
+import json
+import logging
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core import timing
+from app.core.timing import RequestTimings, ServerTimingMiddleware, instrument_engine
+from app.main import app as main_app
+
+
+def parse_server_timing(value: str) -> dict:
+    metrics = {}
+    for part in value.split(", "):
+        name, *params = part.split(";")
+        metrics[name] = dict(param.split("=", 1) for param in params)
+    return metrics
+
+
+@pytest.fixture
+def timed_app():
+    """Small app whose handlers report fake DB / upstream time."""
+    app = FastAPI()
+
+    @app.get("/work")
+    async def work():
+        timing.record_db(0.010)
+        timing.record_db(0.005)
+        timing.record_upstream_call("GET", "http://upstream", 200, 0.020)
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        return StreamingResponse(iter([b"a\n", b"b\n"]), media_type="application/x-ndjson")
+
+    app.add_middleware(ServerTimingMiddleware)
+    return app
+
+
+class TestServerTimingMiddleware:
+    """Test cases for ServerTimingMiddleware."""
+
+    @pytest.mark.asyncio
+    async def test_header_and_structured_log(self, timed_app, caplog):
+        async with AsyncClient(transport=ASGITransport(app=timed_app), base_url="http://test") as client:
+            with caplog.at_level(logging.INFO, logger="app.timing"):
+                response = await client.get("/work")
+
+        metrics = parse_server_timing(response.headers["server-timing"])
+        assert float(metrics["db"]["dur"]) == pytest.approx(15.0)
+        assert metrics["db"]["desc"] == '"2 queries"'
+        assert float(metrics["upstream"]["dur"]) == pytest.approx(20.0)
+        assert float(metrics["total"]["dur"]) >= 0
+
+        logged = [r for r in caplog.records if r.name == "app.timing"]
+        record = json.loads(logged[-1].getMessage())
+        assert record["event"] == "request_timing"
+        assert record["path"] == "/work" and record["status"] == 200
+        assert record["db_queries"] == 2 and record["upstream_calls"] == 1
+        assert record["db_ms"] == pytest.approx(15.0)
+
+    @pytest.mark.asyncio
+    async def test_streaming_response_passes_through(self, timed_app):
+        async with AsyncClient(transport=ASGITransport(app=timed_app), base_url="http://test") as client:
+            response = await client.get("/stream")
+
+        assert response.text == "a\nb\n"
+        assert "total;dur=" in response.headers["server-timing"]
+
+    @pytest.mark.asyncio
+    async def test_main_app_is_instrumented(self):
+        async with AsyncClient(transport=ASGITransport(app=main_app), base_url="http://test") as client:
+            response = await client.get("/api/v1/health")
+
+        assert "db;dur=" in response.headers["server-timing"]
+
+    def test_no_request_no_recording(self):
+        assert timing.current_timings() is None
+        timing.record_db(1.0)  # outside a request: ignored
+
+
+class TestInstrumentation:
+    """Test cases for the DB and APIClient hooks."""
+
+    @pytest.mark.asyncio
+    async def test_engine_cursor_events(self):
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        instrument_engine(engine)
+        instrument_engine(engine)  # idempotent
+        timings = RequestTimings()
+        token = timing._current.set(timings)
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                await conn.execute(text("SELECT 2"))
+                with pytest.raises(Exception):
+                    await conn.execute(text("SELECT * FROM missing_table"))
+        finally:
+            timing._current.reset(token)
+            await engine.dispose()
+
+        assert timings.db_queries == 3
+        assert timings.db > 0
+
+    @pytest.mark.asyncio
+    async def test_api_client_hooks(self, make_client):
+        calls = []
+        client = make_client(lambda request: httpx.Response(200, json={"rows": [1, 2]}),
+                             hooks=[lambda *args: calls.append(args)])
+
+        await client.get("/data")
+        assert [item async for item in client.stream_json("/data", ("rows",))] == [1, 2]
+
+        assert [(method, url, status) for method, url, status, _ in calls] == [
+            ("GET", "http://test.api.com/data", 200),
+            ("GET", "http://test.api.com/data", 200),
+        ]
+        assert all(elapsed >= 0 for *_, elapsed in calls)
+
+    @pytest.mark.asyncio
+    async def test_failing_hook_does_not_break_request(self, make_client):
+        def broken(*args):
+            raise RuntimeError("boom")
+
+        client = make_client(lambda request: httpx.Response(200, json={}), hooks=[broken])
+
+        assert await client.get("/data") == {}